@@ -0,0 +1,359 @@
+import math
+import operator
+import os
+import struct
+from array import array
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+from .indexes import AttributeIndex
+from .snapshot import BYTE_ORDER, _padding
+
+# Node attribute file, stored next to the graph file with all sections 8-byte aligned:
+#   header | name offsets (q) | UTF-8 node name blob | per attribute: column header | UTF-8 attribute name |
+#   numbers: one value (d) per node | labels: label offsets (q) | UTF-8 label blob | one label code (q) per node
+ATTRIBUTE_SUFFIX = ".attributes"
+ATTRIBUTE_MAGIC = b"GOPSATR\0"
+ATTRIBUTE_HEADER = struct.Struct("<8sc3xIQ")
+COLUMN_HEADER = struct.Struct("<c3xIQ")
+NUMBERS = b"d"
+LABELS = b"s"
+
+COMPARISONS: dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+# (attribute, comparison, value), e.g. ("region", "==", "eu") or ("capacity", ">=", 10)
+Where = tuple[str, str, Any]
+
+
+class NumberColumn:
+    """One float per node row, NaN where the node has no value."""
+    __slots__ = ("values",)
+
+    def __init__(self, size: int = 0) -> None:
+        self.values: array = array("d", [math.nan]) * size
+
+    def grow(self) -> None:
+        self.values.append(math.nan)
+
+    def get(self, row: int) -> float | None:
+        value: float = self.values[row]
+        return None if math.isnan(value) else value
+
+    def set(self, row: int, value: float | None) -> None:
+        if isinstance(value, str):
+            raise ValueError(f"Expected a number, got {value!r}")
+        self.values[row] = math.nan if value is None else value
+
+    def test(self, comparison: Callable[[Any, Any], bool], value: Any) -> Callable[[int], bool]:
+        if isinstance(value, str):
+            raise ValueError(f"Expected a number, got {value!r}")
+        values = self.values
+        # NaN compares unequal to everything, so check it is a value before asking for !=
+        return lambda row: values[row] == values[row] and comparison(values[row], value)
+
+
+class LabelColumn:
+    """Dictionary-encoded strings: one code per node row into a list of distinct labels, -1 where there is none."""
+    __slots__ = ("codes", "labels", "lookup")
+
+    def __init__(self, size: int = 0) -> None:
+        self.codes: array = array("q", [-1]) * size
+        self.labels: list[str] = []
+        self.lookup: dict[str, int] = {}
+
+    def grow(self) -> None:
+        self.codes.append(-1)
+
+    def get(self, row: int) -> str | None:
+        code: int = self.codes[row]
+        return None if code < 0 else self.labels[code]
+
+    def set(self, row: int, value: str | None) -> None:
+        if value is None:
+            self.codes[row] = -1
+            return
+        if not isinstance(value, str):
+            raise ValueError(f"Expected a label, got {value!r}")
+        code: int | None = self.lookup.get(value)
+        if code is None:
+            code = self.lookup[value] = len(self.labels)
+            self.labels.append(value)
+        self.codes[row] = code
+
+    def test(self, comparison: Callable[[Any, Any], bool], value: Any) -> Callable[[int], bool]:
+        codes = self.codes
+        if comparison is operator.eq or comparison is operator.ne:
+            # compare codes, not strings; a label nobody has gets a code no row holds
+            code: int = self.lookup.get(value, -2)
+            if comparison is operator.eq:
+                return lambda row: codes[row] == code
+            return lambda row: codes[row] >= 0 and codes[row] != code
+        labels = self.labels
+        return lambda row: codes[row] >= 0 and comparison(labels[codes[row]], value)
+
+
+def _column_kind(name: str, value: Any, column: NumberColumn | LabelColumn | None) -> type | None:
+    # the column type value belongs in (None for a value that clears), checked against the column it goes to
+    if value is None:
+        return None
+    if isinstance(value, str):
+        kind: type = LabelColumn
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        kind = NumberColumn
+    else:
+        raise ValueError(f"Attribute values are numbers or labels, got {value!r}")
+    if column is not None and not isinstance(column, kind):
+        raise ValueError(f"Attribute {name} holds {'numbers' if isinstance(column, NumberColumn) else 'labels'}")
+    return kind
+
+
+class NodeAttributes:
+    """Columnar node attributes: every node with a value gets an interned row id, every attribute one packed column.
+
+    A column holds numbers or labels, fixed by the first value written to it. Rows of removed nodes are reused.
+    Attributes can be given a hash index, kept up to date by every write, for equality lookups.
+    """
+
+    def __init__(self) -> None:
+        # node -> row in every column
+        self.ids: dict[str, int] = {}
+        self.columns: dict[str, NumberColumn | LabelColumn] = {}
+        self._free: list[int] = []
+        self._size: int = 0
+        self.indexes: dict[str, AttributeIndex] = {}
+        # set by changes since the attribute file was last written or read
+        self.dirty: bool = False
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def names(self) -> list[str]:
+        return list(self.columns)
+
+    def row(self, node: str) -> int:
+        row: int | None = self.ids.get(node)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+            else:
+                row = self._size
+                self._size += 1
+                for column in self.columns.values():
+                    column.grow()
+            self.ids[node] = row
+        return row
+
+    def column(self, name: str, value: Any = None) -> NumberColumn | LabelColumn:
+        # unknown attributes are created, typed after the value about to be stored
+        column = self.columns.get(name)
+        if column is None:
+            column = self.columns[name] = LabelColumn(self._size) if isinstance(value, str) else NumberColumn(self._size)
+        return column
+
+    def get(self, node: str, name: str) -> float | str | None:
+        row: int | None = self.ids.get(node)
+        column = self.columns.get(name)
+        if row is None or column is None:
+            return None
+        return column.get(row)
+
+    def set(self, node: str, name: str, value: float | str | None) -> None:
+        # the value is checked before anything is allocated for it; clearing a value nobody has is a no-op
+        if _column_kind(name, value, self.columns.get(name)) is None and (name not in self.columns or node not in self.ids):
+            return
+        column = self.column(name, value)
+        row: int = self.row(node)
+        index: AttributeIndex | None = self.indexes.get(name)
+        if index is None:
+            column.set(row, value)
+        else:
+            old = column.get(row)
+            column.set(row, value)
+            index.move(node, old, column.get(row))
+        self.dirty = True
+
+    def set_many(self, name: str, values: Iterable[tuple[str, float | str | None]]) -> int:
+        # every value is checked, against the column or the first value that fixes its type, before any is written
+        values = list(values)
+        column = self.columns.get(name)
+        for _, value in values:
+            kind: type | None = _column_kind(name, value, column)
+            if column is None and kind is not None:
+                column = kind(self._size)
+        if column is not None and name not in self.columns:
+            self.columns[name] = column
+        index: AttributeIndex | None = self.indexes.get(name)
+        written: int = 0
+        for node, value in values:
+            if column is None:
+                # nothing but clears for an attribute that doesn't exist
+                break
+            row: int = self.row(node)
+            if index is None:
+                column.set(row, value)
+            else:
+                old = column.get(row)
+                column.set(row, value)
+                index.move(node, old, column.get(row))
+            written += 1
+        self.dirty = self.dirty or written > 0
+        return written
+
+    def get_many(self, name: str, nodes: Iterable[str]) -> array | list[str | None]:
+        # numbers come back packed (NaN where missing), labels as a list
+        column = self.columns.get(name)
+        if column is None:
+            raise ValueError(f"Unknown attribute {name}")
+        ids = self.ids
+        if isinstance(column, NumberColumn):
+            values = column.values
+            return array("d", [values[ids[node]] if node in ids else math.nan for node in nodes])
+        return [column.get(ids[node]) if node in ids else None for node in nodes]
+
+    def remove(self, node: str) -> None:
+        row: int | None = self.ids.pop(node, None)
+        if row is None:
+            return
+        for name, column in self.columns.items():
+            index: AttributeIndex | None = self.indexes.get(name)
+            if index is not None:
+                index.discard(node, column.get(row))
+            column.set(row, None)
+        self._free.append(row)
+        self.dirty = True
+
+    def matcher(self, where: Where) -> Callable[[str], bool]:
+        # node -> whether it passes the filter, read straight from the column
+        name, comparison, value = where
+        column = self.columns.get(name)
+        if column is None:
+            raise ValueError(f"Unknown attribute {name}")
+        if comparison not in COMPARISONS:
+            raise ValueError(f"Unknown comparison {comparison}")
+        test: Callable[[int], bool] = column.test(COMPARISONS[comparison], value)
+        ids = self.ids
+
+        def matches(node: str) -> bool:
+            row: int | None = ids.get(node)
+            return row is not None and test(row)
+        return matches
+
+    def create_index(self, name: str) -> AttributeIndex:
+        # may come before the attribute has any values
+        index: AttributeIndex | None = self.indexes.get(name)
+        if index is None:
+            index = self.indexes[name] = AttributeIndex()
+            column = self.columns.get(name)
+            if column is not None:
+                for node, row in self.ids.items():
+                    index.add(node, column.get(row))
+        return index
+
+    def select(self, where: Where) -> list[str]:
+        matches: Callable[[str], bool] = self.matcher(where)
+        name, comparison, value = where
+        if comparison == "==" and name in self.indexes:
+            return self.indexes[name].lookup(value)
+        return [node for node in self.ids if matches(node)]
+
+
+class FilteredAdjacency:
+    """adj_list stand-in that hides neighbours failing a node filter; the endpoints of a search are always let through."""
+    __slots__ = ("_adjacency", "_matches", "_endpoints")
+
+    def __init__(self, adjacency: Mapping[str, Mapping[str, int | float]], matches: Callable[[str], bool], endpoints: Iterable[str] = ()) -> None:
+        self._adjacency = adjacency
+        self._matches = matches
+        self._endpoints = frozenset(endpoints)
+
+    def __getitem__(self, node: str) -> dict[str, int | float]:
+        matches, endpoints = self._matches, self._endpoints
+        return {neighbour: cost for neighbour, cost in self._adjacency[node].items() if neighbour in endpoints or matches(neighbour)}
+
+
+def _pack_strings(strings: list[str]) -> bytes:
+    encoded: list[bytes] = [text.encode("utf-8") for text in strings]
+    offsets = array("q", [0])
+    for text in encoded:
+        offsets.append(offsets[-1] + len(text))
+    blob: bytes = b"".join(encoded)
+    return offsets.tobytes() + blob + _padding(len(blob))
+
+
+def _unpack_strings(data: bytes, position: int, count: int, swap: bool) -> tuple[list[str], int]:
+    offsets = array("q")
+    offsets.frombytes(data[position:position + (count + 1) * 8])
+    if swap:
+        offsets.byteswap()
+    position += (count + 1) * 8
+    blob: bytes = data[position:position + offsets[-1]]
+    strings: list[str] = [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(count)]
+    return strings, position + offsets[-1] + (-offsets[-1] % 8)
+
+
+def write_attributes(path: str, attributes: NodeAttributes) -> None:
+    # rows are written densely in node order, so freed rows don't reach the file
+    nodes: list[str] = list(attributes.ids)
+    rows: list[int] = list(attributes.ids.values())
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(ATTRIBUTE_HEADER.pack(ATTRIBUTE_MAGIC, BYTE_ORDER, len(attributes.columns), len(nodes)))
+        f.write(_pack_strings(nodes))
+        for name, column in attributes.columns.items():
+            encoded: bytes = name.encode("utf-8")
+            if isinstance(column, NumberColumn):
+                f.write(COLUMN_HEADER.pack(NUMBERS, len(encoded), 0))
+                f.write(encoded + _padding(len(encoded)))
+                f.write(array("d", map(column.values.__getitem__, rows)).tobytes())
+            else:
+                f.write(COLUMN_HEADER.pack(LABELS, len(encoded), len(column.labels)))
+                f.write(encoded + _padding(len(encoded)))
+                f.write(_pack_strings(column.labels))
+                f.write(array("q", map(column.codes.__getitem__, rows)).tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    attributes.dirty = False
+
+
+def read_attributes(path: str) -> NodeAttributes:
+    with open(path, "rb") as f:
+        data: bytes = f.read()
+    if len(data) < ATTRIBUTE_HEADER.size:
+        raise ValueError(f"{path} is not an attribute file")
+    magic, byte_order, num_columns, num_nodes = ATTRIBUTE_HEADER.unpack_from(data)
+    if magic != ATTRIBUTE_MAGIC:
+        raise ValueError(f"{path} is not an attribute file")
+    swap: bool = byte_order != BYTE_ORDER
+    attributes = NodeAttributes()
+    nodes, position = _unpack_strings(data, ATTRIBUTE_HEADER.size, num_nodes, swap)
+    attributes.ids = {node: row for row, node in enumerate(nodes)}
+    attributes._size = num_nodes
+    for _ in range(num_columns):
+        kind, name_size, num_labels = COLUMN_HEADER.unpack_from(data, position)
+        position += COLUMN_HEADER.size
+        name: str = data[position:position + name_size].decode("utf-8")
+        position += name_size + (-name_size % 8)
+        if kind == NUMBERS:
+            column = NumberColumn()
+            values: array = column.values
+        else:
+            column = LabelColumn()
+            column.labels, position = _unpack_strings(data, position, num_labels, swap)
+            column.lookup = {label: code for code, label in enumerate(column.labels)}
+            values = column.codes
+        values.frombytes(data[position:position + num_nodes * 8])
+        position += num_nodes * 8
+        if swap:
+            values.byteswap()
+        attributes.columns[name] = column
+    return attributes
@@ -0,0 +1,280 @@
+import heapq
+import math
+import time
+from array import array
+from collections import deque
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+from .results import SearchResult
+
+if TYPE_CHECKING:
+    from .graph import Graph
+
+
+def _cost_typecode(graph: "Graph") -> str:
+    # 64-bit integers when every cost is an integer, else doubles; an integer the chosen column can't hold
+    # exactly is refused rather than rounded
+    integral: bool = True
+    for neighbours in graph.adj_list.values():
+        for cost in neighbours.values():
+            if not isinstance(cost, int):
+                integral = False
+            elif not -(1 << 63) <= cost < (1 << 63):
+                raise ValueError(f"Cost {cost} doesn't fit a 64-bit integer, save the graph as JSON to keep it")
+    if not integral:
+        for neighbours in graph.adj_list.values():
+            for cost in neighbours.values():
+                if isinstance(cost, int) and float(cost) != cost:
+                    raise ValueError(f"Cost {cost} loses precision next to fractional costs, save the graph as JSON to keep it")
+    return "q" if integral else "d"
+
+
+@dataclass(frozen=True, slots=True)
+class CompactGraph:
+    """Read-only graph in CSR form: node i's neighbours are targets[offsets[i]:offsets[i+1]]."""
+    names: Sequence[str]
+    index: Mapping[str, int]
+    offsets: Sequence[int]
+    targets: Sequence[int]
+    weights: Sequence[int | float]
+    # directed graphs hold each edge once, under the node it leaves
+    directed: bool = False
+    # named weight channels read back with a snapshot, one value per entry of targets (NaN for none)
+    channels: Mapping[str, Sequence[float]] = field(default_factory=dict)
+
+    @classmethod
+    def from_graph(cls, graph: "Graph") -> "CompactGraph":
+        names: list[str] = list(graph.adj_list)
+        index: dict[str, int] = {name: i for i, name in enumerate(names)}
+        offsets = array("q", [0])
+        targets = array("i")
+        weights = array(_cost_typecode(graph))
+        for name in names:
+            neighbours = graph.adj_list[name]
+            targets.extend(index[neighbour] for neighbour in neighbours)
+            weights.extend(neighbours.values())
+            offsets.append(len(targets))
+        return cls(names, index, offsets, targets, weights, graph.directed)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.names)
+
+    @property
+    def num_edges(self) -> int:
+        # every undirected edge is stored once per endpoint
+        return len(self.targets) if self.directed else len(self.targets) // 2
+
+    def node_id(self, name: str) -> int | None:
+        return self.index.get(name)
+
+    def neighbours(self, node: int) -> Iterator[tuple[int, int | float]]:
+        for position in range(self.offsets[node], self.offsets[node + 1]):
+            yield self.targets[position], self.weights[position]
+
+    def bfs(self, start: str, target: str) -> SearchResult:
+        return self._result("bfs", start, target, self._bfs_search)
+
+    def dfs(self, start: str, target: str) -> SearchResult:
+        return self._result("dfs", start, target, self._dfs_search)
+
+    def ucs(self, start: str, target: str) -> SearchResult:
+        if start not in self.index:
+            return SearchResult("ucs", start, target, error=f"Start node {start} doesn't exist")
+        if target not in self.index:
+            return SearchResult("ucs", start, target, error=f"Target node {target} doesn't exist")
+        return self._result("ucs", start, target, self._ucs_search)
+
+    def _result(self, algorithm: str, start: str, target: str, search: Callable[..., Any]) -> SearchResult:
+        stats: dict[str, int] = {}
+        began: float = time.perf_counter()
+        found = search(start, target, stats)
+        result = SearchResult(algorithm, start, target, explored=stats.get("explored", 0), elapsed=time.perf_counter() - began)
+        if isinstance(found, tuple):
+            path, result.cost = found
+            result.path = [self.names[node] for node in path]
+        elif found is not None:
+            result.path = [self.names[node] for node in found]
+        return result
+
+    def distances_from(self, source: int, goals: Sequence[int] | None = None) -> array:
+        # single-source Dijkstra over node ids; unreachable nodes cost inf. With goals the search stops once
+        # they are all settled and only their costs are returned, in the order given
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        num_nodes: int = len(offsets) - 1
+        best = array("d", [math.inf]) * num_nodes
+        settled = bytearray(num_nodes)
+        wanted = bytearray(num_nodes) if goals is not None else None
+        remaining: int = num_nodes
+        if goals is not None:
+            for goal in goals:
+                wanted[goal] = 1
+            remaining = sum(wanted)
+        best[source] = 0
+        priority_queue: list[tuple[int | float, int]] = [(0, source)]
+        while priority_queue and remaining:
+            current_cost, current_node = heapq.heappop(priority_queue)
+            if settled[current_node]:
+                continue
+            settled[current_node] = 1
+            if wanted is None or wanted[current_node]:
+                remaining -= 1
+            for position in range(offsets[current_node], offsets[current_node + 1]):
+                neighbor = targets[position]
+                new_cost = current_cost + weights[position]
+                if new_cost < best[neighbor]:
+                    best[neighbor] = new_cost
+                    heapq.heappush(priority_queue, (new_cost, neighbor))
+        if goals is None:
+            return best
+        return array("d", [best[goal] for goal in goals])
+
+    def _bfs_search(self, start: str, target: str, stats: dict[str, int] | None = None) -> list[int] | None:
+        source: int | None = self.node_id(start)
+        goal: int | None = self.node_id(target)
+        if source is None:
+            return None
+        offsets, targets = self.offsets, self.targets
+        fringe: deque[int] = deque([source])
+        visited: set[int] = {source}
+        explored: list[int] = []
+        while fringe:
+            curr_node: int = fringe.popleft()
+            explored.append(curr_node)
+            if curr_node == goal:
+                break
+            for position in range(offsets[curr_node], offsets[curr_node + 1]):
+                node = targets[position]
+                if node not in visited:
+                    visited.add(node)
+                    fringe.append(node)
+        if stats is not None:
+            stats["explored"] = len(explored)
+        return explored if explored[-1] == goal else None
+
+    def _dfs_search(self, start: str, target: str, stats: dict[str, int] | None = None) -> list[int] | None:
+        source: int | None = self.node_id(start)
+        goal: int | None = self.node_id(target)
+        if source is None:
+            return None
+        offsets, targets = self.offsets, self.targets
+        explored: list[int] = [source]
+        visited: set[int] = {source}
+        # each stack entry is the (next, end) slice of targets still to visit for a node on the path
+        stack: list[list[int]] = [[offsets[source], offsets[source + 1]]]
+        while stack and explored[-1] != goal:
+            top = stack[-1]
+            while top[0] < top[1]:
+                node = targets[top[0]]
+                top[0] += 1
+                if node not in visited:
+                    visited.add(node)
+                    explored.append(node)
+                    if node != goal:
+                        stack.append([offsets[node], offsets[node + 1]])
+                    break
+            else:
+                stack.pop()
+        if stats is not None:
+            stats["explored"] = len(explored)
+        return explored if explored[-1] == goal else None
+
+    def _ucs_search(self, start: str, target: str, stats: dict[str, int] | None = None) -> tuple[list[int], int | float] | None:
+        source: int | None = self.node_id(start)
+        goal: int | None = self.node_id(target)
+        if source is None or goal is None:
+            return None
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        priority_queue: list[tuple[int | float, int, int]] = [(0, 0, source)]
+        sequence: int = 1
+        best_cost: dict[int, int | float] = {source: 0}
+        parent: dict[int, int] = {}
+        explored: set[int] = set()
+        while priority_queue:
+            current_cost, _, current_node = heapq.heappop(priority_queue)
+            if current_node in explored:
+                continue
+            explored.add(current_node)
+            if current_node == goal:
+                if stats is not None:
+                    stats["explored"] = len(explored)
+                path: list[int] = [goal]
+                while path[-1] != source:
+                    path.append(parent[path[-1]])
+                path.reverse()
+                return path, current_cost
+            for position in range(offsets[current_node], offsets[current_node + 1]):
+                neighbor = targets[position]
+                if neighbor in explored:
+                    continue
+                new_cost = current_cost + weights[position]
+                if neighbor not in best_cost or new_cost < best_cost[neighbor]:
+                    best_cost[neighbor] = new_cost
+                    parent[neighbor] = current_node
+                    heapq.heappush(priority_queue, (new_cost, sequence, neighbor))
+                    sequence += 1
+        if stats is not None:
+            stats["explored"] = len(explored)
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class EdgeTable:
+    """Edge list in columns: edge i runs from sources[i] to targets[i]. Undirected edges are stored once, not per endpoint."""
+    names: Sequence[str]
+    sources: Sequence[int]
+    targets: Sequence[int]
+    weights: Sequence[int | float]
+    directed: bool = False
+
+    @classmethod
+    def from_graph(cls, graph: "Graph") -> "EdgeTable":
+        names: list[str] = list(graph.adj_list)
+        index: dict[str, int] = {name: i for i, name in enumerate(names)}
+        sources = array("i")
+        targets = array("i")
+        weights = array(_cost_typecode(graph))
+        for start, end, cost in graph.edges():
+            sources.append(index[start])
+            targets.append(index[end])
+            weights.append(cost)
+        return cls(names, sources, targets, weights, graph.directed)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.names)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.sources)
+
+    def __iter__(self) -> Iterator[tuple[str, str, int | float]]:
+        names = self.names
+        for source, target, weight in zip(self.sources, self.targets, self.weights):
+            yield names[source], names[target], weight
+
+    def to_compact(self) -> CompactGraph:
+        # counting sort into CSR; an undirected edge is entered under both of its ends
+        num_nodes: int = len(self.names)
+        ends: list[tuple[Sequence[int], Sequence[int]]] = [(self.sources, self.targets)]
+        if not self.directed:
+            ends.append((self.targets, self.sources))
+        offsets = array("q", [0]) * (num_nodes + 1)
+        for froms, _ in ends:
+            for node in froms:
+                offsets[node + 1] += 1
+        for node in range(num_nodes):
+            offsets[node + 1] += offsets[node]
+        next_free = array("q", offsets[:-1])
+        targets = array("i", [0]) * offsets[-1]
+        typecode: str = self.weights.typecode if isinstance(self.weights, array) else "d"
+        weights = array(typecode, [0]) * offsets[-1]
+        for froms, tos in ends:
+            for node, neighbour, weight in zip(froms, tos, self.weights):
+                position = next_free[node]
+                targets[position] = neighbour
+                weights[position] = weight
+                next_free[node] += 1
+        names: list[str] = list(self.names)
+        return CompactGraph(names, {name: i for i, name in enumerate(names)}, offsets, targets, weights, self.directed)
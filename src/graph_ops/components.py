@@ -0,0 +1,59 @@
+from collections.abc import Iterable
+
+
+class UnionFind:
+    """Disjoint sets of node names (union by size, path halving), kept up to date as a graph grows."""
+
+    def __init__(self, nodes: Iterable[str] = ()) -> None:
+        self.parent: dict[str, str] = {}
+        # component sizes, only kept for roots
+        self.size: dict[str, int] = {}
+        self.count: int = 0
+        for node in nodes:
+            self.add(node)
+
+    def __contains__(self, node: str) -> bool:
+        return node in self.parent
+
+    def add(self, node: str) -> None:
+        if node not in self.parent:
+            self.parent[node] = node
+            self.size[node] = 1
+            self.count += 1
+
+    def find(self, node: str) -> str:
+        parent = self.parent
+        while parent[node] != node:
+            # point every other node on the way at its grandparent, which keeps later finds short
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def union(self, a: str, b: str) -> bool:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size.pop(root_b)
+        self.count -= 1
+        return True
+
+    def connected(self, a: str, b: str) -> bool:
+        return self.find(a) == self.find(b)
+
+    def groups(self) -> list[list[str]]:
+        # members keep insertion order, largest component first
+        groups: dict[str, list[str]] = {}
+        for node in self.parent:
+            groups.setdefault(self.find(node), []).append(node)
+        return sorted(groups.values(), key=len, reverse=True)
+
+
+def build_union_find(adj_list: dict[str, dict[str, int]]) -> UnionFind:
+    components: UnionFind = UnionFind(adj_list)
+    for node, neighbours in adj_list.items():
+        for neighbour in neighbours:
+            components.union(node, neighbour)
+    return components
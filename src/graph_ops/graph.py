@@ -1,14 +1,99 @@
-import json,os
-from tabulate import tabulate
-import networkx as nx
-from asciinet import graph_to_ascii
-from typing import TypedDict
-FILENAME = ".graph_data.json"
+import csv,heapq,json,math,os,time
+from array import array
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from functools import partial
+from itertools import chain, islice
+from typing import Any, TypedDict
+from .attributes import ATTRIBUTE_SUFFIX, FilteredAdjacency, LabelColumn, NodeAttributes, Where, read_attributes, write_attributes
+from .cache import MISSING, PathCache
+from .compact import CompactGraph, EdgeTable
+from .components import UnionFind, build_union_find
+from .indexes import NameIndex
+from .paths import ShortestPathTree
+from .results import SearchResult
+from .landmarks import LANDMARK_SUFFIX, Landmarks, read_landmarks, select_landmarks, write_landmarks
+from .snapshot import is_snapshot, open_snapshot, read_snapshot, write_snapshot
+from .weights import EdgeWeights
+from .wal import ADD_EDGE, ADD_NODE, REMOVE_EDGE, REMOVE_NODE, SET_WEIGHTS, WAL_SUFFIX, WriteAheadLog, base_identity, read_log
+FILENAME = ".graph_data"
+LEGACY_FILENAME = ".graph_data.json"
+# compact the write-ahead log into a new snapshot once it outgrows this share of the snapshot
+COMPACTION_RATIO = 0.5
+COMPACTION_MIN_BYTES = 1 << 20
+# networkx/asciinet drawings only stay usable for small graphs; past this many edges display lists them instead
+DRAW_LIMIT = 200
+PAGE_SIZE = 50
+
+
+def _parse_cost(text: str) -> int | float:
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _parse_edge_rows(rows: Iterable[list[str]]) -> Iterator[tuple[str, str] | tuple[str, str, int | float]]:
+    for row in rows:
+        if not row or row[0].startswith("#"):
+            continue
+        if len(row) == 2:
+            yield row[0].strip(), row[1].strip()
+        elif len(row) == 3:
+            yield row[0].strip(), row[1].strip(), _parse_cost(row[2])
+        else:
+            raise ValueError(f"Edge rows need 2 or 3 fields, got {row}")
+
+
+def _edge_line(node1: str, node2: str, weight: int | float, directed: bool = False) -> str:
+    if directed:
+        return f"  {node1} ---({weight})--→ {node2}"
+    return f"  {node1} ←--({weight})--→ {node2}"
+
+
+def manhattan(a: tuple[float, float], b: tuple[float, float]) -> float:
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def euclidean(a: tuple[float, float], b: tuple[float, float]) -> float:
+    return math.hypot(a[0] - b[0], a[1] - b[1])
+
+
+HEURISTICS: dict[str, Callable[[tuple[float, float], tuple[float, float]], float]] = {
+    "manhattan": manhattan,
+    "euclidean": euclidean,
+}
+
 
 class Graph:
-    def __init__(self) -> None:
+    def __init__(self, cache_size: int = 128, directed: bool = False) -> None:
+        # out-edges; an undirected graph mirrors every edge into both endpoints' dicts
         self.adj_list: dict[str, dict[str, int]] = {}
+        self.directed: bool = directed
+        # in-edges of a directed graph, built the first time something walks edges backwards and kept up to
+        # date from then on
+        self._in_adj: dict[str, dict[str, int]] | None = None
         self.num_nodes: int = 0
+        self.wal: WriteAheadLog | None = None
+        # identity of the file this graph was loaded from, while memory still equals it plus its log
+        self._wal_base: tuple[int, int, int] | None = None
+        # bumped by every mutation so derived data (the path cache) can tell it is out of date
+        self.version: int = 0
+        # bumped only by changes to nodes, edges and costs, which is all the landmark tables depend on
+        self.edges_version: int = 0
+        self.landmarks: Landmarks | None = None
+        # logged changes replayed on top of the graph file by load()
+        self._replayed: int = 0
+        self.cache: PathCache = PathCache(cache_size)
+        # connectivity index: built on the first connected()/components() call, then extended as nodes and
+        # edges are added; removals drop it and the next query rebuilds it
+        self._components: UnionFind | None = None
+        # named weight channels besides the cost in adj_list, e.g. distance/time/toll
+        self.edge_weights: EdgeWeights = EdgeWeights(directed)
+        # node attributes such as labels and capacities, one packed column per attribute
+        self.attributes: NodeAttributes = NodeAttributes()
+        # sorted node names for prefix/range lookups, only kept once index_names() asks for it
+        self.name_index: NameIndex | None = None
 
     def add_node(self, new_node: str, neighbours: dict[str, int] | None = None) -> str | None:
         if neighbours is None:
@@ -17,23 +102,98 @@ class Graph:
             return f"{new_node} already exists"
         self.adj_list[new_node] = neighbours.copy()
         self.num_nodes += 1
+        in_adj = self._in_adj
+        if in_adj is not None:
+            in_adj[new_node] = {}
+        if self.name_index is not None:
+            self.name_index.add(new_node)
         for neighbour, cost in neighbours.items():
             if neighbour not in self.adj_list:
                 self.adj_list[neighbour] = {}
-            if new_node not in self.adj_list[neighbour]:
+                if in_adj is not None:
+                    in_adj[neighbour] = {}
+                if self.name_index is not None:
+                    self.name_index.add(neighbour)
+            if self.directed:
+                if in_adj is not None:
+                    in_adj[neighbour][new_node] = cost
+            elif new_node not in self.adj_list[neighbour]:
                 self.adj_list[neighbour][new_node] = cost
+        if self._components is not None:
+            self._components.add(new_node)
+            for neighbour in neighbours:
+                self._components.add(neighbour)
+                self._components.union(new_node, neighbour)
+        self._log(ADD_NODE, new_node, neighbours)
         return f"{new_node} added to the graph."
 
     def remove_node(self, target_node: str) -> str:
-        for node in self.adj_list:
-            if target_node in self.adj_list[node]:
-                del self.adj_list[node][target_node]
-        presence: dict[str, int] | bool = self.adj_list.pop(target_node, False)
-        if not presence:
+        if not self._unlink(target_node):
             return(f'Node {target_node} not found.')
+        if self.name_index is not None:
+            self.name_index.remove(target_node)
         self.num_nodes -= 1
+        self._components = None
+        self._log(REMOVE_NODE, target_node)
         return f"{target_node} removed from the graph"
 
+    def remove_nodes(self, target_nodes: Iterable[str]) -> str:
+        targets: set[str] = set(target_nodes)
+        removed: int = 0
+        for target_node in targets:
+            # neighbours that are being removed as well are dropped whole, no need to edit them
+            if not self._unlink(target_node, targets):
+                continue
+            self._log(REMOVE_NODE, target_node)
+            removed += 1
+        self.num_nodes -= removed
+        if removed:
+            self._components = None
+            if self.name_index is not None:
+                self.name_index.remove_many(targets)
+        missing: int = len(targets) - removed
+        if missing:
+            return f"{removed} nodes removed from the graph, {missing} not found"
+        return f"{removed} nodes removed from the graph"
+
+    def _unlink(self, target_node: str, skip: set[str] | frozenset[str] = frozenset()) -> bool:
+        # drops the node with every edge touching it; only nodes with an edge to it hold references back,
+        # which for an undirected graph are its own neighbours. A self-loop's back-reference went with the node
+        if target_node not in self.adj_list:
+            return False
+        if self.directed:
+            incoming: dict[str, int] = self._reverse_adjacency().pop(target_node)
+            outgoing: dict[str, int] = self.adj_list.pop(target_node)
+            for neighbour in outgoing:
+                if neighbour not in skip and neighbour != target_node:
+                    self._in_adj[neighbour].pop(target_node, None)
+        else:
+            incoming = self.adj_list.pop(target_node)
+        for neighbour in incoming:
+            if neighbour not in skip and neighbour != target_node:
+                self.adj_list[neighbour].pop(target_node, None)
+        self.attributes.remove(target_node)
+        if self.edge_weights.columns:
+            self.edge_weights.remove_node(target_node, incoming)
+        return True
+
+    def predecessors(self, node: str) -> dict[str, int]:
+        # nodes with an edge into node, and its cost
+        if node not in self.adj_list:
+            raise ValueError(f"{node} doesn't exist")
+        return self._reverse_adjacency()[node]
+
+    def _reverse_adjacency(self) -> dict[str, dict[str, int]]:
+        if not self.directed:
+            return self.adj_list
+        if self._in_adj is None:
+            in_adj: dict[str, dict[str, int]] = {node: {} for node in self.adj_list}
+            for node, neighbours in self.adj_list.items():
+                for neighbour, cost in neighbours.items():
+                    in_adj[neighbour][node] = cost
+            self._in_adj = in_adj
+        return self._in_adj
+
     def check_edge(self, start: str, end: str) -> str:
         # -1 if start doesn't exist, -2 if end doesn't exist, 1 elsewhere (even when an edge doesn't exist)
         if(start == end):
@@ -44,16 +204,27 @@ class Graph:
             return f"{end} doesn't exist"
         return ""
 
-    def add_edge(self, start: str, end: str, cost = 0) -> str:
+    def add_edge(self, start: str, end: str, cost = 0, weights: Mapping[str, float] | None = None) -> str:
         edge_presence: str = self.check_edge(start, end)
         if edge_presence != "":
             return edge_presence
         
-        edge_exists = end in self.adj_list[start] or start in self.adj_list[end]
-        
-        self.adj_list[end][start] = cost
+        if self.directed:
+            edge_exists = end in self.adj_list[start]
+            if self._in_adj is not None:
+                self._in_adj[end][start] = cost
+        else:
+            edge_exists = end in self.adj_list[start] or start in self.adj_list[end]
+            self.adj_list[end][start] = cost
         self.adj_list[start][end] = cost
+        if self._components is not None:
+            self._components.union(start, end)
+        self._log(ADD_EDGE, start, end, cost)
+        if weights:
+            self.set_edge_weights(start, end, weights)
         
+        if self.directed:
+            return f"Edge from {start} to {end} {'updated' if edge_exists else 'added'} with cost {cost}"
         if edge_exists:
             return f"Edge between {start} and {end} updated with cost {cost}"
         else:
@@ -63,16 +234,152 @@ class Graph:
         edge_presence: str = self.check_edge(start, end)
         if edge_presence != "":
             return edge_presence
-        if start in self.adj_list[end]:
+        if self.directed:
+            if self._in_adj is not None:
+                self._in_adj[end].pop(start, None)
+        elif start in self.adj_list[end]:
             del self.adj_list[end][start]
         if end in self.adj_list[start]:
             del self.adj_list[start][end]
+        self.edge_weights.remove(start, end)
+        self._components = None
+        self._log(REMOVE_EDGE, start, end)
+        if self.directed:
+            return f"Edge from {start} to {end} removed."
         return f"Edge between {start} and {end} removed."
 
+    def set_edge_weights(self, start: str, end: str, weights: Mapping[str, float]) -> str:
+        if end not in self.adj_list.get(start, {}):
+            return f"No edge from {start} to {end}" if self.directed else f"No edge between {start} and {end}"
+        self.edge_weights.set(start, end, weights)
+        self._log(SET_WEIGHTS, start, end, dict(weights), edges=False)
+        values: str = ", ".join(f"{name}={value:g}" for name, value in weights.items())
+        return f"Weights of {start}-{end} set: {values}"
+
+    def set_weight_column(self, name: str, values: Iterable[tuple[str, str, float]]) -> int:
+        # bulk counterpart of set_edge_weights for one channel; rows for missing edges are skipped.
+        # The layout is brought up to date first, so values go straight into the packed column
+        adj_list = self.adj_list
+        edge_weights: EdgeWeights = self.edge_weights
+        edge_weights.channel(name)
+        edge_weights.refresh(adj_list, self.edges_version)
+        written: int = 0
+        wal: WriteAheadLog | None = self.wal
+        for start, end, value in values:
+            if end in adj_list.get(start, {}):
+                edge_weights.set(start, end, {name: value})
+                if wal is not None:
+                    wal.append(SET_WEIGHTS, start, end, {name: value})
+                written += 1
+        if written:
+            self.version += 1
+            if wal is None:
+                self._wal_base = None
+        return written
+
+    def edge_weight(self, start: str, end: str, name: str) -> float | None:
+        return self.edge_weights.get(start, end, name)
+
+    def _adjacency(self, weight: str | None = None, reverse: bool = False, where: Where | None = None, endpoints: Iterable[str] = ()) -> Mapping[str, Mapping[str, int | float]]:
+        # what the searches walk: the edge costs or one named weight channel, forwards or backwards, and
+        # with where only through nodes whose attributes pass it (endpoints always pass)
+        if weight is None:
+            adjacency = self._reverse_adjacency() if reverse else self.adj_list
+        elif weight not in self.edge_weights:
+            raise ValueError(f"Unknown weight {weight}")
+        else:
+            self.edge_weights.refresh(self.adj_list, self.edges_version)
+            adjacency = self.edge_weights.adjacency(weight, self._reverse_adjacency() if reverse and self.directed else None)
+        if where is None:
+            return adjacency
+        return FilteredAdjacency(adjacency, self.attributes.matcher(where), endpoints)
+
+    def add_edges_from(self, edges: Iterable[tuple[str, str] | tuple[str, str, int]], default_cost = 0) -> dict[str, int]:
+        # bulk counterpart of add_edge: missing endpoints are created and no per-edge message is built
+        adj_list = self.adj_list
+        wal: WriteAheadLog | None = self.wal
+        components: UnionFind | None = self._components
+        directed: bool = self.directed
+        in_adj: dict[str, dict[str, int]] | None = self._in_adj
+        # names of created nodes, merged into the name index in one go
+        new_names: list[str] | None = [] if self.name_index is not None else None
+        added: int = 0
+        updated: int = 0
+        created: int = 0
+        skipped: int = 0
+        # the bookkeeping runs even when edges raises partway (a bad row in a file), covering the edges applied so far
+        try:
+            for edge in edges:
+                if len(edge) == 3:
+                    start, end, cost = edge
+                else:
+                    start, end = edge
+                    cost = default_cost
+                if start == end:
+                    skipped += 1
+                    continue
+                start_neighbours = adj_list.get(start)
+                if start_neighbours is None:
+                    start_neighbours = adj_list[start] = {}
+                    created += 1
+                    if in_adj is not None:
+                        in_adj[start] = {}
+                    if new_names is not None:
+                        new_names.append(start)
+                    if wal is not None:
+                        wal.append(ADD_NODE, start, {})
+                end_neighbours = adj_list.get(end)
+                if end_neighbours is None:
+                    end_neighbours = adj_list[end] = {}
+                    created += 1
+                    if in_adj is not None:
+                        in_adj[end] = {}
+                    if new_names is not None:
+                        new_names.append(end)
+                    if wal is not None:
+                        wal.append(ADD_NODE, end, {})
+                if end in start_neighbours:
+                    updated += 1
+                else:
+                    added += 1
+                start_neighbours[end] = cost
+                if not directed:
+                    end_neighbours[start] = cost
+                elif in_adj is not None:
+                    in_adj[end][start] = cost
+                if components is not None:
+                    components.add(start)
+                    components.add(end)
+                    components.union(start, end)
+                if wal is not None:
+                    wal.append(ADD_EDGE, start, end, cost)
+        finally:
+            self.num_nodes += created
+            if new_names:
+                self.name_index.add_many(new_names)
+            if created or added or updated:
+                self.version += 1
+                self.edges_version += 1
+                if wal is None:
+                    self._wal_base = None
+        return {"edges_added": added, "edges_updated": updated, "nodes_created": created, "skipped": skipped}
+
+    def add_edges_from_file(self, path: str, delimiter: str | None = None, header: bool = False, default_cost = 0) -> dict[str, int]:
+        # streams a CSV/TSV edge list of "start,end[,cost]" rows; blank lines and '#' comments are skipped
+        if delimiter is None:
+            delimiter = "\t" if path.endswith((".tsv", ".tab")) else ","
+        with open(path, newline="") as f:
+            rows = csv.reader(f, delimiter=delimiter)
+            if header:
+                next(rows, None)
+            stats: dict[str, int] = self.add_edges_from(_parse_edge_rows(rows), default_cost)
+        return stats
+
     def display_node(self, node: str) -> str:
         if node not in self.adj_list.keys():
             return f"{node} doesn't exist"
-        if not self.adj_list[node]:
+        incoming: dict[str, int] = self.predecessors(node) if self.directed else {}
+        if not self.adj_list[node] and not incoming:
             return f"{node} doesn't have any neighbours"
         path: str = f'{node} '
         neighbours: list[str] = list(self.adj_list[node].keys())
@@ -81,155 +388,826 @@ class Graph:
             cost = self.adj_list[node][neighbour]
             path += f' -> {neighbour}({cost})' if first else f' , {neighbour}({cost})'
             first = False
+        if incoming:
+            # a directed graph lists the edges coming in on a line of their own
+            if neighbours:
+                path += f'\n{node} '
+            path += ' <- ' + ' , '.join(f'{neighbour}({cost})' for neighbour, cost in incoming.items())
         return path + '\n'
 
-    def display_graph(self) -> str | None:
+    def edges(self, nodes: Iterable[str] | None = None) -> Iterator[tuple[str, str, int]]:
+        # each undirected edge once, ends in name order, or each directed edge as (from, to, cost);
+        # with nodes, only edges between those nodes
+        scope: dict[str, Any] = self.adj_list if nodes is None else dict.fromkeys(nodes)
+        done: set[str] = set()
+        for node in scope:
+            for neighbour, cost in self.adj_list[node].items():
+                if neighbour in done or neighbour not in scope:
+                    continue
+                if self.directed or node <= neighbour:
+                    yield node, neighbour, cost
+                else:
+                    yield neighbour, node, cost
+            if not self.directed:
+                done.add(node)
+
+    def neighbourhood(self, node: str, hops: int = 1) -> dict[str, int]:
+        # nodes within hops edges of node and how many hops away they are, nearest first
+        if node not in self.adj_list:
+            raise ValueError(f"{node} doesn't exist")
+        depth: dict[str, int] = {node: 0}
+        frontier: list[str] = [node]
+        for hop in range(1, hops + 1):
+            next_frontier: list[str] = []
+            for current in frontier:
+                for neighbour in self.adj_list[current]:
+                    if neighbour not in depth:
+                        depth[neighbour] = hop
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+        return depth
+
+    def connected(self, a: str, b: str) -> bool:
+        for node in (a, b):
+            if node not in self.adj_list:
+                raise ValueError(f"{node} doesn't exist")
+        return self._union_find().connected(a, b)
+
+    def components(self) -> list[list[str]]:
+        # connected components, largest first
+        return self._union_find().groups()
+
+    def _union_find(self) -> UnionFind:
+        if self._components is None:
+            self._components = build_union_find(self.adj_list)
+        return self._components
+
+    def display_graph(self, around: str | None = None, hops: int = 1) -> str:
+        return "\n".join(self.display_pages(around, hops))
+
+    def display_pages(self, around: str | None = None, hops: int = 1, page_size: int = PAGE_SIZE) -> Iterator[str]:
+        # small graphs are drawn as one page; past DRAW_LIMIT edges the edges are listed page_size lines at a time,
+        # produced as they are read so the first page doesn't wait for the whole graph
+        if around is not None and around not in self.adj_list:
+            yield f"{around} doesn't exist"
+            return
         if len(self.adj_list) == 0:
-            return "No nodes to display"
-        
-        weighted_edges: list[tuple] = []
-        isolated_nodes: list[str] = []
+            yield "No nodes to display"
+            return
+        nodes: dict[str, Any] = self.adj_list if around is None else self.neighbourhood(around, hops)
+        edges: Iterator[tuple[str, str, int]] = self.edges(None if around is None else nodes)
+        first_edges: list[tuple[str, str, int]] = list(islice(edges, DRAW_LIMIT + 1))
+        incoming: dict[str, dict[str, int]] = self._reverse_adjacency()
+        isolated_nodes: Iterator[str] = (node for node in nodes if not self.adj_list[node] and not incoming[node])
+        heading: list[str] = [] if around is None else [f"Within {hops} hops of {around}:"]
         
-        for node, neighbours in self.adj_list.items():
-            if not neighbours:
-                isolated_nodes.append(node)
-            else:
-                for neighbour, cost in neighbours.items():
-                    edge = tuple(sorted((node, neighbour)))
-                    edge_with_weight = (edge[0], edge[1], cost)
-                    if edge_with_weight not in weighted_edges:
-                        weighted_edges.append(edge_with_weight)
+        if len(first_edges) > DRAW_LIMIT:
+            lines: Iterator[str] = chain(
+                heading,
+                ["Edge weights (too many edges to draw):"],
+                (_edge_line(*edge, self.directed) for edge in chain(first_edges, edges)),
+                (f"  {node} (isolated)" for node in isolated_nodes),
+            )
+            while page := list(islice(lines, page_size)):
+                yield "\n".join(page)
+            return
         
-        if weighted_edges:
-            G = nx.Graph()
-            for node1, node2, weight in weighted_edges:
+        lines = heading
+        if first_edges:
+            # the drawing libraries are imported here rather than with the module: networkx alone takes a few
+            # hundred ms to import, which every user of Graph would pay without ever drawing anything
+            import networkx as nx
+            from asciinet import graph_to_ascii
+            G = nx.DiGraph() if self.directed else nx.Graph()
+            for node1, node2, weight in first_edges:
                 G.add_edge(node1, node2)
             
-            print("Graph structure:")
-            print(graph_to_ascii(G))
+            lines.append("Graph structure:")
+            lines.append(graph_to_ascii(G))
             
-            print("\nEdge weights:")
-            for edge in weighted_edges:
-                node1, node2, weight = edge
-                print(f"  {node1} ←--({weight})--→ {node2}")
+            lines.append("\nEdge weights:")
+            for edge in first_edges:
+                lines.append(_edge_line(*edge, self.directed))
         
-        if isolated_nodes:
-            if weighted_edges:
-                print("\nIsolated nodes:")
+        isolated: list[str] = list(isolated_nodes)
+        if isolated:
+            if first_edges:
+                lines.append("\nIsolated nodes:")
             else:
-                print("Isolated nodes:")
-            for node in isolated_nodes:
+                lines.append("Isolated nodes:")
+            for node in isolated:
                 name_width = max(len(node), 3) 
                 border = "─" * name_width
-                print(f"┌─{border}─┐")
-                print(f"│ {node:^{name_width}} │")
-                print(f"└─{border}─┘")
-                print()
+                lines.append(f"┌─{border}─┐")
+                lines.append(f"│ {node:^{name_width}} │")
+                lines.append(f"└─{border}─┘")
+                lines.append("")
+        yield "\n".join(lines)
+
+    def bfs(self, start: str, target: str, trace: bool = False, bidirectional: bool = False, where: Where | None = None) -> SearchResult:
+        # the one-sided search reports the explored order, the bidirectional one a shortest path;
+        # where limits the nodes between start and target to those whose attributes pass it
+        if where is not None:
+            algorithm: str = "bidirectional_bfs" if bidirectional else "bfs"
+            try:
+                self.attributes.matcher(where)
+            except ValueError as error:
+                return SearchResult(algorithm, start, target, error=str(error))
+            search = self._bidirectional_bfs_search if bidirectional else self._bfs_search
+            return self._search(algorithm, start, target, partial(search, where=where), trace=trace, key=(algorithm, start, target, where))
+        if bidirectional:
+            return self._search("bidirectional_bfs", start, target, self._bidirectional_bfs_search, trace=trace)
+        return self._search("bfs", start, target, self._bfs_search, trace=trace)
 
-    def bfs(self, start: str, target: str) -> str:
-        fringe: list[str] = [start]
+    def _bfs_search(self, start: str, target: str, trace: list[list[str]] | None = None, stats: dict[str, int] | None = None, where: Where | None = None) -> list[str] | None:
+        if start not in self.adj_list:
+            return None
+        adjacency = self._adjacency(where=where, endpoints=(start, target))
+        fringe: deque[str] = deque([start])
+        visited: set[str] = {start}
         explored: list[str] = []
-        trace: list[list[str]] = []
-        print(f"BFS for target {target}")
-        while len(fringe) != 0:
-            trace.append([str(fringe), str(explored)])
-            curr_node: str = fringe.pop(0)
-            if curr_node not in explored:
-                explored.append(curr_node)
+        while fringe:
+            if trace is not None:
+                trace.append([str(list(fringe)), str(explored)])
+            curr_node: str = fringe.popleft()
+            explored.append(curr_node)
             if curr_node == target:
-                print(tabulate(trace,headers=["Fringe","Explored"],tablefmt="fancy_grid"))
-                return " -> ".join(explored)
-            for node in self.adj_list[curr_node].keys():
-                if node not in fringe and node not in explored:
+                break
+            for node in adjacency[curr_node]:
+                if node not in visited:
+                    visited.add(node)
                     fringe.append(node)
-        return f"{target} can't be reached"
-
-    def dfs_helper(self, curr_node: str, explored: list[str], target: str,path: list[str] | None = None, trace: list[list[str]] = []) -> bool:
-        if path is None:
-            path = []
-        path.append(curr_node)
-        trace.append([str(path), str(explored)])
-        if curr_node == target:
-            return True
-        for node in self.adj_list[curr_node].keys():
-            if node not in explored:
-                explored.append(node)
-                if self.dfs_helper(node, explored, target,path,trace):
-                    return True
-        path.pop()
-        return False
-
-    def dfs(self, start: str, target: str) -> str:
-        explored: list[str] = [start]
-        trace:list[list[str]] = []
+        if stats is not None:
+            stats["explored"] = len(explored)
+        return explored if explored[-1] == target else None
+
+    def _bidirectional_bfs_search(self, start: str, target: str, trace: list[list[str]] | None = None, stats: dict[str, int] | None = None, where: Where | None = None) -> list[str] | None:
+        if start not in self.adj_list or target not in self.adj_list:
+            return None
+        # hop counts and parents from each end; whole levels are expanded, smaller frontier first
+        forward: dict[str, tuple[int, str | None]] = {start: (0, None)}
+        backward: dict[str, tuple[int, str | None]] = {target: (0, None)}
+        forward_fringe: list[str] = [start]
+        backward_fringe: list[str] = [target]
+        # the backward side walks edges in reverse, which only differs for a directed graph
+        forward_adj = self._adjacency(where=where, endpoints=(start, target))
+        backward_adj = self._adjacency(reverse=True, where=where, endpoints=(start, target))
+        explored: int = 0
+        meeting: str | None = start if start == target else None
+        while meeting is None and forward_fringe and backward_fringe:
+            if trace is not None:
+                trace.append([str(forward_fringe), str(backward_fringe)])
+            if len(forward_fringe) <= len(backward_fringe):
+                fringe, seen, other, adjacency = forward_fringe, forward, backward, forward_adj
+            else:
+                fringe, seen, other, adjacency = backward_fringe, backward, forward, backward_adj
+            next_fringe: list[str] = []
+            best: int | None = None
+            for node in fringe:
+                explored += 1
+                depth: int = seen[node][0] + 1
+                for neighbour in adjacency[node]:
+                    if neighbour in seen:
+                        continue
+                    seen[neighbour] = (depth, node)
+                    next_fringe.append(neighbour)
+                    if neighbour in other and (best is None or depth + other[neighbour][0] < best):
+                        best = depth + other[neighbour][0]
+                        meeting = neighbour
+            if fringe is forward_fringe:
+                forward_fringe = next_fringe
+            else:
+                backward_fringe = next_fringe
+        if stats is not None:
+            stats["explored"] = explored
+        if meeting is None:
+            return None
+        return self._join_paths(forward, backward, meeting)
+
+    def _join_paths(self, forward: dict[str, tuple[int | float, str | None]], backward: dict[str, tuple[int | float, str | None]], meeting: str) -> list[str]:
         path: list[str] = []
-        if self.dfs_helper(start, explored, target,path,trace):
-            print(tabulate(trace,headers=["Fringe","Explored"],tablefmt="fancy_grid"))
-            return " -> ".join(explored)
-        else:
-            print(tabulate(trace,headers=["Fringe","Explored"],tablefmt="fancy_grid"))
-            return f"{target} is unreachable"
+        node: str | None = meeting
+        while node is not None:
+            path.append(node)
+            node = forward[node][1]
+        path.reverse()
+        node = backward[meeting][1]
+        while node is not None:
+            path.append(node)
+            node = backward[node][1]
+        return path
+
+    def dfs(self, start: str, target: str, trace: bool = False) -> SearchResult:
+        return self._search("dfs", start, target, self._dfs_search, trace=trace)
+
+    def _dfs_search(self, start: str, target: str, trace: list[list[str]] | None = None, stats: dict[str, int] | None = None) -> list[str] | None:
+        if start not in self.adj_list:
+            return None
+        explored: list[str] = [start]
+        visited: set[str] = {start}
+        path: list[str] = [start]
+        # one neighbour iterator per node on the current path, resumed when its child is exhausted
+        stack: list[Iterator[str]] = [iter(self.adj_list[start])]
+        if trace is not None:
+            trace.append([str(path), str(explored)])
+        while stack and explored[-1] != target:
+            for node in stack[-1]:
+                if node not in visited:
+                    visited.add(node)
+                    explored.append(node)
+                    path.append(node)
+                    if trace is not None:
+                        trace.append([str(path), str(explored)])
+                    if node != target:
+                        stack.append(iter(self.adj_list[node]))
+                    break
+            else:
+                stack.pop()
+                path.pop()
+        if stats is not None:
+            stats["explored"] = len(explored)
+        return explored if explored[-1] == target else None
     
-    def ucs(self, start: str, target: str) -> str:
+    def ucs(self, start: str, target: str, trace: bool = False, bidirectional: bool = False, weight: str | None = None, where: Where | None = None) -> SearchResult:
+        # weight picks a named weight channel to minimise instead of the edge cost, where limits the nodes
+        # between start and target to those whose attributes pass it
         if start not in self.adj_list:
-            return f"Start node {start} doesn't exist"
+            return SearchResult("ucs", start, target, error=f"Start node {start} doesn't exist")
         if target not in self.adj_list:
-            return f"Target node {target} doesn't exist"
-        priority_queue: list[tuple[int, str, list[str]]] = [(0, start, [start])]
+            return SearchResult("ucs", start, target, error=f"Target node {target} doesn't exist")
+        if weight is not None or where is not None:
+            algorithm: str = "bidirectional_ucs" if bidirectional else "ucs"
+            try:
+                self._adjacency(weight, where=where)
+            except ValueError as error:
+                return SearchResult(algorithm, start, target, error=str(error))
+            search = self._bidirectional_ucs_search if bidirectional else self._ucs_search
+            return self._search(algorithm, start, target, partial(search, weight=weight, where=where),
+                                trace=trace, key=(algorithm, start, target, weight, where))
+        if bidirectional:
+            return self._search("bidirectional_ucs", start, target, self._bidirectional_ucs_search, trace=trace)
+        landmarks: Landmarks | None = self._current_landmarks()
+        if landmarks is not None:
+            # landmark bounds steer the search towards the target without changing the cost found
+            return self._search("ucs", start, target, self._astar_search, landmarks.bound_to(target), trace=trace)
+        return self._search("ucs", start, target, self._ucs_search, trace=trace)
+    
+    def _ucs_search(self, start: str, target: str, trace: list[list[str]] | None = None, stats: dict[str, int] | None = None, weight: str | None = None, where: Where | None = None) -> tuple[list[str], int] | None:
+        # heap entries are (cost, sequence, node); the sequence number keeps equal-cost
+        # entries in insertion order and stale entries are skipped when popped (lazy decrease-key)
+        priority_queue: list[tuple[int, int, str]] = [(0, 0, start)]
+        sequence: int = 1
+        best_cost: dict[str, int] = {start: 0}
+        parent: dict[str, str] = {}
         explored: set[str] = set()
-        trace: list[list[str]] = []
-        
-        print(f"UCS for target {target}")
+        adjacency = self._adjacency(weight, where=where, endpoints=(start, target))
         
         while priority_queue:
-            current_cost, current_node, path = priority_queue.pop(0)
-            queue_display = [f"{node}({cost})" for cost, node, _ in priority_queue]
-            trace.append([str(queue_display), str(list(explored))])
+            current_cost, _, current_node = heapq.heappop(priority_queue)
+            if trace is not None:
+                queue_display = [f"{node}({cost})" for cost, _, node in sorted(priority_queue)]
+                trace.append([str(queue_display), str(list(explored))])
             if current_node in explored:
                 continue
             explored.add(current_node)
             if current_node == target:
-                print(tabulate(trace, headers=["Priority Queue", "Explored"], tablefmt="fancy_grid"))
-                return f"Path: {' -> '.join(path)}, Total cost: {current_cost}"
-            for neighbor, edge_cost in self.adj_list[current_node].items():
-                if neighbor not in explored:
-                    new_cost = current_cost + edge_cost
-                    new_path = path + [neighbor]
-                    new_entry = (new_cost, neighbor, new_path)
-                    self._insert_sorted(priority_queue, new_entry)
-        
-        print(tabulate(trace, headers=["Priority Queue", "Explored"], tablefmt="fancy_grid"))
-        return f"{target} is unreachable"
-    
-    def _insert_sorted(self, queue: list[tuple[int, str, list[str]]], item: tuple[int, str, list[str]]) -> None:
-        if not queue:
-            queue.append(item)
-            return
-        left, right = 0, len(queue)
-        target_cost = item[0]
-        while left < right:
-            mid = (left + right) // 2
-            if queue[mid][0] <= target_cost:
-                left = mid + 1
+                if stats is not None:
+                    stats["explored"] = len(explored)
+                return self._build_path(parent, start, target), current_cost
+            for neighbor, edge_cost in adjacency[current_node].items():
+                if neighbor in explored:
+                    continue
+                new_cost = current_cost + edge_cost
+                if neighbor not in best_cost or new_cost < best_cost[neighbor]:
+                    best_cost[neighbor] = new_cost
+                    parent[neighbor] = current_node
+                    heapq.heappush(priority_queue, (new_cost, sequence, neighbor))
+                    sequence += 1
+        if stats is not None:
+            stats["explored"] = len(explored)
+        return None
+
+    def _bidirectional_ucs_search(self, start: str, target: str, trace: list[list[str]] | None = None, stats: dict[str, int] | None = None, weight: str | None = None, where: Where | None = None) -> tuple[list[str], int] | None:
+        # Dijkstra from both ends, settling from whichever queue has the cheaper head; stops once
+        # the two heads together can no longer beat the best start-target route seen so far
+        if start == target:
+            if stats is not None:
+                stats["explored"] = 1
+            return [start], 0
+        forward: dict[str, tuple[int, str | None]] = {start: (0, None)}
+        backward: dict[str, tuple[int, str | None]] = {target: (0, None)}
+        forward_queue: list[tuple[int, int, str]] = [(0, 0, start)]
+        backward_queue: list[tuple[int, int, str]] = [(0, 1, target)]
+        forward_settled: set[str] = set()
+        backward_settled: set[str] = set()
+        forward_adj = self._adjacency(weight, where=where, endpoints=(start, target))
+        backward_adj = self._adjacency(weight, reverse=True, where=where, endpoints=(start, target))
+        sequence: int = 2
+        best: int | None = None
+        meeting: str | None = None
+        while forward_queue and backward_queue:
+            if best is not None and forward_queue[0][0] + backward_queue[0][0] >= best:
+                break
+            if trace is not None:
+                trace.append([str([f"{node}({cost})" for cost, _, node in sorted(forward_queue)]),
+                              str([f"{node}({cost})" for cost, _, node in sorted(backward_queue)])])
+            if forward_queue[0][0] <= backward_queue[0][0]:
+                queue, seen, settled, other, adjacency = forward_queue, forward, forward_settled, backward, forward_adj
             else:
-                right = mid
-        queue.insert(left, item)
+                queue, seen, settled, other, adjacency = backward_queue, backward, backward_settled, forward, backward_adj
+            current_cost, _, current_node = heapq.heappop(queue)
+            if current_node in settled:
+                continue
+            settled.add(current_node)
+            for neighbor, edge_cost in adjacency[current_node].items():
+                new_cost = current_cost + edge_cost
+                if neighbor not in seen or new_cost < seen[neighbor][0]:
+                    seen[neighbor] = (new_cost, current_node)
+                    heapq.heappush(queue, (new_cost, sequence, neighbor))
+                    sequence += 1
+                if neighbor in other and (best is None or seen[neighbor][0] + other[neighbor][0] < best):
+                    best = seen[neighbor][0] + other[neighbor][0]
+                    meeting = neighbor
+        if stats is not None:
+            stats["explored"] = len(forward_settled) + len(backward_settled)
+        if meeting is None:
+            return None
+        return self._join_paths(forward, backward, meeting), best
+    
+    def set_position(self, node: str, x: float, y: float) -> str:
+        if node not in self.adj_list:
+            return f"{node} doesn't exist"
+        # coordinates are the x and y attributes, so they are saved and loaded with the others
+        for name in ("x", "y"):
+            if isinstance(self.attributes.columns.get(name), LabelColumn):
+                return f"Attribute {name} holds labels"
+        self.attributes.set(node, "x", float(x))
+        self.attributes.set(node, "y", float(y))
+        self.version += 1
+        return f"{node} placed at ({x}, {y})"
+
+    def position(self, node: str) -> tuple[float, float] | None:
+        # the x and y attributes first, then names of the form "x,y" as used for grid graphs
+        x, y = self.attributes.get(node, "x"), self.attributes.get(node, "y")
+        if isinstance(x, float) and isinstance(y, float):
+            return x, y
+        parts: list[str] = node.split(",")
+        if len(parts) == 2:
+            try:
+                return float(parts[0]), float(parts[1])
+            except ValueError:
+                return None
+        return None
+
+    def set_attribute(self, node: str, name: str, value: float | str | None) -> str:
+        # None clears the value
+        if node not in self.adj_list:
+            return f"{node} doesn't exist"
+        try:
+            self.attributes.set(node, name, value)
+        except ValueError as error:
+            return str(error)
+        self.version += 1
+        return f"{node} {name} cleared" if value is None else f"{node} {name} set to {value}"
+
+    def set_attributes(self, name: str, values: Mapping[str, float | str | None] | Iterable[tuple[str, float | str | None]]) -> int:
+        # bulk counterpart of set_attribute for one attribute; values for missing nodes are skipped
+        rows = values.items() if isinstance(values, Mapping) else values
+        adj_list = self.adj_list
+        written: int = self.attributes.set_many(name, ((node, value) for node, value in rows if node in adj_list))
+        self.version += 1
+        return written
+
+    def attribute(self, node: str, name: str) -> float | str | None:
+        return self.attributes.get(node, name)
+
+    def get_attributes(self, name: str, nodes: Iterable[str] | None = None) -> array | list[str | None]:
+        # one value per node (every node when nodes is None), packed into an array for numeric attributes
+        return self.attributes.get_many(name, self.adj_list if nodes is None else nodes)
+
+    def _replace_attributes(self, attributes: NodeAttributes) -> None:
+        # the attributes indexed so far stay indexed in the new store
+        for name in self.attributes.indexes:
+            attributes.create_index(name)
+        self.attributes = attributes
+
+    def select_nodes(self, where: Where) -> list[str]:
+        # equality lookups on an indexed attribute skip the column scan
+        return self.attributes.select(where)
+
+    def index_names(self) -> str:
+        if self.name_index is None:
+            self.name_index = NameIndex(self.adj_list)
+        return f"Name index holds {len(self.name_index)} nodes"
+
+    def index_attribute(self, name: str) -> str:
+        index = self.attributes.create_index(name)
+        return f"Index on {name} holds {len(index.nodes)} distinct values"
+
+    def nodes_with_prefix(self, prefix: str) -> list[str]:
+        # sorted; without a name index every name is checked
+        if self.name_index is not None:
+            return self.name_index.prefix(prefix)
+        return sorted(node for node in self.adj_list if node.startswith(prefix))
+
+    def nodes_in_range(self, low: str, high: str) -> list[str]:
+        # sorted names from low up to, but not including, high
+        if self.name_index is not None:
+            return self.name_index.range(low, high)
+        return sorted(node for node in self.adj_list if low <= node < high)
+
+    def astar(self, start: str, target: str, heuristic: str | Callable[[str, str], float] = "manhattan", trace: bool = False, weight: str | None = None) -> SearchResult:
+        if start not in self.adj_list:
+            return SearchResult("astar", start, target, error=f"Start node {start} doesn't exist")
+        if target not in self.adj_list:
+            return SearchResult("astar", start, target, error=f"Target node {target} doesn't exist")
+        if weight is not None and weight not in self.edge_weights:
+            return SearchResult("astar", start, target, error=f"Unknown weight {weight}")
+        try:
+            estimate: Callable[[str, str], float] = self._resolve_heuristic(heuristic, target, weight)
+        except ValueError as error:
+            return SearchResult("astar", start, target, error=str(error))
+        # results for a custom heuristic function are not cached, the function may not be the same next time
+        key: tuple[str, ...] | None = ("astar", heuristic, start, target) if isinstance(heuristic, str) else None
+        if weight is None:
+            return self._search("astar", start, target, self._astar_search, estimate, trace=trace, key=key)
+        key = key and (*key, weight)
+        return self._search("astar", start, target, partial(self._astar_search, weight=weight), estimate, trace=trace, key=key)
+
+    def _resolve_heuristic(self, heuristic: str | Callable[[str, str], float], target: str, weight: str | None = None) -> Callable[[str, str], float]:
+        if not isinstance(heuristic, str):
+            return heuristic
+        if heuristic == "landmarks":
+            # the tables hold distances over edge costs, which are no bound on another weight channel
+            if weight is not None:
+                raise ValueError(f"Landmarks only bound edge costs, not weight {weight}")
+            landmarks: Landmarks | None = self._current_landmarks()
+            if landmarks is None:
+                raise ValueError("No landmarks for the current graph, build them first")
+            return landmarks.bound_to(target)
+        if heuristic not in HEURISTICS:
+            raise ValueError(f"Unknown heuristic {heuristic}, choose from {', '.join(HEURISTICS)}, landmarks")
+        return self._position_heuristic(HEURISTICS[heuristic])
+
+    def _search(self, algorithm: str, start: str, target: str, search: Callable[..., Any], *args: Any, trace: bool = False, key: tuple[Any, ...] | None = ()) -> SearchResult:
+        # runs one search engine and wraps what it found; key () means (algorithm, start, target), None skips the cache
+        if key == ():
+            key = (algorithm, start, target)
+        rows: list[list[str]] | None = [] if trace else None
+        began: float = time.perf_counter()
+        found, explored = self._run_search(key, search, start, target, *args, trace=rows)
+        result = SearchResult(algorithm, start, target, explored=explored, elapsed=time.perf_counter() - began, trace=rows)
+        # weighted engines return (path, cost), the others just the node list
+        if isinstance(found, tuple):
+            path, result.cost = found
+        else:
+            path = found
+        # a cached path is shared by every caller that gets it, so each result gets its own copy
+        result.path = None if path is None else list(path)
+        return result
+
+    def _run_search(self, key: tuple[Any, ...] | None, search: Callable[..., Any], *args: Any, trace: list[list[str]] | None = None) -> tuple[Any, int]:
+        # returns what the engine found and how many nodes it expanded; trace-free results come from the
+        # path cache until the graph changes, traced runs always search so their trace can be shown
+        if trace is not None or key is None:
+            stats: dict[str, int] = {}
+            return search(*args, trace, stats), stats.get("explored", 0)
+        result = self.cache.get(key, self.version)
+        if result is MISSING:
+            stats = {}
+            result = search(*args, None, stats), stats.get("explored", 0)
+            self.cache.put(key, self.version, result)
+        return result
+
+    def _position_heuristic(self, distance: Callable[[tuple[float, float], tuple[float, float]], float]) -> Callable[[str, str], float]:
+        # coordinates parsed from names are cached for the lifetime of one search
+        cache: dict[str, tuple[float, float] | None] = {}
         
+        def lookup(node: str) -> tuple[float, float] | None:
+            if node not in cache:
+                cache[node] = self.position(node)
+            return cache[node]
+        
+        def estimate(node: str, target: str) -> float:
+            # nodes without coordinates get no estimate, which keeps the heuristic admissible
+            node_position = lookup(node)
+            target_position = lookup(target)
+            if node_position is None or target_position is None:
+                return 0
+            return distance(node_position, target_position)
+        return estimate
+
+    def _astar_search(self, start: str, target: str, estimate: Callable[[str, str], float], trace: list[list[str]] | None = None, stats: dict[str, int] | None = None, weight: str | None = None) -> tuple[list[str], int] | None:
+        # heap entries are (cost + estimate, -cost, sequence, node): ties on the estimate go to the deeper
+        # entry, which matters on grids where many routes share the same total. A node is expanded again
+        # if a cheaper route to it turns up later, so admissible but inconsistent heuristics stay optimal
+        priority_queue: list[tuple[float, int, int, str]] = [(estimate(start, target), 0, 0, start)]
+        sequence: int = 1
+        best_cost: dict[str, int] = {start: 0}
+        parent: dict[str, str] = {}
+        expanded: int = 0
+        adjacency = self._adjacency(weight)
+        
+        while priority_queue:
+            _, negative_cost, _, current_node = heapq.heappop(priority_queue)
+            current_cost = -negative_cost
+            if trace is not None:
+                queue_display = [f"{node}({-cost}+{priority + cost:g})" for priority, cost, _, node in sorted(priority_queue)]
+                trace.append([str(queue_display), str(list(parent))])
+            if current_cost > best_cost[current_node]:
+                continue
+            expanded += 1
+            if current_node == target:
+                if stats is not None:
+                    stats["explored"] = expanded
+                return self._build_path(parent, start, target), current_cost
+            for neighbor, edge_cost in adjacency[current_node].items():
+                new_cost = current_cost + edge_cost
+                if neighbor not in best_cost or new_cost < best_cost[neighbor]:
+                    best_cost[neighbor] = new_cost
+                    parent[neighbor] = current_node
+                    heapq.heappush(priority_queue, (new_cost + estimate(neighbor, target), -new_cost, sequence, neighbor))
+                    sequence += 1
+        if stats is not None:
+            stats["explored"] = expanded
+        return None
+
+    def heuristic_violations(self, target: str, heuristic: str | Callable[[str, str], float] = "manhattan", weight: str | None = None) -> list[tuple[str, float, int | float]]:
+        # debug check: (node, estimate, actual) for every node whose estimate of the remaining cost to target
+        # is above the exact cost, found with a full search back from the target
+        if target not in self.adj_list:
+            raise ValueError(f"Target node {target} doesn't exist")
+        estimate: Callable[[str, str], float] = self._resolve_heuristic(heuristic, target)
+        problems: list[tuple[str, float, int | float]] = []
+        for node, remaining in self.shortest_paths(target, reverse=True, weight=weight).distances.items():
+            guess = estimate(node, target)
+            if guess > remaining:
+                problems.append((node, guess, remaining))
+        return problems
+
+    def shortest_paths(self, source: str, cutoff: int | float | None = None, targets: Iterable[str] | None = None, reverse: bool = False, weight: str | None = None, where: Where | None = None) -> ShortestPathTree:
+        # single-source Dijkstra: settles every reachable node, or stops early once the next node costs more
+        # than cutoff or every node in targets is settled; the tree answers path queries to any settled node.
+        # reverse follows edges backwards, giving each node's cost to reach source (paths then run backwards)
+        adjacency = self._adjacency(weight, reverse, where, endpoints=(source,))
+        if source not in self.adj_list:
+            raise ValueError(f"Start node {source} doesn't exist")
+        remaining: set[str] | None = set(targets) if targets is not None else None
+        distances: dict[str, int] = {}
+        parent: dict[str, str] = {}
+        # heap entries are (cost, sequence, node, node it was reached from)
+        priority_queue: list[tuple[int, int, str, str | None]] = [(0, 0, source, None)]
+        sequence: int = 1
+        while priority_queue:
+            current_cost, _, current_node, via = heapq.heappop(priority_queue)
+            if current_node in distances:
+                continue
+            if cutoff is not None and current_cost > cutoff:
+                break
+            distances[current_node] = current_cost
+            if via is not None:
+                parent[current_node] = via
+            if remaining is not None:
+                remaining.discard(current_node)
+                if not remaining:
+                    break
+            for neighbor, edge_cost in adjacency[current_node].items():
+                if neighbor not in distances:
+                    heapq.heappush(priority_queue, (current_cost + edge_cost, sequence, neighbor, current_node))
+                    sequence += 1
+        return ShortestPathTree(source, distances, parent)
+
+    def multi_source_distances(self, sources: Iterable[str], targets: Iterable[str] | None = None, workers: int | None = None, chunk_size: int = 16) -> Iterator[tuple[str, array]]:
+        # distance rows for many sources, sharded across a process pool (one process per core by default).
+        # Rows stream back in completion order as (source, costs); costs follow targets, or every node in
+        # graph order when targets is None, with inf where a node can't be reached
+        compact: CompactGraph = self.to_compact()
+        source_ids: list[int] = [self._require_id(compact, source) for source in sources]
+        goal_ids: list[int] | None = [self._require_id(compact, target) for target in targets] if targets is not None else None
+        names = compact.names
+        # the process pool machinery is only loaded once it is needed
+        from .parallel import multi_source_distances
+        return ((names[source], row) for source, row in multi_source_distances(compact, source_ids, goal_ids, workers, chunk_size))
+
+    def _require_id(self, compact: CompactGraph, node: str) -> int:
+        node_id: int | None = compact.node_id(node)
+        if node_id is None:
+            raise ValueError(f"Node {node} doesn't exist")
+        return node_id
+
+    def build_landmarks(self, count: int = 8) -> str:
+        if count < 1:
+            return "Landmark count must be at least 1"
+        # the bounds rely on d(a, b) == d(b, a)
+        if self.directed:
+            return "Landmarks need an undirected graph"
+        if any(cost < 0 for neighbours in self.adj_list.values() for cost in neighbours.values()):
+            return "Landmarks need non-negative edge costs"
+        self.landmarks = select_landmarks(self, count)
+        self.landmarks.version = self.edges_version
+        if not self.landmarks.landmarks:
+            return "No nodes to pick landmarks from"
+        return f"{len(self.landmarks.landmarks)} landmarks: {', '.join(self.landmarks.landmarks)}"
+
+    def _current_landmarks(self) -> Landmarks | None:
+        # any edge change since the tables were built may have changed distances, so they are dropped;
+        # positions, attributes and weight channels don't touch the costs the tables hold
+        if self.landmarks is not None and self.landmarks.version != self.edges_version:
+            self.landmarks = None
+        return self.landmarks
+
+    def _build_path(self, parent: dict[str, str], start: str, target: str) -> list[str]:
+        path: list[str] = [target]
+        while path[-1] != start:
+            path.append(parent[path[-1]])
+        path.reverse()
+        return path
+        
+    def to_compact(self) -> CompactGraph:
+        return CompactGraph.from_graph(self)
+
+    def to_edge_table(self) -> EdgeTable:
+        # each edge once in flat columns, about half the size of to_compact() for an undirected graph
+        return EdgeTable.from_graph(self)
+
+    def from_edge_table(self, table: EdgeTable) -> None:
+        data: dict[str, dict[str, int]] = {name: {} for name in table.names}
+        for start, end, cost in table:
+            data[start][end] = cost
+            if not table.directed:
+                data[end][start] = cost
+        self.directed = table.directed
+        self.from_dict(data)
+
     def to_dict(self) -> dict[str, dict[str, int]]:
         return self.adj_list
 
     def from_dict(self, data: dict[str, dict[str, int]]) -> None:
         self.adj_list = data
         self.num_nodes = len(data)
+        self._components = None
+        self._in_adj = None
+        self.edge_weights = EdgeWeights(self.directed)
+        self._replace_attributes(NodeAttributes())
+        if self.name_index is not None:
+            self.name_index = NameIndex(data)
+        self.version += 1
+        self.edges_version += 1
+        self._wal_base = None
+
+    def from_compact(self, compact: CompactGraph) -> None:
+        names, offsets = compact.names, compact.offsets
+        entries = zip(map(names.__getitem__, compact.targets), compact.weights)
+        data: dict[str, dict[str, int]] = {}
+        for node, name in enumerate(names):
+            data[name] = dict(islice(entries, offsets[node + 1] - offsets[node]))
+        self.directed = compact.directed
+        self.from_dict(data)
+        if compact.channels:
+            self.edge_weights.restore(names, offsets, compact.targets, compact.channels, self.edges_version)
+        
+    def _log(self, op: int, *fields, edges: bool = True) -> None:
+        # edges=False for changes that leave nodes, edges and costs alone
+        self.version += 1
+        if edges:
+            self.edges_version += 1
+        if self.wal is not None:
+            self.wal.append(op, *fields)
+        else:
+            self._wal_base = None
+
+    def enable_wal(self) -> None:
+        # from here on mutations are appended to the log and save() only rewrites the graph file on compaction
+        if self.wal is not None:
+            return
+        if self._wal_base is None:
+            self._write(fmt="snapshot")
+            self._wal_base = base_identity(FILENAME)
+        self.wal = WriteAheadLog.open(FILENAME + WAL_SUFFIX, self._wal_base, self.directed)
+
+    def _needs_compaction(self) -> bool:
+        assert self.wal is not None
+        if self._wal_base is None:
+            # the graph was replaced wholesale (from_dict), which the log can't express
+            return True
+        base_size: int = self.wal.base[1]
+        return self.wal.size > max(COMPACTION_MIN_BYTES, base_size * COMPACTION_RATIO)
         
-    def save(self):
-        with(open(FILENAME, "w")) as f:
-            json.dump(self.to_dict(),f)
+    def save(self, fmt: str = "snapshot"):
+        if self.wal is not None and fmt == "snapshot" and not self._needs_compaction():
+            self.wal.sync()
+        else:
+            self._write(fmt)
+            self._wal_base = base_identity(FILENAME)
+            self._replayed = 0
+            if self.wal is not None:
+                # the new graph file holds every logged change, so start an empty log against it
+                self.wal.close()
+                self.wal = WriteAheadLog(FILENAME + WAL_SUFFIX, self._wal_base, self.directed)
+                if os.path.exists(self.wal.path):
+                    os.unlink(self.wal.path)
+        self._save_attributes()
+        self._save_landmarks()
+
+    def _save_attributes(self) -> None:
+        # attributes aren't logged, so the whole file is rewritten whenever they changed
+        path: str = FILENAME + ATTRIBUTE_SUFFIX
+        if not self.attributes.columns:
+            if os.path.exists(path):
+                os.unlink(path)
+        elif self.attributes.dirty or not os.path.exists(path):
+            write_attributes(path, self.attributes)
+
+    def _disk_state(self) -> tuple[int, int, int, int] | None:
+        # the graph file identity plus the number of logged changes on top of it, or None when memory has unsaved changes
+        if self._wal_base is None:
+            return None
+        records: int = self.wal.records if self.wal is not None else self._replayed
+        return (*self._wal_base, records)
+
+    def _save_landmarks(self) -> None:
+        path: str = FILENAME + LANDMARK_SUFFIX
+        landmarks: Landmarks | None = self._current_landmarks()
+        state = self._disk_state()
+        if landmarks is None or state is None:
+            if os.path.exists(path):
+                os.unlink(path)
+            return
+        if landmarks.saved_state != state:
+            write_landmarks(path, landmarks, state)
+            landmarks.saved_state = state
+
+    def _write(self, fmt: str) -> None:
+        if fmt == "json":
+            with(open(FILENAME, "w")) as f:
+                json.dump(self.to_dict(),f)
+        elif fmt == "snapshot":
+            # laid out for the current edges, the channels line up with the entries of to_compact()
+            self.edge_weights.refresh(self.adj_list, self.edges_version)
+            write_snapshot(FILENAME, self.to_compact(), self.edge_weights.columns)
+        else:
+            raise ValueError(f"Unknown save format {fmt}")
     
     def load(self):
-        if(os.path.exists(FILENAME)):
-            with(open(FILENAME,"r")) as f:
-                self.from_dict(json.load(f))
+        # graphs saved before the binary snapshot format live in the legacy JSON file
+        filename: str = FILENAME if os.path.exists(FILENAME) else LEGACY_FILENAME
+        if(os.path.exists(filename)):
+            if is_snapshot(filename):
+                self.from_compact(read_snapshot(filename))
+            else:
+                with(open(filename,"r")) as f:
+                    self.from_dict(json.load(f))
+        base: tuple[int, int, int] = base_identity(filename)
+        self._replayed = self._replay(base)
+        self._wal_base = base
+        if os.path.exists(FILENAME + ATTRIBUTE_SUFFIX):
+            self._replace_attributes(read_attributes(FILENAME + ATTRIBUTE_SUFFIX))
+            # nodes removed since the file was written lose their values
+            for node in [node for node in self.attributes.ids if node not in self.adj_list]:
+                self.attributes.remove(node)
+        # landmark tables saved for exactly this graph state are reused, anything else is rebuilt on request
+        self.landmarks = read_landmarks(FILENAME + LANDMARK_SUFFIX, self._disk_state())
+        if self.landmarks is not None:
+            self.landmarks.version = self.edges_version
+
+    def _replay(self, base: tuple[int, int, int]) -> int:
+        # re-apply mutations logged since the graph file was written; a stale or missing log is skipped,
+        # one logged for the other kind of graph is refused
+        logged = read_log(FILENAME + WAL_SUFFIX, base)
+        if logged is None:
+            return 0
+        records, _, directed = logged
+        if directed is not None and directed != self.directed:
+            if base != (0, 0, 0) or self.adj_list:
+                raise ValueError(f"{FILENAME + WAL_SUFFIX} holds changes to a {'directed' if directed else 'undirected'} graph")
+            # with no graph file the log is all there is, so it says what kind of graph this is
+            self.directed = directed
+            self.from_dict({})
+        wal, self.wal = self.wal, None
+        try:
+            for op, fields in records:
+                if op == ADD_NODE:
+                    self.add_node(*fields)
+                elif op == REMOVE_NODE:
+                    self.remove_node(*fields)
+                elif op == ADD_EDGE:
+                    self.add_edge(*fields)
+                elif op == REMOVE_EDGE:
+                    self.remove_edge(*fields)
+                elif op == SET_WEIGHTS:
+                    self.set_edge_weights(*fields)
+        finally:
+            self.wal = wal
+        return len(records)
+
+    @staticmethod
+    def load_compact(use_mmap: bool = True) -> CompactGraph:
+        # query-only loading: a mapped snapshot is shared through the page cache instead of copied per process
+        if os.path.exists(FILENAME) and is_snapshot(FILENAME):
+            return open_snapshot(FILENAME) if use_mmap else read_snapshot(FILENAME)
+        graph: Graph = Graph()
+        graph.load()
+        return graph.to_compact()
 
 if __name__ == "__main__":
     graph: Graph = Graph()
@@ -258,7 +1236,7 @@ if __name__ == "__main__":
     # else:
     #     print('Target node not found')
     # graph.remove_node("b")
-    graph.display_graph()
+    print(graph.display_graph())
     print("-----------------------------------------")
     graph.remove_edge("a","b")
-    graph.display_graph()
\ No newline at end of file
+    print(graph.display_graph())
\ No newline at end of file
@@ -0,0 +1,87 @@
+import threading
+from bisect import bisect_left
+from collections.abc import Iterable
+
+# sorts after every character a name can continue with, so prefix + LAST_CHAR bounds a prefix scan
+LAST_CHAR = chr(0x10FFFF)
+
+
+class NameIndex:
+    """Node names for prefix and range scans without looking at every node.
+
+    Added names are appended and only sorted when the next lookup needs them in order, so building a
+    graph node by node stays linear.
+    """
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        self._names: list[str] = list(names)
+        self._sorted: bool = False
+        # the query server's searches can ask for the first sort from several threads at once
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @property
+    def names(self) -> list[str]:
+        if not self._sorted:
+            with self._lock:
+                if not self._sorted:
+                    self._names.sort()
+                    self._sorted = True
+        return self._names
+
+    def add(self, name: str) -> None:
+        self._names.append(name)
+        self._sorted = False
+
+    def add_many(self, names: Iterable[str]) -> None:
+        self._names.extend(names)
+        self._sorted = False
+
+    def remove(self, name: str) -> None:
+        names = self.names
+        position: int = bisect_left(names, name)
+        if position < len(names) and names[position] == name:
+            del names[position]
+
+    def remove_many(self, names: set[str]) -> None:
+        # one pass over the list, which stays in whatever order it was in
+        with self._lock:
+            self._names = [name for name in self._names if name not in names]
+
+    def prefix(self, prefix: str) -> list[str]:
+        names = self.names
+        return names[bisect_left(names, prefix):bisect_left(names, prefix + LAST_CHAR)]
+
+    def range(self, low: str, high: str) -> list[str]:
+        # names from low up to, but not including, high
+        names = self.names
+        return names[bisect_left(names, low):bisect_left(names, high)]
+
+
+class AttributeIndex:
+    """Nodes grouped by the value they hold on one attribute, for equality lookups."""
+
+    def __init__(self) -> None:
+        # value -> nodes holding it; inner dicts are insertion-ordered sets
+        self.nodes: dict[float | str, dict[str, None]] = {}
+
+    def lookup(self, value: float | str) -> list[str]:
+        return list(self.nodes.get(value, ()))
+
+    def add(self, node: str, value: float | str | None) -> None:
+        if value is not None:
+            self.nodes.setdefault(value, {})[node] = None
+
+    def discard(self, node: str, value: float | str | None) -> None:
+        bucket: dict[str, None] | None = self.nodes.get(value)
+        if bucket is not None:
+            bucket.pop(node, None)
+            if not bucket:
+                del self.nodes[value]
+
+    def move(self, node: str, old: float | str | None, new: float | str | None) -> None:
+        if old != new:
+            self.discard(node, old)
+            self.add(node, new)
@@ -0,0 +1,144 @@
+import os
+import struct
+from array import array
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from .snapshot import BYTE_ORDER, _padding
+
+if TYPE_CHECKING:
+    from .graph import Graph
+
+# Landmark distance tables for ALT (A*, landmarks, triangle inequality) queries, stored next to the graph file:
+#   header | name offsets (q) | UTF-8 name blob | landmark node ids (q) | one distance column (d) per landmark
+# The header records the graph state the tables were computed for: the graph file identity and how many
+# logged changes sit on top of it. Tables for any other state are stale and ignored.
+LANDMARK_SUFFIX = ".landmarks"
+LANDMARK_MAGIC = b"GOPSLMK\0"
+LANDMARK_HEADER = struct.Struct("<8sc3xIQQQQQ")
+UNREACHABLE = float("inf")
+
+GraphState = tuple[int, int, int, int]
+
+
+@dataclass(slots=True)
+class Landmarks:
+    """Exact distances from a few landmark nodes: columns[i][index[node]] is the cost from landmarks[i] to node."""
+    landmarks: list[str]
+    names: list[str]
+    index: dict[str, int]
+    columns: list[array]
+    # edges_version of the graph the tables match, and the on-disk state they were last written for
+    version: int = 0
+    saved_state: GraphState | None = None
+
+    def estimate(self, node: str, target: str) -> float:
+        return self.bound_to(target)(node, target)
+
+    def bound_to(self, target: str) -> Callable[[str, str], float]:
+        # for every landmark L, |d(L, target) - d(L, node)| never exceeds d(node, target) on an undirected graph
+        goal: int | None = self.index.get(target)
+        if goal is None:
+            return lambda node, target: 0
+        pairs: list[tuple[array, float]] = [(column, column[goal]) for column in self.columns if column[goal] != UNREACHABLE]
+        index = self.index
+
+        def estimate(node: str, target: str) -> float:
+            position: int | None = index.get(node)
+            if position is None:
+                return 0
+            best: float = 0
+            for column, to_target in pairs:
+                from_landmark = column[position]
+                if from_landmark != UNREACHABLE:
+                    bound = abs(to_target - from_landmark)
+                    if bound > best:
+                        best = bound
+            return best
+        return estimate
+
+
+def select_landmarks(graph: "Graph", count: int) -> Landmarks:
+    # farthest-point selection: each new landmark is the node farthest from every landmark picked so far,
+    # and nodes no landmark reaches yet come first so every component gets one
+    names: list[str] = list(graph.adj_list)
+    index: dict[str, int] = {name: i for i, name in enumerate(names)}
+    nearest = array("d", [UNREACHABLE]) * len(names)
+    landmarks: list[str] = []
+    columns: list[array] = []
+    if not names:
+        return Landmarks(landmarks, names, index, columns)
+
+    # start from the node farthest from an arbitrary one, which lands on the edge of the graph
+    seed: dict[str, int] = graph.shortest_paths(names[0]).distances
+    candidate: str = max(seed, key=seed.__getitem__)
+    while len(landmarks) < count:
+        column = array("d", [UNREACHABLE]) * len(names)
+        for node, distance in graph.shortest_paths(candidate).distances.items():
+            column[index[node]] = distance
+            if distance < nearest[index[node]]:
+                nearest[index[node]] = distance
+        landmarks.append(candidate)
+        columns.append(column)
+        farthest: int = max(range(len(names)), key=nearest.__getitem__)
+        if nearest[farthest] == 0:
+            break
+        candidate = names[farthest]
+    return Landmarks(landmarks, names, index, columns)
+
+
+def write_landmarks(path: str, landmarks: Landmarks, state: GraphState) -> None:
+    encoded: list[bytes] = [name.encode("utf-8") for name in landmarks.names]
+    name_offsets = array("q", [0])
+    for name in encoded:
+        name_offsets.append(name_offsets[-1] + len(name))
+    blob: bytes = b"".join(encoded)
+    landmark_ids = array("q", [landmarks.index[name] for name in landmarks.landmarks])
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(LANDMARK_HEADER.pack(LANDMARK_MAGIC, BYTE_ORDER, len(landmark_ids), len(encoded), *state))
+        f.write(name_offsets.tobytes())
+        f.write(blob + _padding(len(blob)))
+        f.write(landmark_ids.tobytes())
+        for column in landmarks.columns:
+            f.write(column.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def read_landmarks(path: str, state: GraphState | None) -> Landmarks | None:
+    # returns None when there is no table for this exact graph state; the tables are only a cache
+    if state is None or not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        data: bytes = f.read()
+    if len(data) < LANDMARK_HEADER.size:
+        return None
+    magic, byte_order, count, num_nodes, *written_for = LANDMARK_HEADER.unpack_from(data)
+    if magic != LANDMARK_MAGIC or byte_order != BYTE_ORDER or tuple(written_for) != state:
+        return None
+
+    position: int = LANDMARK_HEADER.size
+    if len(data) < position + (num_nodes + 1) * 8:
+        return None
+    name_offsets = array("q")
+    name_offsets.frombytes(data[position:position + (num_nodes + 1) * 8])
+    position += (num_nodes + 1) * 8
+    if len(data) != position + name_offsets[-1] + (-name_offsets[-1] % 8) + count * 8 * (num_nodes + 1):
+        return None
+    blob: bytes = data[position:position + name_offsets[-1]]
+    position += name_offsets[-1] + (-name_offsets[-1] % 8)
+    names: list[str] = [blob[name_offsets[i]:name_offsets[i + 1]].decode("utf-8") for i in range(num_nodes)]
+    landmark_ids = array("q")
+    landmark_ids.frombytes(data[position:position + count * 8])
+    position += count * 8
+    columns: list[array] = []
+    for _ in range(count):
+        column = array("d")
+        column.frombytes(data[position:position + num_nodes * 8])
+        position += num_nodes * 8
+        columns.append(column)
+    index: dict[str, int] = {name: i for i, name in enumerate(names)}
+    return Landmarks([names[i] for i in landmark_ids], names, index, columns, saved_state=state)
@@ -0,0 +1,131 @@
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+from .server import DEFAULT_HOST, DEFAULT_PORT, LINE_LIMIT
+
+# Load generator for the query server: a number of connections each send one request at a time
+# (a closed loop), and every round trip is timed.
+
+
+@dataclass(slots=True)
+class LoadReport:
+    requests: int
+    errors: int
+    elapsed: float
+    # round-trip seconds of every request, sorted
+    latencies: list[float] = field(default_factory=list, repr=False)
+
+    @property
+    def qps(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, percent: float) -> float:
+        # nearest rank
+        if not self.latencies:
+            return 0.0
+        rank: int = max(math.ceil(percent / 100 * len(self.latencies)), 1)
+        return self.latencies[rank - 1]
+
+    def summary(self) -> str:
+        return (f"{self.requests} requests ({self.errors} errors) in {self.elapsed:.2f}s: {self.qps:.0f} QPS, "
+                f"p50 {self.percentile(50) * 1000:.1f} ms, p99 {self.percentile(99) * 1000:.1f} ms")
+
+
+def mixed_workload(nodes: list[str], mutations: float = 0.0, seed: int | None = None) -> Callable[[int], dict[str, Any]]:
+    # searches between random nodes, split between ucs and bidirectional bfs, plus a share of edge updates
+    rng = random.Random(seed)
+
+    def request(number: int) -> dict[str, Any]:
+        start, target = rng.choice(nodes), rng.choice(nodes)
+        draw: float = rng.random()
+        if draw < mutations:
+            return {"id": number, "op": "add_edge", "start": start, "end": target, "cost": rng.randint(1, 9)}
+        if draw < mutations + (1 - mutations) / 2:
+            return {"id": number, "op": "ucs", "start": start, "target": target}
+        return {"id": number, "op": "bfs", "start": start, "target": target, "bidirectional": True}
+    return request
+
+
+async def _open(host: str, port: int, path: str | None) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    if path is not None:
+        return await asyncio.open_unix_connection(path, limit=LINE_LIMIT)
+    return await asyncio.open_connection(host, port, limit=LINE_LIMIT)
+
+
+async def call(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, request: dict[str, Any]) -> dict[str, Any]:
+    # one request and its answer, for connections with a single request in flight
+    writer.write(json.dumps(request).encode("utf-8") + b"\n")
+    await writer.drain()
+    line: bytes = await reader.readline()
+    if not line:
+        raise ConnectionError("Server closed the connection")
+    return json.loads(line)
+
+
+async def sample_nodes(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, path: str | None = None, limit: int = 1000) -> list[str]:
+    reader, writer = await _open(host, port, path)
+    try:
+        response = await call(reader, writer, {"id": 0, "op": "find", "prefix": "", "limit": limit})
+    finally:
+        writer.close()
+    if not response["ok"]:
+        raise RuntimeError(response["error"])
+    return response["result"]
+
+
+async def run_load(make_request: Callable[[int], dict[str, Any]], requests: int = 1000, connections: int = 8,
+                   host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, path: str | None = None) -> LoadReport:
+    latencies: list[float] = []
+    errors: int = 0
+    issued: int = 0
+
+    async def client() -> None:
+        nonlocal errors, issued
+        reader, writer = await _open(host, port, path)
+        try:
+            while issued < requests:
+                request = make_request(issued)
+                issued += 1
+                began: float = time.perf_counter()
+                response = await call(reader, writer, request)
+                latencies.append(time.perf_counter() - began)
+                if not response["ok"]:
+                    errors += 1
+        finally:
+            writer.close()
+
+    began: float = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(connections)))
+    elapsed: float = time.perf_counter() - began
+    latencies.sort()
+    return LoadReport(len(latencies), errors, elapsed, latencies)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure QPS and latency of a running query server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="connect to a Unix socket instead of TCP")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--mutations", type=float, default=0.0, help="share of requests that add edges (changes the served graph)")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    async def run() -> LoadReport:
+        nodes: list[str] = await sample_nodes(args.host, args.port, args.unix)
+        if not nodes:
+            raise SystemExit("The served graph has no nodes")
+        workload = mixed_workload(nodes, args.mutations, args.seed)
+        return await run_load(workload, args.requests, args.connections, args.host, args.port, args.unix)
+    print(asyncio.run(run()).summary())
+
+
+if __name__ == "__main__":
+    main()
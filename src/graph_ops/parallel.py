@@ -0,0 +1,93 @@
+import os
+from array import array
+from collections.abc import Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from multiprocessing.shared_memory import SharedMemory
+from .compact import CompactGraph
+from .snapshot import _padding, _typecode
+
+# Multi-source shortest paths over a process pool. The CSR columns are copied once into a shared memory
+# block that every worker maps, so tasks only carry lists of source ids:
+#   CSR offsets (q) | targets (i) | weights, each section 8-byte aligned
+
+# per-worker state, set up by _attach when the pool starts a process
+_memory: SharedMemory | None = None
+_graph: CompactGraph | None = None
+_goals: list[int] | None = None
+
+
+def _share(compact: CompactGraph) -> tuple[SharedMemory, tuple[int, int, str]]:
+    offsets = array("q", compact.offsets)
+    targets = array("i", compact.targets)
+    weights = array(_typecode(compact.weights), compact.weights)
+    sections: list[bytes] = [
+        offsets.tobytes(),
+        targets.tobytes() + _padding(len(targets) * targets.itemsize),
+        weights.tobytes() + _padding(len(weights) * weights.itemsize),
+    ]
+    memory = SharedMemory(create=True, size=max(sum(map(len, sections)), 1))
+    position: int = 0
+    for section in sections:
+        memory.buf[position:position + len(section)] = section
+        position += len(section)
+    return memory, (len(offsets) - 1, len(targets), weights.typecode)
+
+
+def _attach(name: str, layout: tuple[int, int, str], goals: list[int] | None) -> None:
+    global _memory, _graph, _goals
+    num_nodes, num_entries, typecode = layout
+    _memory = SharedMemory(name=name)
+    buffer = _memory.buf
+    position: int = 0
+    columns: list[memoryview] = []
+    for column_typecode, count in (("q", num_nodes + 1), ("i", num_entries), (typecode, num_entries)):
+        size: int = count * array(column_typecode).itemsize
+        columns.append(buffer[position:position + size].cast(column_typecode))
+        position += size + (-size % 8)
+    # workers only ever see node ids, names stay in the parent
+    _graph = CompactGraph([], {}, *columns)
+    _goals = goals
+
+
+def _chunks(items: Sequence[int], size: int) -> Iterator[list[int]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _run_chunk(sources: list[int]) -> list[tuple[int, array]]:
+    assert _graph is not None
+    return [(source, _graph.distances_from(source, _goals)) for source in sources]
+
+
+def multi_source_distances(compact: CompactGraph, sources: Sequence[int], goals: Sequence[int] | None = None,
+                           workers: int | None = None, chunk_size: int = 16) -> Iterator[tuple[int, array]]:
+    # yields (source id, costs) as each chunk of sources finishes, in completion order; costs follow goals,
+    # or every node id when goals is None, with inf for unreachable nodes
+    if workers is None:
+        workers = os.cpu_count() or 1
+    goal_list: list[int] | None = list(goals) if goals is not None else None
+    if workers <= 1 or len(sources) <= chunk_size:
+        for source in sources:
+            yield source, compact.distances_from(source, goal_list)
+        return
+
+    memory, layout = _share(compact)
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(memory.name, layout, goal_list))
+    try:
+        chunks: Iterator[list[int]] = _chunks(sources, chunk_size)
+        # keep a couple of chunks per worker in flight so finished rows are handed back instead of piling up
+        pending: set[Future] = {pool.submit(_run_chunk, chunk) for chunk in islice(chunks, 2 * workers)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+                next_chunk: list[int] | None = next(chunks, None)
+                if next_chunk is not None:
+                    pending.add(pool.submit(_run_chunk, next_chunk))
+    finally:
+        # a consumer that stops early shouldn't wait for chunks nobody will read
+        pool.shutdown(cancel_futures=True)
+        memory.close()
+        memory.unlink()
@@ -0,0 +1,32 @@
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class ShortestPathTree:
+    """Result of one single-source search: exact costs from source and the tree edge each node was reached by."""
+    source: str
+    distances: dict[str, int | float]
+    parent: dict[str, str]
+
+    def __contains__(self, node: str) -> bool:
+        return node in self.distances
+
+    def __len__(self) -> int:
+        return len(self.distances)
+
+    def __iter__(self) -> Iterator[str]:
+        # nodes in the order they were settled, i.e. by increasing cost
+        return iter(self.distances)
+
+    def distance(self, node: str) -> int | float | None:
+        return self.distances.get(node)
+
+    def path_to(self, node: str) -> list[str] | None:
+        if node not in self.distances:
+            return None
+        path: list[str] = [node]
+        while path[-1] != self.source:
+            path.append(self.parent[path[-1]])
+        path.reverse()
+        return path
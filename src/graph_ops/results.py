@@ -0,0 +1,25 @@
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True)
+class SearchResult:
+    """Outcome of one search; the shell turns it into text.
+
+    path is None when the target wasn't reached. One-sided bfs and dfs report the order nodes were
+    explored in, every other search the path found. cost is only set by the weighted searches.
+    """
+    algorithm: str
+    start: str
+    target: str
+    path: list[str] | None = None
+    cost: int | float | None = None
+    # set instead of a path when the search couldn't run, e.g. a missing start node
+    error: str | None = None
+    explored: int = field(default=0, compare=False)
+    elapsed: float = field(default=0.0, compare=False)
+    # fringe/explored snapshots, only collected when asked for
+    trace: list[list[str]] | None = field(default=None, compare=False, repr=False)
+
+    @property
+    def found(self) -> bool:
+        return self.path is not None
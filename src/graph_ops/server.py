@@ -0,0 +1,284 @@
+import argparse
+import asyncio
+import json
+import math
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, suppress
+from functools import partial
+from typing import Any
+from .graph import Graph
+from .results import SearchResult
+
+# JSON-lines query server holding one Graph: every request is one JSON object per line, answered by one
+# line carrying the same id. Requests on a connection run concurrently, so answers may come back out of order.
+#   {"id": 1, "op": "ucs", "start": "A", "target": "B", "bidirectional": true}
+#   {"id": 1, "ok": true, "result": {"algorithm": "ucs", "path": ["A", "C", "B"], "cost": 3, ...}}
+#   {"id": 2, "ok": false, "error": "Missing field target"}
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8470
+# longest request line accepted, in bytes
+LINE_LIMIT = 1 << 20
+
+# search op -> options it takes besides start and target
+SEARCHES: dict[str, tuple[str, ...]] = {
+    "bfs": ("bidirectional", "where"),
+    "dfs": (),
+    "ucs": ("bidirectional", "weight", "where"),
+    "astar": ("heuristic", "weight"),
+}
+MUTATIONS = ("add_node", "remove_node", "add_edge", "remove_edge", "set_attribute", "save")
+
+
+class RequestError(Exception):
+    pass
+
+
+class ReadWriteLock:
+    """Any number of readers or a single writer. A waiting writer holds off new readers, so mutations aren't starved."""
+
+    def __init__(self) -> None:
+        self._condition = asyncio.Condition()
+        self._readers: int = 0
+        self._writing: bool = False
+        self._waiting_writers: int = 0
+
+    @asynccontextmanager
+    async def read(self) -> AsyncIterator[None]:
+        async with self._condition:
+            await self._condition.wait_for(lambda: not self._writing and not self._waiting_writers)
+            self._readers += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._readers -= 1
+                self._condition.notify_all()
+
+    @asynccontextmanager
+    async def write(self) -> AsyncIterator[None]:
+        async with self._condition:
+            self._waiting_writers += 1
+            try:
+                await self._condition.wait_for(lambda: not self._writing and not self._readers)
+            finally:
+                self._waiting_writers -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+def result_payload(result: SearchResult) -> dict[str, Any]:
+    return {
+        "algorithm": result.algorithm,
+        "start": result.start,
+        "target": result.target,
+        "found": result.found,
+        "path": result.path,
+        "cost": result.cost,
+        "error": result.error,
+        "explored": result.explored,
+        "elapsed": result.elapsed,
+    }
+
+
+def _field(request: dict[str, Any], name: str) -> Any:
+    if name not in request:
+        raise RequestError(f"Missing field {name}")
+    return request[name]
+
+
+def _where(value: Any) -> tuple[str, str, Any]:
+    # JSON has no tuples; the filter doubles as part of the cache key, so it has to be hashable
+    if not isinstance(value, list) or len(value) != 3:
+        raise RequestError("where must be [attribute, comparison, value]")
+    return tuple(value)
+
+
+class GraphServer:
+    """Serves searches and mutations of one in-memory graph to any number of local clients.
+
+    Searches run in a thread pool under a shared lock, so the event loop keeps answering while they work.
+    Mutations run in the pool as well, holding the lock exclusively once the searches in flight are done.
+    """
+
+    def __init__(self, graph: Graph, workers: int | None = None) -> None:
+        self.graph: Graph = graph
+        self.lock: ReadWriteLock = ReadWriteLock()
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(workers, thread_name_prefix="graph-search")
+        self.server: asyncio.Server | None = None
+        self.requests: int = 0
+        # open client connections and the tasks serving them, ended by close()
+        self._connections: dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, path: str | None = None) -> None:
+        # path serves on a Unix socket instead of TCP
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self._connection, path, limit=LINE_LIMIT)
+        else:
+            self.server = await asyncio.start_server(self._connection, host, port, limit=LINE_LIMIT)
+
+    @property
+    def address(self) -> Any:
+        assert self.server is not None
+        return self.server.sockets[0].getsockname()
+
+    async def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        # closing the sockets ends each connection's read loop, which then finishes its requests in flight
+        for writer in self._connections.values():
+            writer.close()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        self.executor.shutdown(wait=True)
+
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        pending: set[asyncio.Task] = set()
+        connection = asyncio.current_task()
+        self._connections[connection] = writer
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self._respond(line, writer))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            await asyncio.gather(*pending)
+        except (ConnectionError, ValueError):
+            # the client went away, or sent a line longer than LINE_LIMIT
+            for task in pending:
+                task.cancel()
+        finally:
+            del self._connections[connection]
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter) -> None:
+        response: dict[str, Any] = await self.handle(line)
+        writer.write(json.dumps(response).encode("utf-8") + b"\n")
+        with suppress(ConnectionError):
+            await writer.drain()
+
+    async def handle(self, line: bytes | str) -> dict[str, Any]:
+        self.requests += 1
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return {"id": None, "ok": False, "error": "Invalid JSON"}
+        if not isinstance(request, dict):
+            return {"id": None, "ok": False, "error": "Request must be a JSON object"}
+        request_id = request.get("id")
+        try:
+            result = await self.dispatch(request)
+        except (RequestError, ValueError, TypeError) as error:
+            return {"id": request_id, "ok": False, "error": str(error)}
+        return {"id": request_id, "ok": True, "result": result}
+
+    async def dispatch(self, request: dict[str, Any]) -> Any:
+        op = _field(request, "op")
+        if op in SEARCHES:
+            return await self.search(op, request)
+        if op == "stats":
+            return {
+                "nodes": self.graph.num_nodes,
+                "version": self.graph.version,
+                "directed": self.graph.directed,
+                "requests": self.requests,
+                "cache": self.graph.cache.stats(),
+            }
+        if op == "ping":
+            return "pong"
+        if op == "find":
+            return await self.find(request)
+        if op in MUTATIONS:
+            # saving may compact the log into a new snapshot, far too slow to run on the event loop
+            run = partial(self.mutate, op, request)
+            async with self.lock.write():
+                return await asyncio.get_running_loop().run_in_executor(self.executor, run)
+        raise RequestError(f"Unknown operation {op}")
+
+    async def search(self, op: str, request: dict[str, Any]) -> dict[str, Any]:
+        start, target = str(_field(request, "start")), str(_field(request, "target"))
+        options: dict[str, Any] = {name: request[name] for name in SEARCHES[op] if request.get(name) is not None}
+        if "where" in options:
+            options["where"] = _where(options["where"])
+        run = partial(getattr(self.graph, op), start, target, **options)
+        async with self.lock.read():
+            result: SearchResult = await asyncio.get_running_loop().run_in_executor(self.executor, run)
+        return result_payload(result)
+
+    async def find(self, request: dict[str, Any]) -> list[str]:
+        # one of prefix, [low, high] range or where, like the shell's find; limit caps the answer
+        if "prefix" in request:
+            run = partial(self.graph.nodes_with_prefix, str(request["prefix"]))
+        elif "range" in request:
+            low, high = request["range"]
+            run = partial(self.graph.nodes_in_range, str(low), str(high))
+        else:
+            run = partial(self.graph.select_nodes, _where(_field(request, "where")))
+        async with self.lock.read():
+            nodes: list[str] = await asyncio.get_running_loop().run_in_executor(self.executor, run)
+        limit = request.get("limit")
+        return nodes if limit is None else nodes[:limit]
+
+    def mutate(self, op: str, request: dict[str, Any]) -> str:
+        graph: Graph = self.graph
+        if op == "add_node":
+            return graph.add_node(str(_field(request, "node")))
+        if op == "remove_node":
+            return graph.remove_node(str(_field(request, "node")))
+        if op == "add_edge":
+            cost = request.get("cost", 0)
+            if isinstance(cost, bool) or not isinstance(cost, (int, float)):
+                raise RequestError("cost must be a number")
+            # JSON has no infinity or NaN, Python's parser reads 1e400 as one all the same
+            if isinstance(cost, float) and not math.isfinite(cost):
+                raise RequestError("cost must be finite")
+            return graph.add_edge(str(_field(request, "start")), str(_field(request, "end")), cost)
+        if op == "remove_edge":
+            return graph.remove_edge(str(_field(request, "start")), str(_field(request, "end")))
+        if op == "set_attribute":
+            value = request.get("value")
+            if isinstance(value, float) and not math.isfinite(value):
+                raise RequestError("value must be finite")
+            return graph.set_attribute(str(_field(request, "node")), str(_field(request, "name")), value)
+        graph.save()
+        return "Graph saved."
+
+
+async def serve(graph: Graph, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, path: str | None = None, workers: int | None = None) -> None:
+    server = GraphServer(graph, workers)
+    await server.start(host, port, path)
+    print(f"Serving {graph.num_nodes} nodes on {path or f'{host}:{port}'}")
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve the saved graph to local clients over a JSON-lines socket")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, help="search threads (default: the thread pool's own default)")
+    args = parser.parse_args(argv)
+    graph: Graph = Graph()
+    graph.load()
+    graph.enable_wal()
+    try:
+        asyncio.run(serve(graph, args.host, args.port, args.unix, args.workers))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        graph.save()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,35 @@
 import cmd
-from .graph import Graph
+import re
+from collections.abc import Iterator
+from .graph import PAGE_SIZE, Graph, _parse_cost
+from .results import SearchResult
+
+# headings for the fringe/explored tables each search records when trace is on
+TRACE_TITLES = {"bfs": "BFS", "bidirectional_bfs": "BFS", "ucs": "UCS", "bidirectional_ucs": "UCS", "astar": "A*"}
+TRACE_HEADERS = {
+    "bfs": ["Fringe", "Explored"],
+    "bidirectional_bfs": ["Forward fringe", "Backward fringe"],
+    "dfs": ["Fringe", "Explored"],
+    "ucs": ["Priority Queue", "Explored"],
+    "bidirectional_ucs": ["Forward queue", "Backward queue"],
+    "astar": ["Priority Queue", "Explored"],
+}
+
+# attribute queries of find, e.g. region=eu or capacity>=10
+ATTRIBUTE_QUERY = re.compile(r"(\w+)(==|!=|<=|>=|=|<|>)(.+)")
+
+
+def format_result(result: SearchResult) -> str:
+    if result.error is not None:
+        return result.error
+    if result.path is None:
+        if result.algorithm in ("bfs", "bidirectional_bfs"):
+            return f"{result.target} can't be reached"
+        return f"{result.target} is unreachable"
+    if result.cost is None:
+        return " -> ".join(result.path)
+    return f"Path: {' -> '.join(result.path)}, Total cost: {result.cost}"
+
 
 class GraphShell(cmd.Cmd):
     intro = "Welcome to the Graph shell. Type help or ? to list commands."
@@ -9,6 +39,12 @@ class GraphShell(cmd.Cmd):
         super().__init__()
         self.graph = Graph()
         self.graph.load()
+        self.graph.enable_wal()
+        self.trace: bool = True
+        # pages of the display listing still to show
+        self._pages: Iterator[str] | None = None
+        self._pages_version: int = 0
+        self._next_page: str | None = None
 
     def do_add_node(self, arg: str) -> None:
         'Add a node: add_node NODE'
@@ -26,6 +62,14 @@ class GraphShell(cmd.Cmd):
         else:
             print("Usage: remove_node NODE")
 
+    def do_remove_nodes(self, arg: str) -> None:
+        'Remove several nodes at once: remove_nodes NODE [NODE ...]'
+        nodes = arg.split()
+        if nodes:
+            print(self.graph.remove_nodes(nodes))
+        else:
+            print("Usage: remove_nodes NODE [NODE ...]")
+
     def do_add_edge(self, arg: str) -> None:
         'Add an edge with optional cost: add_edge NODE1 NODE2 [COST] (default cost: 0)'
         parts = arg.split()
@@ -35,13 +79,44 @@ class GraphShell(cmd.Cmd):
         elif len(parts) == 3:
             node1, node2, cost_str = parts
             try:
-                cost = int(cost_str)
+                cost = _parse_cost(cost_str)
                 print(self.graph.add_edge(node1, node2, cost))
             except ValueError:
-                print("Cost must be an integer")
+                print("Cost must be a number")
         else:
             print("Usage: add_edge NODE1 NODE2 [COST] (default cost: 0)")
 
+    def do_set_weight(self, arg: str) -> None:
+        'Set named weights of an existing edge, searchable with ucs ... weight=NAME: set_weight NODE1 NODE2 NAME=VALUE [NAME=VALUE ...]'
+        parts = arg.split()
+        try:
+            if len(parts) < 3:
+                raise ValueError
+            weights: dict[str, float] = {}
+            for pair in parts[2:]:
+                name, value = pair.split("=")
+                if not name:
+                    raise ValueError
+                weights[name] = float(value)
+        except ValueError:
+            print("Usage: set_weight NODE1 NODE2 NAME=VALUE [NAME=VALUE ...]")
+            return
+        print(self.graph.set_edge_weights(parts[0], parts[1], weights))
+
+    def do_import_edges(self, arg: str) -> None:
+        'Bulk-load a CSV/TSV edge list of start,end[,cost] rows, creating missing nodes: import_edges PATH'
+        path = arg.strip()
+        if not path:
+            print("Usage: import_edges PATH")
+            return
+        try:
+            stats = self.graph.add_edges_from_file(path)
+        except (OSError, ValueError) as error:
+            print(f"Import failed: {error}")
+            return
+        print(f"Imported {stats['edges_added']} new edges, updated {stats['edges_updated']}, "
+              f"created {stats['nodes_created']} nodes, skipped {stats['skipped']} self-loops")
+
     def do_remove_edge(self, arg: str) -> None:
         'Remove an edge: remove_edge NODE1 NODE2'
         try:
@@ -51,20 +126,47 @@ class GraphShell(cmd.Cmd):
             print("Usage: remove_edge NODE1 NODE2")
 
     def do_display(self, arg: str | None = None) -> None:
-        'Display the graph or a node. Usage: display | display node_name'
+        'Display the graph, a node, or the part of the graph within some hops of a node: display | display NODE | display NODE HOPS'
         if arg is None:
             arg = ""
-        if len(arg.split()) == 0:
-            result: str | None = self.graph.display_graph()
-            if result is not None:
-                print(result)
+        parts = arg.split()
+        if len(parts) == 0:
+            self._page(self.graph.display_pages())
+        elif len(parts) == 1:
+            print(self.graph.display_node(parts[0]))
+        elif len(parts) == 2 and parts[1].isdigit():
+            self._page(self.graph.display_pages(parts[0], int(parts[1])))
         else:
-            node = arg.split()
-            print(self.graph.display_node(node[0]))
+            print("Usage: display | display NODE | display NODE HOPS")
+
+    def _page(self, pages: Iterator[str]) -> None:
+        self._pages = pages
+        self._pages_version = self.graph.version
+        self._next_page = next(pages, None)
+        self.do_more("")
+
+    def do_more(self, arg: str) -> None:
+        'Show the next page of a display listing too long to draw'
+        if self._pages is None or self._next_page is None:
+            print("Nothing more to display")
+            return
+        # the listing reads the adjacency lists lazily, so it can't carry on past a change
+        if self.graph.version != self._pages_version:
+            self._pages = self._next_page = None
+            print("The graph changed, run display again")
+            return
+        print(self._next_page)
+        self._next_page = next(self._pages, None)
+        if self._next_page is not None:
+            print("-- more: type more to continue --")
 
     def do_save(self, arg: str) -> None:
-        'Save the current graph to disk'
-        self.graph.save()
+        'Save the current graph to disk (flushes the change log, rewriting the graph file only when the log has grown large): save [json] (json keeps integer costs past 64 bits)'
+        try:
+            self.graph.save(arg.strip() or "snapshot")
+        except ValueError as error:
+            print(error)
+            return
         print("Graph saved.")
 
     def do_load(self, arg: str) -> None:
@@ -72,31 +174,237 @@ class GraphShell(cmd.Cmd):
         self.graph.load()
         print("Graph loaded.")
     def do_bfs(self,arg: str) -> None:
-        'Search for target node in Breadth first fashion: bfs start target'
+        'Search for target node in Breadth first fashion: bfs start target [bidirectional] (bidirectional prints a shortest path)'
         try:
-            start,target = arg.split()
-            print(self.graph.bfs(start,target))
+            start,target,bidirectional = self._search_args(arg)
+            self._show(self.graph.bfs(start,target,self.trace,bidirectional))
         except ValueError:
-            print("Usage: bfs start target")
+            print("Usage: bfs start target [bidirectional]")
     def do_dfs(self,arg: str) -> None:
         'Search for a target node in Depth first manner: dfs start target'
         try:
             start,target = arg.split()
-            print(self.graph.dfs(start,target))
+            self._show(self.graph.dfs(start,target,self.trace))
         except ValueError:
             print("Usage: dfs start target")
     
     def do_ucs(self, arg: str) -> None:
-        'Search for target node using Uniform Cost Search: ucs start target'
+        'Search for target node using Uniform Cost Search, optionally minimising a named weight: ucs start target [bidirectional] [weight=NAME]'
+        parts = arg.split()
+        weight = None
+        if parts and parts[-1].startswith("weight="):
+            weight = parts.pop()[len("weight="):]
+        try:
+            start, target, bidirectional = self._search_args(" ".join(parts))
+            self._show(self.graph.ucs(start, target, self.trace, bidirectional, weight or None))
+        except ValueError:
+            print("Usage: ucs start target [bidirectional] [weight=NAME]")
+
+    def do_astar(self, arg: str) -> None:
+        'Search for target node using A*: astar start target [manhattan|euclidean|landmarks] [check] (check reports inadmissible estimates)'
+        parts = arg.split()
+        check = bool(parts) and parts[-1] == "check"
+        if check:
+            parts.pop()
+        if len(parts) not in (2, 3):
+            print("Usage: astar start target [manhattan|euclidean|landmarks] [check]")
+            return
+        heuristic = parts[2] if len(parts) == 3 else "manhattan"
+        result = self.graph.astar(parts[0], parts[1], heuristic, self.trace)
+        self._show(result)
+        if check and result.error is None:
+            for node, estimate, actual in self.graph.heuristic_violations(parts[1], heuristic):
+                print(f"Inadmissible heuristic at {node}: estimate {estimate:g} > actual {actual}")
+
+    def do_distances(self, arg: str) -> None:
+        'List the cheapest cost and path from a node to every node it reaches: distances start [max_cost]'
+        parts = arg.split()
         try:
-            start, target = arg.split()
-            print(self.graph.ucs(start, target))
+            if len(parts) not in (1, 2):
+                raise ValueError
+            cutoff = float(parts[1]) if len(parts) == 2 else None
         except ValueError:
-            print("Usage: ucs start target")
+            print("Usage: distances start [max_cost]")
+            return
+        try:
+            tree = self.graph.shortest_paths(parts[0], cutoff)
+        except ValueError as error:
+            print(error)
+            return
+        for node in tree:
+            print(f"{node}: {tree.distance(node)} ({' -> '.join(tree.path_to(node))})")
+
+    def do_components(self, arg: str) -> None:
+        'List the connected components, largest first, showing up to 10 members each: components'
+        components = self.graph.components()
+        print(f"{len(components)} components")
+        for component in components:
+            members = ", ".join(component[:10])
+            more = f", ... ({len(component) - 10} more)" if len(component) > 10 else ""
+            print(f"  {len(component)} nodes: {members}{more}")
+
+    def do_connected(self, arg: str) -> None:
+        'Check whether two nodes are in the same component, ignoring edge direction: connected NODE1 NODE2'
+        parts = arg.split()
+        if len(parts) != 2:
+            print("Usage: connected NODE1 NODE2")
+            return
+        try:
+            connected = self.graph.connected(parts[0], parts[1])
+        except ValueError as error:
+            print(error)
+            return
+        print(f"{parts[0]} and {parts[1]} are {'connected' if connected else 'not connected'}")
+
+    def do_landmarks(self, arg: str) -> None:
+        'Pick landmark nodes and precompute their distances so ucs and astar can use them as bounds: landmarks [count]'
+        try:
+            count = int(arg) if arg.strip() else 8
+        except ValueError:
+            print("Usage: landmarks [count]")
+            return
+        print(self.graph.build_landmarks(count))
+
+    def do_position(self, arg: str) -> None:
+        'Set the coordinates A* heuristics use for a node, kept as its x and y attributes: position NODE X Y'
+        try:
+            node, x, y = arg.rsplit(maxsplit=2)
+            print(self.graph.set_position(node, float(x), float(y)))
+        except ValueError:
+            print("Usage: position NODE X Y")
+
+    def do_set_attr(self, arg: str) -> None:
+        'Set node attributes, numbers or labels (an empty value clears one): set_attr NODE NAME=VALUE [NAME=VALUE ...]'
+        parts = arg.split()
+        pairs = [part.partition("=") for part in parts[1:]]
+        if not pairs or any(not name or not equals for name, equals, _ in pairs):
+            print("Usage: set_attr NODE NAME=VALUE [NAME=VALUE ...]")
+            return
+        for name, _, text in pairs:
+            try:
+                value = _parse_cost(text) if text else None
+            except ValueError:
+                value = text
+            print(self.graph.set_attribute(parts[0], name, value))
+
+    def do_index(self, arg: str) -> None:
+        'Index node names for find PREFIX* and LOW..HIGH, or an attribute for find NAME=VALUE; lists the indexes without arguments: index [names|ATTRIBUTE]'
+        target = arg.strip()
+        if target == "names":
+            print(self.graph.index_names())
+        elif target:
+            print(self.graph.index_attribute(target))
+        else:
+            indexed = (["names"] if self.graph.name_index is not None else []) + list(self.graph.attributes.indexes)
+            print(f"Indexes: {', '.join(indexed)}" if indexed else "No indexes")
+
+    def do_find(self, arg: str) -> None:
+        'Find nodes by name prefix, name range or attribute: find PREFIX* | find LOW..HIGH | find ATTRIBUTE=VALUE (or != < <= > >=)'
+        query = arg.strip()
+        match = ATTRIBUTE_QUERY.fullmatch(query)
+        try:
+            if query.endswith("*"):
+                nodes = self.graph.nodes_with_prefix(query[:-1])
+            elif ".." in query:
+                low, _, high = query.partition("..")
+                nodes = self.graph.nodes_in_range(low, high)
+            elif match is not None:
+                name, comparison, text = match.groups()
+                try:
+                    value = _parse_cost(text)
+                except ValueError:
+                    value = text
+                nodes = self.graph.select_nodes((name, "==" if comparison == "=" else comparison, value))
+            else:
+                print("Usage: find PREFIX* | find LOW..HIGH | find ATTRIBUTE=VALUE")
+                return
+        except ValueError as error:
+            print(error)
+            return
+        if not nodes:
+            print("No nodes found")
+            return
+        pages = ["\n".join(nodes[start:start + PAGE_SIZE]) for start in range(0, len(nodes), PAGE_SIZE)]
+        pages[0] = f"{len(nodes)} nodes\n{pages[0]}"
+        self._page(iter(pages))
+
+    def do_attrs(self, arg: str) -> None:
+        'Show the attributes of a node: attrs NODE'
+        node = arg.strip()
+        if node not in self.graph.adj_list:
+            print(f"{node} doesn't exist" if node else "Usage: attrs NODE")
+            return
+        values = [(name, self.graph.attribute(node, name)) for name in self.graph.attributes.names()]
+        values = [(name, value) for name, value in values if value is not None]
+        if not values:
+            print(f"{node} has no attributes")
+        for name, value in values:
+            print(f"  {name} = {value:g}" if isinstance(value, float) else f"  {name} = {value}")
+
+    def _show(self, result: SearchResult) -> None:
+        if result.trace is not None:
+            # only traced searches need tabulate, so starting the shell doesn't import it
+            from tabulate import tabulate
+            if result.algorithm in TRACE_TITLES:
+                print(f"{TRACE_TITLES[result.algorithm]} for target {result.target}")
+            print(tabulate(result.trace, headers=TRACE_HEADERS[result.algorithm], tablefmt="fancy_grid"))
+        print(format_result(result))
+
+    def _search_args(self, arg: str) -> tuple[str, str, bool]:
+        parts = arg.split()
+        if len(parts) == 3 and parts[2] == "bidirectional":
+            return parts[0], parts[1], True
+        start, target = parts
+        return start, target, False
             
+    def do_trace(self, arg: str) -> None:
+        'Show or hide the fringe/explored trace printed by searches: trace [on|off]'
+        mode = arg.strip().lower()
+        if mode == "on":
+            self.trace = True
+        elif mode == "off":
+            self.trace = False
+        elif mode:
+            print("Usage: trace [on|off]")
+            return
+        print(f"Search trace is {'on' if self.trace else 'off'}")
+
+    def do_cache_stats(self, arg: str) -> None:
+        'Show hit/miss counts of the search result cache (searches with trace off are cached): cache_stats [clear]'
+        cache = self.graph.cache
+        if arg.strip() == "clear":
+            cache.clear()
+        elif arg.strip():
+            print("Usage: cache_stats [clear]")
+            return
+        stats = cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+        hit_rate = f"{100 * stats['hits'] / lookups:.1f}%" if lookups else "n/a"
+        print(f"{stats['hits']} hits, {stats['misses']} misses (hit rate {hit_rate}), "
+              f"{stats['invalidations']} invalidations, {stats['size']}/{stats['maxsize']} entries")
+
+    def do_cache_size(self, arg: str) -> None:
+        'Set how many search results are cached, 0 turns the cache off: cache_size N'
+        try:
+            size = int(arg)
+            if size < 0:
+                raise ValueError
+        except ValueError:
+            print("Usage: cache_size N")
+            return
+        self.graph.cache.resize(size)
+        print(f"Search cache holds up to {size} results")
+
     def do_exit(self, arg: str) -> bool:
         'Exit the shell'
-        self.graph.save()
+        try:
+            self.graph.save()
+        except ValueError as error:
+            # a graph the snapshot format can't hold is still saved, just not as a snapshot
+            print(error)
+            self.graph.save("json")
+            print("Graph saved as JSON.")
+            return True
         print("Graph saved.")
         return True
 
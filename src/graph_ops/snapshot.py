@@ -0,0 +1,195 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterator, Mapping, Sequence
+from .compact import CompactGraph
+
+# Binary graph snapshot, all sections 8-byte aligned:
+#   header | name offsets (q) | UTF-8 name blob | CSR offsets (q) | targets (i) | weights | name order (i) |
+#   channel count (Q) | per channel: name size (Q) | UTF-8 name | one value (d) per entry of targets
+# Version 2 added the name order section: node ids sorted by name, used to look names up in a mapped file.
+# Version 3 added the flags byte (bit 0: directed), so older readers can't mistake a directed graph for an undirected one.
+# Version 4 added the named weight channels.
+MAGIC = b"GOPSNAP\0"
+VERSION = 4
+SUPPORTED_VERSIONS = (1, 2, 3, 4)
+HEADER = struct.Struct("<8sIccBxQQQ")
+COUNT = struct.Struct("<Q")
+DIRECTED = 1
+BYTE_ORDER = b"<" if sys.byteorder == "little" else b">"
+INTEGER_TYPECODES = ("b", "h", "i", "q")
+
+
+def is_snapshot(path: str) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def _padding(size: int) -> bytes:
+    return b"\0" * (-size % 8)
+
+
+def _typecode(column: array | memoryview) -> str:
+    return column.typecode if isinstance(column, array) else column.format
+
+
+def _narrow_weights(weights: array) -> array:
+    # store integer costs in the smallest typecode that holds them
+    if weights.typecode == "d" or not weights:
+        return weights
+    low, high = min(weights), max(weights)
+    for typecode in INTEGER_TYPECODES:
+        bits = array(typecode).itemsize * 8
+        if -(1 << (bits - 1)) <= low and high < (1 << (bits - 1)):
+            return array(typecode, weights)
+    return weights
+
+
+def write_snapshot(path: str, compact: CompactGraph, channels: Mapping[str, array] | None = None) -> None:
+    # channels hold one value per entry of compact.targets, in the same order
+    encoded: list[bytes] = [name.encode("utf-8") for name in compact.names]
+    name_offsets = array("q", [0])
+    for name in encoded:
+        name_offsets.append(name_offsets[-1] + len(name))
+    blob: bytes = b"".join(encoded)
+    weights: array = _narrow_weights(array(_typecode(compact.weights), compact.weights))
+    targets = array("i", compact.targets)
+    offsets = array("q", compact.offsets)
+    name_order = array("i", sorted(range(len(encoded)), key=compact.names.__getitem__))
+
+    # write next to the destination and swap it in, so a crash never leaves a half-written snapshot
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        flags: int = DIRECTED if compact.directed else 0
+        f.write(HEADER.pack(MAGIC, VERSION, weights.typecode.encode(), BYTE_ORDER, flags, len(encoded), len(targets), len(blob)))
+        f.write(name_offsets.tobytes())
+        f.write(blob + _padding(len(blob)))
+        f.write(offsets.tobytes())
+        f.write(targets.tobytes() + _padding(len(targets) * targets.itemsize))
+        f.write(weights.tobytes() + _padding(len(weights) * weights.itemsize))
+        f.write(name_order.tobytes() + _padding(len(name_order) * name_order.itemsize))
+        channels = channels or {}
+        f.write(COUNT.pack(len(channels)))
+        for name, values in channels.items():
+            encoded_name: bytes = name.encode("utf-8")
+            f.write(COUNT.pack(len(encoded_name)) + encoded_name + _padding(len(encoded_name)))
+            f.write(array("d", values).tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def _sections(path: str, data: memoryview) -> tuple[bool, bool, dict[str, tuple[str, memoryview]], dict[str, memoryview]]:
+    magic, version, typecode, byte_order, flags, num_nodes, num_entries, names_size = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a graph snapshot")
+    if version not in SUPPORTED_VERSIONS:
+        raise ValueError(f"Unsupported graph snapshot version {version}")
+    layout: list[tuple[str, str, int]] = [
+        ("name_offsets", "q", num_nodes + 1),
+        ("names", "B", names_size),
+        ("offsets", "q", num_nodes + 1),
+        ("targets", "i", num_entries),
+        ("weights", typecode.decode(), num_entries),
+    ]
+    if version >= 2:
+        layout.append(("name_order", "i", num_nodes))
+    sections: dict[str, tuple[str, memoryview]] = {}
+    position: int = HEADER.size
+    for section, section_typecode, count in layout:
+        size = count * array(section_typecode).itemsize
+        sections[section] = (section_typecode, data[position:position + size])
+        position += size + (-size % 8)
+    channels: dict[str, memoryview] = {}
+    if version >= 4:
+        (count,) = COUNT.unpack_from(data, position)
+        position += COUNT.size
+        for _ in range(count):
+            (name_size,) = COUNT.unpack_from(data, position)
+            position += COUNT.size
+            name: str = str(data[position:position + name_size], "utf-8")
+            position += name_size + (-name_size % 8)
+            channels[name] = data[position:position + num_entries * 8]
+            position += num_entries * 8
+    # the flags byte was padding before version 3
+    directed: bool = version >= 3 and bool(flags & DIRECTED)
+    return byte_order != BYTE_ORDER, directed, sections, channels
+
+
+def read_snapshot(path: str) -> CompactGraph:
+    with open(path, "rb") as f:
+        data = memoryview(f.read())
+    swap, directed, sections, raw_channels = _sections(path, data)
+    columns: dict[str, array] = {}
+    for section, (typecode, raw) in sections.items():
+        columns[section] = array(typecode)
+        columns[section].frombytes(raw)
+        if swap:
+            columns[section].byteswap()
+
+    name_offsets, blob = columns["name_offsets"], columns["names"].tobytes()
+    names: list[str] = [blob[name_offsets[i]:name_offsets[i + 1]].decode("utf-8") for i in range(len(name_offsets) - 1)]
+    index: dict[str, int] = {name: i for i, name in enumerate(names)}
+    channels: dict[str, array] = {}
+    for name, raw in raw_channels.items():
+        channels[name] = array("d")
+        channels[name].frombytes(raw)
+        if swap:
+            channels[name].byteswap()
+    return CompactGraph(names, index, columns["offsets"], columns["targets"], columns["weights"], directed, channels)
+
+
+class _NameTable(Sequence[str]):
+    # node names decoded from the mapped string table on access
+    __slots__ = ("_offsets", "_blob")
+
+    def __init__(self, offsets: memoryview, blob: memoryview) -> None:
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, node: int) -> str:
+        if not -len(self) <= node < len(self):
+            raise IndexError(node)
+        node %= len(self)
+        return str(self._blob[self._offsets[node]:self._offsets[node + 1]], "utf-8")
+
+
+class _NameIndex(Mapping[str, int]):
+    # name -> id lookups by binary search over the ids sorted by name
+    __slots__ = ("_names", "_order")
+
+    def __init__(self, names: _NameTable, order: memoryview) -> None:
+        self._names = names
+        self._order = order
+
+    def __getitem__(self, name: str) -> int:
+        position: int = bisect_left(self._order, name, key=self._names.__getitem__)
+        if position < len(self._order) and self._names[self._order[position]] == name:
+            return self._order[position]
+        raise KeyError(name)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+
+def open_snapshot(path: str) -> CompactGraph:
+    # map the file read-only and view the arrays in place; the mapping stays open as long as the views do
+    with open(path, "rb") as f:
+        data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    swap, directed, sections, raw_channels = _sections(path, data)
+    if swap or "name_order" not in sections:
+        # foreign byte order or a version 1 file: fall back to copying the arrays
+        return read_snapshot(path)
+    views: dict[str, memoryview] = {section: raw.cast(typecode) for section, (typecode, raw) in sections.items()}
+    names = _NameTable(views["name_offsets"], views["names"])
+    channels: dict[str, memoryview] = {name: raw.cast("d") for name, raw in raw_channels.items()}
+    return CompactGraph(names, _NameIndex(names, views["name_order"]), views["offsets"], views["targets"], views["weights"], directed, channels)
@@ -0,0 +1,199 @@
+import os
+import struct
+import zlib
+from collections.abc import Iterator
+from typing import BinaryIO
+
+# Append-only mutation log kept next to the graph file.
+# The header names the base file the records apply to (inode, size, mtime); a log whose base
+# has since been replaced by a newer snapshot is stale and ignored. Each record is
+# length | crc32 | payload, so a record torn by a crash is detected and dropped on replay.
+# The header's flags byte (bit 0: directed) came with the second magic; first-format logs don't say
+# what kind of graph they hold and are rewritten with the new header when logging continues on them.
+WAL_SUFFIX = ".wal"
+WAL_MAGIC = b"GOPSWAL\1"
+WAL_HEADER = struct.Struct("<8sQQQB7x")
+LEGACY_WAL_MAGIC = b"GOPSWAL\0"
+LEGACY_WAL_HEADER = struct.Struct("<8sQQQ")
+DIRECTED = 1
+RECORD_HEADER = struct.Struct("<II")
+
+ADD_NODE = 1
+REMOVE_NODE = 2
+ADD_EDGE = 3
+REMOVE_EDGE = 4
+# start, end, {channel: value} of an existing edge
+SET_WEIGHTS = 5
+
+Cost = int | float
+Record = tuple[int, tuple[str | Cost | dict[str, Cost], ...]]
+
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+
+def base_identity(path: str) -> tuple[int, int, int]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return (0, 0, 0)
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def _encode(value: str | Cost | dict[str, Cost], out: bytearray) -> None:
+    if isinstance(value, str):
+        encoded = value.encode("utf-8")
+        out += b"s" + _U32.pack(len(encoded)) + encoded
+    elif isinstance(value, dict):
+        out += b"m" + _U32.pack(len(value))
+        for key, item in value.items():
+            _encode(key, out)
+            _encode(item, out)
+    elif isinstance(value, int) and -(1 << 63) <= value < (1 << 63):
+        out += b"i" + _I64.pack(value)
+    elif isinstance(value, int):
+        # integers past 64 bits are kept exactly, as little-endian two's complement bytes
+        length: int = value.bit_length() // 8 + 1
+        out += b"n" + _U32.pack(length) + value.to_bytes(length, "little", signed=True)
+    else:
+        out += b"f" + _F64.pack(value)
+
+
+def _decode(payload: bytes, position: int) -> tuple[str | Cost | dict[str, Cost], int]:
+    tag = payload[position:position + 1]
+    position += 1
+    if tag == b"s":
+        (length,) = _U32.unpack_from(payload, position)
+        position += _U32.size
+        return payload[position:position + length].decode("utf-8"), position + length
+    if tag == b"m":
+        (count,) = _U32.unpack_from(payload, position)
+        position += _U32.size
+        mapping: dict[str, Cost] = {}
+        for _ in range(count):
+            key, position = _decode(payload, position)
+            item, position = _decode(payload, position)
+            mapping[key] = item
+        return mapping, position
+    if tag == b"i":
+        return _I64.unpack_from(payload, position)[0], position + _I64.size
+    if tag == b"n":
+        (length,) = _U32.unpack_from(payload, position)
+        position += _U32.size
+        return int.from_bytes(payload[position:position + length], "little", signed=True), position + length
+    return _F64.unpack_from(payload, position)[0], position + _F64.size
+
+
+def encode_record(op: int, *fields: str | Cost | dict[str, Cost]) -> bytes:
+    payload = bytearray([op])
+    for field in fields:
+        _encode(field, payload)
+    return RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _scan(data: bytes, position: int) -> Iterator[tuple[Record, int]]:
+    # yields each intact record from position on with the offset just past it, stopping at the first torn or corrupt one
+    while position + RECORD_HEADER.size <= len(data):
+        length, checksum = RECORD_HEADER.unpack_from(data, position)
+        payload = data[position + RECORD_HEADER.size:position + RECORD_HEADER.size + length]
+        if len(payload) != length or zlib.crc32(payload) != checksum:
+            return
+        fields: list[str | Cost | dict[str, Cost]] = []
+        offset: int = 1
+        while offset < length:
+            field, offset = _decode(payload, offset)
+            fields.append(field)
+        position += RECORD_HEADER.size + length
+        yield (payload[0], tuple(fields)), position
+
+
+def read_log(path: str, base: tuple[int, int, int]) -> tuple[list[Record], int, bool | None] | None:
+    # returns the intact records, where they end and whether they were logged for a directed graph (None
+    # for a first-format log), or None when there is no log for this base
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        data: bytes = f.read()
+    magic: bytes = data[:len(WAL_MAGIC)]
+    if magic == WAL_MAGIC and len(data) >= WAL_HEADER.size:
+        _, *identity, flags = WAL_HEADER.unpack_from(data)
+        header_size: int = WAL_HEADER.size
+        directed: bool | None = bool(flags & DIRECTED)
+    elif magic == LEGACY_WAL_MAGIC and len(data) >= LEGACY_WAL_HEADER.size:
+        _, *identity = LEGACY_WAL_HEADER.unpack_from(data)
+        header_size = LEGACY_WAL_HEADER.size
+        directed = None
+    else:
+        return None
+    if tuple(identity) != base:
+        return None
+    records: list[Record] = []
+    end: int = header_size
+    for record, end in _scan(data, header_size):
+        records.append(record)
+    return records, end, directed
+
+
+class WriteAheadLog:
+    def __init__(self, path: str, base: tuple[int, int, int], directed: bool = False, records: int = 0, size: int = 0) -> None:
+        self.path: str = path
+        self.base: tuple[int, int, int] = base
+        self.directed: bool = directed
+        self.records: int = records
+        self.size: int = size
+        self._file: BinaryIO | None = None
+
+    @classmethod
+    def open(cls, path: str, base: tuple[int, int, int], directed: bool = False) -> "WriteAheadLog":
+        # continue an existing log for this base (dropping any torn tail), or start a new one
+        existing = read_log(path, base)
+        if existing is None:
+            return cls(path, base, directed)
+        records, end, logged_directed = existing
+        if logged_directed is not None and logged_directed != directed:
+            raise ValueError(f"{path} holds changes to a {'directed' if logged_directed else 'undirected'} graph")
+        if logged_directed is None:
+            # a first-format log gets the current header in front of its records
+            with open(path, "rb") as f:
+                logged: bytes = f.read(end)[LEGACY_WAL_HEADER.size:]
+            cls._write_header(path, base, directed, logged)
+            return cls(path, base, directed, len(records), len(logged))
+        with open(path, "r+b") as f:
+            f.truncate(end)
+        return cls(path, base, directed, len(records), end - WAL_HEADER.size)
+
+    @staticmethod
+    def _write_header(path: str, base: tuple[int, int, int], directed: bool, records: bytes = b"") -> None:
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(WAL_HEADER.pack(WAL_MAGIC, *base, DIRECTED if directed else 0) + records)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+    def append(self, op: int, *fields: str | Cost | dict[str, Cost]) -> None:
+        if self._file is None:
+            self._file = self._open_file()
+        record: bytes = encode_record(op, *fields)
+        self._file.write(record)
+        # hand every record to the OS straight away so it survives the process dying
+        self._file.flush()
+        self.records += 1
+        self.size += len(record)
+
+    def sync(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open_file(self) -> BinaryIO:
+        # the file is only created once something is logged
+        if self.records == 0:
+            self._write_header(self.path, self.base, self.directed)
+        return open(self.path, "ab")
@@ -0,0 +1,212 @@
+import math
+import threading
+from array import array
+from collections.abc import Iterable, Mapping, Sequence
+
+
+class EdgeWeights:
+    """Named weight channels kept next to the edge cost, e.g. distance, time and toll.
+
+    Each channel is one packed array('d') laid out like the CSR entries of CompactGraph.from_graph: node i's
+    edges sit at offsets[i]:offsets[i+1], in adj_list order, so edges need no ids of their own. An undirected
+    edge holds its value at both of its entries, and NaN marks an edge that has no value on a channel.
+    Edge changes leave the layout behind the graph; values written in the meantime wait in a pending dict,
+    and refresh() lays the channels out again, carrying every value over, before the next search reads them.
+    """
+
+    def __init__(self, directed: bool = False) -> None:
+        self.directed: bool = directed
+        self.columns: dict[str, array] = {}
+        # the layout the columns follow, and the graph's edges_version it was taken at
+        self.nodes: list[str] = []
+        self.index: dict[str, int] = {}
+        self.offsets: array = array("q", [0])
+        self.targets: array = array("i")
+        self.version: int | None = None
+        # start -> end -> values, for edges the layout doesn't have yet
+        self.pending: dict[str, dict[str, dict[str, float]]] = {}
+        # searches of the query server refresh from several threads at once
+        self._lock = threading.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __len__(self) -> int:
+        # edges with a value on some channel
+        laid_out: int = sum(any(column[position] == column[position] for column in self.columns.values()) for position in range(len(self.targets)))
+        waiting: int = sum(len(ends) for ends in self.pending.values())
+        return laid_out + waiting if self.directed else (laid_out + waiting) // 2
+
+    def names(self) -> list[str]:
+        return list(self.columns)
+
+    def position(self, start: str, end: str) -> int | None:
+        # where start -> end sits in the layout, found by scanning start's entries
+        node: int | None = self.index.get(start)
+        target: int | None = self.index.get(end)
+        if node is None or target is None:
+            return None
+        targets = self.targets
+        for position in range(self.offsets[node], self.offsets[node + 1]):
+            if targets[position] == target:
+                return position
+        return None
+
+    def get(self, start: str, end: str, name: str) -> float | None:
+        column: array | None = self.columns.get(name)
+        if column is None:
+            return None
+        values: dict[str, float] | None = self.pending.get(start, {}).get(end)
+        if values is not None and name in values:
+            return values[name]
+        position: int | None = self.position(start, end)
+        if position is None or math.isnan(column[position]):
+            return None
+        return column[position]
+
+    def channel(self, name: str) -> array:
+        column: array | None = self.columns.get(name)
+        if column is None:
+            column = self.columns[name] = array("d", [math.nan]) * len(self.targets)
+        return column
+
+    def set(self, start: str, end: str, values: Mapping[str, float]) -> None:
+        for name in values:
+            self.channel(name)
+        forward: int | None = self.position(start, end)
+        backward: int | None = None if self.directed else self.position(end, start)
+        if forward is None or (not self.directed and backward is None):
+            self._hold(start, end, values)
+            return
+        for name, value in values.items():
+            column: array = self.columns[name]
+            column[forward] = value
+            if backward is not None:
+                column[backward] = value
+
+    def _hold(self, start: str, end: str, values: Mapping[str, float]) -> None:
+        # an undirected edge files one dict under both ends
+        held: dict[str, float] | None = self.pending.get(start, {}).get(end)
+        if held is None:
+            held = self.pending.setdefault(start, {})[end] = {}
+            if not self.directed:
+                self.pending.setdefault(end, {})[start] = held
+        held.update(values)
+
+    def remove(self, start: str, end: str) -> None:
+        self._drop_pending(start, end)
+        self._clear(self.position(start, end))
+        if not self.directed:
+            self._drop_pending(end, start)
+            self._clear(self.position(end, start))
+
+    def remove_node(self, node: str, neighbours: Iterable[str] = ()) -> None:
+        # neighbours are the nodes with an edge into node: its own neighbours when undirected, its
+        # predecessors when directed
+        neighbours = list(neighbours)
+        for neighbour in neighbours:
+            self._drop_pending(neighbour, node)
+            self._clear(self.position(neighbour, node))
+        for end in self.pending.pop(node, {}):
+            if not self.directed:
+                self._drop_pending(end, node)
+        position: int | None = self.index.get(node)
+        if position is not None:
+            for entry in range(self.offsets[position], self.offsets[position + 1]):
+                self._clear(entry)
+
+    def _drop_pending(self, start: str, end: str) -> None:
+        ends: dict[str, dict[str, float]] | None = self.pending.get(start)
+        if ends is not None:
+            ends.pop(end, None)
+            if not ends:
+                del self.pending[start]
+
+    def _clear(self, position: int | None) -> None:
+        if position is not None:
+            for column in self.columns.values():
+                column[position] = math.nan
+
+    def refresh(self, adj_list: Mapping[str, Mapping[str, int | float]], version: int) -> None:
+        # lays the channels out for the graph as it is now, version being its edges_version; a graph
+        # without channels is left alone
+        if not self.columns or (self.version == version and not self.pending):
+            return
+        with self._lock:
+            if self.version == version and not self.pending:
+                return
+            nodes: list[str] = list(adj_list)
+            index: dict[str, int] = {name: i for i, name in enumerate(nodes)}
+            offsets = array("q", [0])
+            targets = array("i")
+            columns: dict[str, array] = {name: array("d") for name in self.columns}
+            for name in nodes:
+                neighbours = adj_list[name]
+                # where each neighbour sat in the old layout, and values waiting for this node's edges
+                old: dict[str, int] = {}
+                node: int | None = self.index.get(name)
+                if node is not None:
+                    old = {self.nodes[self.targets[position]]: position for position in range(self.offsets[node], self.offsets[node + 1])}
+                held: dict[str, dict[str, float]] = self.pending.get(name, {})
+                targets.extend(index[neighbour] for neighbour in neighbours)
+                offsets.append(len(targets))
+                for channel, column in columns.items():
+                    previous: array = self.columns[channel]
+                    for neighbour in neighbours:
+                        values: dict[str, float] | None = held.get(neighbour)
+                        if values is not None and channel in values:
+                            column.append(values[channel])
+                        elif neighbour in old:
+                            column.append(previous[old[neighbour]])
+                        else:
+                            column.append(math.nan)
+            self.nodes, self.index, self.offsets, self.targets = nodes, index, offsets, targets
+            self.columns = columns
+            self.pending = {}
+            self.version = version
+
+    def restore(self, nodes: Sequence[str], offsets: Sequence[int], targets: Sequence[int], channels: Mapping[str, Sequence[float]], version: int) -> None:
+        # adopts channels read back with a snapshot, laid out like its CSR entries
+        self.nodes = list(nodes)
+        self.index = {name: i for i, name in enumerate(self.nodes)}
+        self.offsets = array("q", offsets)
+        self.targets = array("i", targets)
+        self.columns = {name: array("d", values) for name, values in channels.items()}
+        self.pending = {}
+        self.version = version
+
+    def adjacency(self, name: str, predecessors: Mapping[str, Iterable[str]] | None = None) -> "ChannelAdjacency":
+        # the layout has to be current, see refresh()
+        return ChannelAdjacency(self, self.columns[name], predecessors)
+
+
+class ChannelAdjacency:
+    """adj_list stand-in for the searches: node -> {neighbour: value} on one channel, built per lookup.
+
+    With predecessors (a directed graph's in-edges) it walks edges backwards. Edges without a value
+    on the channel are left out, so searches can't cross them.
+    """
+    __slots__ = ("_weights", "_column", "_predecessors")
+
+    def __init__(self, weights: EdgeWeights, column: array, predecessors: Mapping[str, Iterable[str]] | None = None) -> None:
+        self._weights = weights
+        self._column = column
+        self._predecessors = predecessors
+
+    def __getitem__(self, node: str) -> dict[str, float]:
+        weights, column = self._weights, self._column
+        neighbours: dict[str, float] = {}
+        if self._predecessors is None:
+            nodes, targets = weights.nodes, weights.targets
+            row: int = weights.index[node]
+            for position in range(weights.offsets[row], weights.offsets[row + 1]):
+                value = column[position]
+                # NaN, the only value unequal to itself, is an edge without a value here
+                if value == value:
+                    neighbours[nodes[targets[position]]] = value
+            return neighbours
+        for predecessor in self._predecessors[node]:
+            position: int | None = weights.position(predecessor, node)
+            if position is not None and column[position] == column[position]:
+                neighbours[predecessor] = column[position]
+        return neighbours
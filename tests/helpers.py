@@ -0,0 +1,34 @@
+import unittest
+import tempfile
+import os
+import src.graph_ops.graph as graph_module
+from src.graph_ops.graph import Graph
+
+
+class GraphFileTestCase(unittest.TestCase):
+    """Base for tests that save and load: each test gets the graph file in a fresh temporary directory."""
+
+    def setUp(self):
+        """Point the graph file at a fresh temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.temp_dir.name, ".graph_data")
+        self.original_filename = graph_module.FILENAME
+        self.original_legacy = graph_module.LEGACY_FILENAME
+        self.original_min_bytes = graph_module.COMPACTION_MIN_BYTES
+        graph_module.FILENAME = self.filename
+        graph_module.LEGACY_FILENAME = os.path.join(self.temp_dir.name, ".graph_data.json")
+
+    def tearDown(self):
+        # a log left open by the test's graph would keep its file busy during cleanup
+        graph: Graph | None = getattr(self, "graph", None)
+        if graph is not None and graph.wal is not None:
+            graph.wal.close()
+        graph_module.FILENAME = self.original_filename
+        graph_module.LEGACY_FILENAME = self.original_legacy
+        graph_module.COMPACTION_MIN_BYTES = self.original_min_bytes
+        self.temp_dir.cleanup()
+
+    def reload(self) -> Graph:
+        graph = Graph()
+        graph.load()
+        return graph
@@ -142,6 +142,19 @@ def run_specific_test_category(category):
         'graph': 'test_graph.py',
         'shell': 'test_shell.py',
         'ucs': 'test_ucs.py',
+        'compact': 'test_compact.py',
+        'snapshot': 'test_snapshot.py',
+        'wal': 'test_wal.py',
+        'landmarks': 'test_landmarks.py',
+        'cache': 'test_cache.py',
+        'paths': 'test_paths.py',
+        'parallel': 'test_parallel.py',
+        'components': 'test_components.py',
+        'directed': 'test_directed.py',
+        'weights': 'test_weights.py',
+        'attributes': 'test_attributes.py',
+        'indexes': 'test_indexes.py',
+        'server': 'test_server.py',
         'performance': 'test_performance.py'
     }
     
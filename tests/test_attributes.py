@@ -0,0 +1,234 @@
+import unittest
+import math
+import os
+import struct
+import tempfile
+from array import array
+import src.graph_ops.graph as graph_module
+from src.graph_ops.attributes import ATTRIBUTE_SUFFIX, NodeAttributes, read_attributes, write_attributes
+from src.graph_ops.graph import Graph
+from tests.helpers import GraphFileTestCase
+
+
+class TestNodeAttributes(unittest.TestCase):
+
+    def test_columns_are_typed_by_first_value(self):
+        """Test that numbers and labels land in packed columns of their own kind."""
+        attributes = NodeAttributes()
+        attributes.set("A", "capacity", 10)
+        attributes.set("B", "region", "eu")
+        attributes.set("C", "region", "us")
+        attributes.set("D", "region", "eu")
+        self.assertEqual(attributes.columns["capacity"].values.typecode, "d")
+        self.assertEqual(attributes.columns["region"].labels, ["eu", "us"])
+        self.assertEqual(list(attributes.columns["region"].codes), [-1, 0, 1, 0])
+        self.assertEqual(attributes.get("A", "capacity"), 10.0)
+        self.assertIsNone(attributes.get("A", "region"))
+        with self.assertRaises(ValueError):
+            attributes.set("A", "capacity", "large")
+        with self.assertRaises(ValueError):
+            attributes.set("A", "region", 3)
+
+    def test_bad_values_leave_nothing_behind(self):
+        """Test that a rejected value allocates no column or row."""
+        attributes = NodeAttributes()
+        attributes.set("A", "capacity", 1)
+        for value in ([1], True, {"x": 1}):
+            with self.assertRaises(ValueError):
+                attributes.set("B", "tags", value)
+        with self.assertRaises(ValueError):
+            attributes.set_many("capacity", [("B", 2), ("C", "big")])
+        with self.assertRaises(ValueError):
+            attributes.set_many("size", [("B", 2), ("C", "big")])
+        attributes.set("B", "colour", None)
+        self.assertEqual(attributes.names(), ["capacity"])
+        self.assertEqual(list(attributes.ids), ["A"])
+        self.assertEqual(attributes.get("A", "capacity"), 1.0)
+
+    def test_bulk_get_and_set(self):
+        """Test writing and reading one attribute for many nodes at once."""
+        attributes = NodeAttributes()
+        self.assertEqual(attributes.set_many("capacity", [("A", 1), ("B", 2.5)]), 2)
+        values = attributes.get_many("capacity", ["B", "Z", "A"])
+        self.assertIsInstance(values, array)
+        self.assertEqual(values[0], 2.5)
+        self.assertTrue(math.isnan(values[1]))
+        attributes.set_many("label", [("A", "x")])
+        self.assertEqual(attributes.get_many("label", ["A", "B"]), ["x", None])
+        with self.assertRaises(ValueError):
+            attributes.get_many("missing", ["A"])
+
+    def test_removed_rows_are_reused(self):
+        """Test that removing a node clears its row and hands it to the next node."""
+        attributes = NodeAttributes()
+        attributes.set("A", "capacity", 1)
+        attributes.set("B", "capacity", 2)
+        row = attributes.ids["A"]
+        attributes.remove("A")
+        self.assertIsNone(attributes.get("A", "capacity"))
+        attributes.set("C", "region", "eu")
+        self.assertEqual(attributes.ids["C"], row)
+        self.assertIsNone(attributes.get("C", "capacity"))
+        self.assertEqual(len(attributes.columns["capacity"].values), 2)
+
+    def test_select(self):
+        """Test filters on number and label columns, where missing values never match."""
+        attributes = NodeAttributes()
+        attributes.set_many("capacity", [("A", 1), ("B", 5), ("C", 9)])
+        attributes.set_many("region", [("A", "eu"), ("B", "us"), ("D", "eu")])
+        self.assertEqual(attributes.select(("capacity", ">=", 5)), ["B", "C"])
+        self.assertEqual(attributes.select(("capacity", "!=", 5)), ["A", "C"])
+        self.assertEqual(attributes.select(("region", "==", "eu")), ["A", "D"])
+        self.assertEqual(attributes.select(("region", "!=", "eu")), ["B"])
+        self.assertEqual(attributes.select(("region", "==", "asia")), [])
+        self.assertEqual(attributes.select(("region", "<", "f")), ["A", "D"])
+        for where in [("speed", "==", 1), ("capacity", "~", 1), ("capacity", "==", "big")]:
+            with self.assertRaises(ValueError):
+                attributes.select(where)
+
+    def test_file_round_trip(self):
+        """Test that the attribute file keeps values, kinds and missing entries."""
+        attributes = NodeAttributes()
+        attributes.set_many("capacity", [("A", 1), ("B", 2)])
+        attributes.set_many("region", [("B", "eu"), ("C", "us")])
+        attributes.remove("A")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "graph" + ATTRIBUTE_SUFFIX)
+            write_attributes(path, attributes)
+            self.assertFalse(attributes.dirty)
+            loaded = read_attributes(path)
+            with open(path, "r+b") as f:
+                f.write(struct.pack("<8s", b"NOTATTR\0"))
+            with self.assertRaises(ValueError):
+                read_attributes(path)
+        self.assertEqual(sorted(loaded.ids), ["B", "C"])
+        self.assertEqual(loaded.get("B", "capacity"), 2.0)
+        self.assertIsNone(loaded.get("C", "capacity"))
+        self.assertEqual(loaded.get("C", "region"), "us")
+        self.assertEqual(loaded.select(("region", "==", "eu")), ["B"])
+
+
+class TestGraphAttributes(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a square whose two routes run through different regions."""
+        #   A --1-- B --1-- D     B: region eu
+        #   |               |     C: region us
+        #   +---2-- C --2---+
+        self.graph = Graph()
+        for node in ["A", "B", "C", "D"]:
+            self.graph.add_node(node)
+        self.graph.add_edge("A", "B", 1)
+        self.graph.add_edge("B", "D", 1)
+        self.graph.add_edge("A", "C", 2)
+        self.graph.add_edge("C", "D", 2)
+        self.graph.set_attributes("region", {"B": "eu", "C": "us"})
+
+    def test_set_attribute_messages(self):
+        """Test the messages of setting, clearing and mistyping attributes."""
+        self.assertEqual(self.graph.set_attribute("A", "capacity", 4), "A capacity set to 4")
+        self.assertEqual(self.graph.set_attribute("A", "capacity", "big"), "Attribute capacity holds numbers")
+        self.assertEqual(self.graph.set_attribute("A", "region", 1), "Attribute region holds labels")
+        self.assertEqual(self.graph.set_attribute("Z", "capacity", 1), "Z doesn't exist")
+        self.assertEqual(self.graph.set_attribute("A", "tags", [1]), "Attribute values are numbers or labels, got [1]")
+        self.assertEqual(self.graph.set_attribute("A", "capacity", None), "A capacity cleared")
+        self.assertIsNone(self.graph.attribute("A", "capacity"))
+
+    def test_bulk_attributes_skip_unknown_nodes(self):
+        """Test bulk writes and reads over the graph's nodes."""
+        self.assertEqual(self.graph.set_attributes("capacity", [("A", 3), ("Z", 1)]), 1)
+        self.assertEqual(list(self.graph.get_attributes("capacity", ["A"])), [3.0])
+        self.assertEqual(self.graph.get_attributes("region"), [None, "eu", "us", None])
+        self.assertEqual(self.graph.select_nodes(("region", "==", "us")), ["C"])
+
+    def test_filtered_searches(self):
+        """Test that searches only pass through nodes matching the filter."""
+        self.assertEqual(self.graph.ucs("A", "D").path, ["A", "B", "D"])
+        us_only = ("region", "==", "us")
+        self.assertEqual(self.graph.ucs("A", "D", where=us_only).path, ["A", "C", "D"])
+        self.assertEqual(self.graph.ucs("A", "D", bidirectional=True, where=us_only).cost, 4)
+        self.assertEqual(self.graph.bfs("A", "D", bidirectional=True, where=us_only).path, ["A", "C", "D"])
+        self.assertNotIn("C", self.graph.bfs("A", "D", where=("region", "==", "eu")).path)
+        self.assertFalse(self.graph.ucs("A", "D", where=("region", "==", "asia")).found)
+        self.assertEqual(self.graph.shortest_paths("A", where=us_only).distances, {"A": 0, "C": 2})
+        self.assertEqual(self.graph.ucs("A", "D", where=("speed", ">", 1)).error, "Unknown attribute speed")
+        self.assertEqual(self.graph.bfs("A", "D", where=("region", "~", "eu")).error, "Unknown comparison ~")
+
+    def test_filter_cache_follows_changes(self):
+        """Test that a cached filtered search is redone once the attributes change."""
+        us_only = ("region", "==", "us")
+        self.assertEqual(self.graph.ucs("A", "D", where=us_only).cost, 4)
+        self.graph.set_attribute("B", "region", "us")
+        self.assertEqual(self.graph.ucs("A", "D", where=us_only).cost, 2)
+
+    def test_removed_node_drops_attributes(self):
+        """Test that removing a node removes its attribute values."""
+        self.graph.remove_node("B")
+        self.assertIsNone(self.graph.attribute("B", "region"))
+        self.assertEqual(self.graph.select_nodes(("region", "!=", "us")), [])
+        self.graph.from_dict({"P": {}})
+        self.assertEqual(self.graph.attributes.names(), [])
+
+    def test_positions_from_attributes(self):
+        """Test that x and y attributes serve as A* coordinates."""
+        self.graph.set_attributes("x", {"A": 0, "B": 1, "C": 0, "D": 1})
+        self.graph.set_attributes("y", {"A": 0, "B": 0, "C": 1, "D": 1})
+        self.assertEqual(self.graph.position("C"), (0.0, 1.0))
+        self.graph.set_position("C", 5, 5)
+        self.assertEqual(self.graph.position("C"), (5, 5))
+        self.assertEqual(self.graph.astar("A", "D").cost, 2)
+
+
+class TestAttributePersistence(GraphFileTestCase):
+
+    def test_save_and_load(self):
+        """Test that attributes survive save and load, minus nodes removed through the log."""
+        graph = Graph()
+        graph.add_edges_from([("A", "B", 1), ("B", "C", 1)])
+        graph.set_attributes("region", {"A": "eu", "B": "us", "C": "eu"})
+        graph.set_attribute("C", "capacity", 7.5)
+        graph.save()
+        self.assertTrue(os.path.exists(graph_module.FILENAME + ATTRIBUTE_SUFFIX))
+        graph.enable_wal()
+        graph.remove_node("A")
+        graph.save()
+
+        loaded = Graph()
+        loaded.load()
+        self.assertEqual(loaded.attribute("C", "capacity"), 7.5)
+        self.assertEqual(loaded.select_nodes(("region", "==", "eu")), ["C"])
+        self.assertIsNone(loaded.attribute("A", "region"))
+
+    def test_positions_survive_reload(self):
+        """Test that coordinates given with set_position are saved as the x and y attributes."""
+        self.graph = Graph()
+        self.graph.add_edges_from([("A", "B", 1)])
+        self.assertEqual(self.graph.set_position("A", 2.5, -1), "A placed at (2.5, -1)")
+        self.graph.save()
+        self.assertEqual(self.reload().position("A"), (2.5, -1.0))
+        self.assertIsNone(self.reload().position("B"))
+
+        labelled = Graph()
+        labelled.add_edges_from([("A", "B", 1)])
+        labelled.set_attribute("B", "y", "north")
+        self.assertEqual(labelled.set_position("B", 0, 0), "Attribute y holds labels")
+        self.assertIsNone(labelled.attribute("B", "x"))
+
+    def test_unchanged_attributes_are_not_rewritten(self):
+        """Test that saving again without attribute changes leaves the file alone, and clearing them removes it."""
+        graph = Graph()
+        graph.add_edges_from([("A", "B", 1)])
+        graph.set_attribute("A", "capacity", 1)
+        graph.save()
+        path = graph_module.FILENAME + ATTRIBUTE_SUFFIX
+        written = os.stat(path).st_mtime_ns
+        graph.add_node("C")
+        graph.save()
+        self.assertEqual(os.stat(path).st_mtime_ns, written)
+        graph.from_dict({"A": {}})
+        graph.save()
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
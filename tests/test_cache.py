@@ -0,0 +1,137 @@
+import unittest
+from src.graph_ops.cache import MISSING, PathCache
+from src.graph_ops.graph import Graph
+from src.graph_ops.shell import format_result
+
+
+class TestPathCache(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is dropped when full."""
+        cache = PathCache(2)
+        cache.put("a", 0, 1)
+        cache.put("b", 0, 2)
+        self.assertEqual(cache.get("a", 0), 1)
+        cache.put("c", 0, 3)
+        self.assertIs(cache.get("b", 0), MISSING)
+        self.assertEqual(cache.get("a", 0), 1)
+        self.assertEqual(cache.get("c", 0), 3)
+        self.assertEqual(cache.stats(), {"hits": 3, "misses": 1, "invalidations": 0, "size": 2, "maxsize": 2})
+
+    def test_none_is_a_result(self):
+        """Test that a cached None is told apart from a miss."""
+        cache = PathCache()
+        cache.put("unreachable", 0, None)
+        self.assertIsNone(cache.get("unreachable", 0))
+        self.assertEqual(cache.hits, 1)
+
+    def test_new_version_empties_cache(self):
+        """Test that looking up under a newer version drops every entry."""
+        cache = PathCache()
+        cache.put("a", 0, 1)
+        self.assertIs(cache.get("a", 1), MISSING)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.invalidations, 1)
+
+    def test_resize_and_disable(self):
+        """Test shrinking the cache and turning it off with size 0."""
+        cache = PathCache(3)
+        for key in "abc":
+            cache.put(key, 0, key)
+        cache.resize(1)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.get("c", 0), "c")
+        cache.resize(0)
+        cache.put("d", 0, "d")
+        self.assertEqual(len(cache), 0)
+
+
+class TestGraphSearchCache(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a small graph whose searches can be cached."""
+        self.graph = Graph()
+        self.graph.add_edges_from([("A", "B", 1), ("B", "C", 1), ("A", "C", 5), ("C", "D", 1)])
+
+    def test_repeated_queries_hit(self):
+        """Test that identical trace-free queries are answered from the cache."""
+        for _ in range(3):
+            self.assertEqual(format_result(self.graph.ucs("A", "D", trace=False)), "Path: A -> B -> C -> D, Total cost: 3")
+            self.assertEqual(format_result(self.graph.bfs("A", "D", trace=False)), "A -> B -> C -> D")
+        self.assertEqual(self.graph.cache.misses, 2)
+        self.assertEqual(self.graph.cache.hits, 4)
+
+    def test_cached_paths_are_not_shared(self):
+        """Test that changing a returned path doesn't change later cached answers."""
+        self.graph.ucs("A", "D").path.append("Z")
+        self.graph.bfs("A", "D").path.clear()
+        self.assertEqual(self.graph.ucs("A", "D").path, ["A", "B", "C", "D"])
+        self.assertEqual(self.graph.bfs("A", "D").path, ["A", "B", "C", "D"])
+        self.assertEqual(self.graph.cache.hits, 2)
+
+    def test_algorithms_are_cached_separately(self):
+        """Test that the cache key includes the algorithm and direction."""
+        self.graph.bfs("A", "D", trace=False)
+        self.graph.dfs("A", "D", trace=False)
+        self.graph.bfs("A", "D", trace=False, bidirectional=True)
+        self.graph.ucs("A", "D", trace=False, bidirectional=True)
+        self.graph.astar("A", "D", "euclidean", trace=False)
+        self.assertEqual(len(self.graph.cache), 5)
+        self.assertEqual(self.graph.cache.hits, 0)
+
+    def test_mutations_invalidate(self):
+        """Test that every mutating method makes cached paths stale."""
+        mutations = [
+            lambda graph: graph.add_edge("A", "D", 1),
+            lambda graph: graph.remove_edge("A", "D"),
+            lambda graph: graph.add_node("E", {"D": 1}),
+            lambda graph: graph.remove_node("E"),
+            lambda graph: graph.add_edges_from([("B", "D", 1)]),
+            lambda graph: graph.remove_nodes(["B"]),
+            lambda graph: graph.set_position("A", 0, 0),
+        ]
+        for mutate in mutations:
+            self.graph.ucs("A", "D", trace=False)
+            mutate(self.graph)
+            self.assertEqual(self.graph.ucs("A", "D", trace=False), self._uncached().ucs("A", "D", trace=False))
+        self.graph.from_dict({"A": {"D": 7}, "D": {"A": 7}})
+        self.assertEqual(format_result(self.graph.ucs("A", "D", trace=False)), "Path: A -> D, Total cost: 7")
+        self.assertGreater(self.graph.cache.invalidations, 0)
+
+    def _uncached(self) -> Graph:
+        graph = Graph(cache_size=0)
+        graph.from_dict({node: dict(neighbours) for node, neighbours in self.graph.adj_list.items()})
+        return graph
+
+    def test_traced_searches_bypass_cache(self):
+        """Test that searches with trace on still record their trace."""
+        self.graph.ucs("A", "D", trace=False)
+        result = self.graph.ucs("A", "D", trace=True)
+        self.assertTrue(result.trace)
+        self.assertEqual(format_result(result), "Path: A -> B -> C -> D, Total cost: 3")
+        self.assertEqual(self.graph.cache.hits, 0)
+
+    def test_hits_keep_explored_count(self):
+        """Test that a cached result reports the work of the search that produced it."""
+        first = self.graph.ucs("A", "D")
+        second = self.graph.ucs("A", "D")
+        self.assertEqual(self.graph.cache.hits, 1)
+        self.assertEqual(second.explored, first.explored)
+        self.assertGreater(second.explored, 0)
+
+    def test_unreachable_results_cached(self):
+        """Test that a missing path is cached like any other result."""
+        self.graph.add_node("Z")
+        self.assertEqual(format_result(self.graph.ucs("A", "Z", trace=False)), "Z is unreachable")
+        self.assertEqual(format_result(self.graph.ucs("A", "Z", trace=False)), "Z is unreachable")
+        self.assertEqual(self.graph.cache.hits, 1)
+
+    def test_custom_heuristic_not_cached(self):
+        """Test that astar with a heuristic function always searches."""
+        self.graph.astar("A", "D", lambda node, target: 0, trace=False)
+        self.graph.astar("A", "D", lambda node, target: 0, trace=False)
+        self.assertEqual(len(self.graph.cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
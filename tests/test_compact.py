@@ -0,0 +1,153 @@
+import unittest
+import random
+import sys
+from array import array
+from dataclasses import FrozenInstanceError
+from src.graph_ops.graph import Graph
+from src.graph_ops.compact import CompactGraph, EdgeTable
+
+
+class TestCompactGraph(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.graph = Graph()
+        #     A --- 1 --- B
+        #     |           |
+        #     4           2
+        #     |           |
+        #     C --- 1 --- D     E (isolated)
+        for node in ["A", "B", "C", "D", "E"]:
+            self.graph.add_node(node)
+        self.graph.add_edge("A", "B", 1)
+        self.graph.add_edge("A", "C", 4)
+        self.graph.add_edge("B", "D", 2)
+        self.graph.add_edge("C", "D", 1)
+        self.compact = self.graph.to_compact()
+
+    def test_csr_layout(self):
+        """Test that nodes are interned and neighbours stored contiguously."""
+        self.assertEqual(list(self.compact.names), ["A", "B", "C", "D", "E"])
+        self.assertEqual(self.compact.num_nodes, 5)
+        self.assertEqual(self.compact.num_edges, 4)
+        self.assertEqual(list(self.compact.offsets), [0, 2, 4, 6, 8, 8])
+        self.assertEqual(list(self.compact.neighbours(self.compact.node_id("A"))), [(1, 1), (2, 4)])
+        self.assertIsInstance(self.compact.targets, array)
+        self.assertEqual(self.compact.weights.typecode, "q")
+
+    def test_float_weights_use_double_array(self):
+        """Test that non-integer costs are stored as doubles."""
+        self.graph.add_edge("A", "E", 0.5)
+        compact = self.graph.to_compact()
+        self.assertEqual(compact.weights.typecode, "d")
+        result = compact.ucs("B", "E")
+        self.assertEqual((result.path, result.cost), (["B", "A", "E"], 1.5))
+
+    def test_frozen(self):
+        """Test that the compact graph cannot be reassigned."""
+        with self.assertRaises(FrozenInstanceError):
+            self.compact.names = []
+
+    def test_searches_match_graph(self):
+        """Test that bfs/dfs/ucs give the same answers as the dict-based graph."""
+        for start, target in [("A", "D"), ("D", "A"), ("A", "E"), ("C", "B"), ("A", "A")]:
+            self.assertEqual(self.compact.bfs(start, target), self.graph.bfs(start, target, trace=False))
+            self.assertEqual(self.compact.dfs(start, target), self.graph.dfs(start, target, trace=False))
+            self.assertEqual(self.compact.ucs(start, target), self.graph.ucs(start, target, trace=False))
+
+    def test_missing_nodes(self):
+        """Test searches with nodes that are not in the graph."""
+        self.assertFalse(self.compact.bfs("Z", "A").found)
+        self.assertFalse(self.compact.dfs("Z", "A").found)
+        self.assertEqual(self.compact.ucs("Z", "A").error, "Start node Z doesn't exist")
+        self.assertEqual(self.compact.ucs("A", "Z").error, "Target node Z doesn't exist")
+
+    def test_random_graphs_match(self):
+        """Test the compact searches against the dict-based graph on random graphs."""
+        rng = random.Random(7)
+        for _ in range(5):
+            graph = Graph()
+            for i in range(60):
+                graph.add_node(f"N{i}")
+            for _ in range(120):
+                a, b = rng.sample(range(60), 2)
+                graph.add_edge(f"N{a}", f"N{b}", rng.randint(1, 9))
+            compact = CompactGraph.from_graph(graph)
+            for target in ("N59", "N30"):
+                self.assertEqual(compact.bfs("N0", target), graph.bfs("N0", target, trace=False))
+                self.assertEqual(compact.dfs("N0", target), graph.dfs("N0", target, trace=False))
+                self.assertEqual(compact.ucs("N0", target), graph.ucs("N0", target, trace=False))
+
+    def test_memory_smaller_than_adjacency_dicts(self):
+        """Test that the CSR arrays take far less memory than the nested dicts."""
+        graph = Graph()
+        for i in range(2000):
+            graph.add_node(f"N{i}")
+        for i in range(2000):
+            for step in (1, 7, 31):
+                graph.add_edge(f"N{i}", f"N{(i + step) % 2000}", step)
+        compact = graph.to_compact()
+
+        dict_bytes = sum(sys.getsizeof(neighbours) for neighbours in graph.adj_list.values())
+        csr_bytes = sum(sys.getsizeof(column) for column in (compact.offsets, compact.targets, compact.weights))
+        self.assertLess(csr_bytes * 3, dict_bytes)
+
+
+
+class TestEdgeTable(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a small weighted graph with an isolated node."""
+        self.graph = Graph()
+        self.graph.add_edges_from([("B", "A", 1), ("A", "C", 4), ("B", "D", 2), ("C", "D", 1)])
+        self.graph.add_node("E")
+
+    def test_edges_stored_once(self):
+        """Test that each undirected edge takes a single row."""
+        table = self.graph.to_edge_table()
+        self.assertIsInstance(table, EdgeTable)
+        self.assertEqual((table.num_nodes, table.num_edges), (5, 4))
+        self.assertEqual(sorted(table), [("A", "B", 1), ("A", "C", 4), ("B", "D", 2), ("C", "D", 1)])
+        self.assertEqual(table.weights.typecode, "q")
+
+    def test_round_trip(self):
+        """Test rebuilding a graph, directed or not, from its edge table."""
+        restored = Graph()
+        restored.from_edge_table(self.graph.to_edge_table())
+        self.assertEqual(restored.adj_list, self.graph.adj_list)
+        self.assertFalse(restored.directed)
+
+        directed = Graph(directed=True)
+        directed.add_edges_from([("A", "B", 1.5), ("B", "A", 2)])
+        directed.add_node("C")
+        restored.from_edge_table(directed.to_edge_table())
+        self.assertTrue(restored.directed)
+        self.assertEqual(restored.adj_list, {"A": {"B": 1.5}, "B": {"A": 2}, "C": {}})
+
+    def test_to_compact_matches_graph(self):
+        """Test that the CSR built from the table answers like the one built from the graph."""
+        rng = random.Random(3)
+        for directed in (False, True):
+            graph = Graph(directed=directed)
+            nodes = [f"N{i}" for i in range(40)]
+            graph.add_edges_from((rng.choice(nodes), rng.choice(nodes), rng.randint(0, 9)) for _ in range(90))
+            compact = graph.to_edge_table().to_compact()
+            expected = graph.to_compact()
+            self.assertEqual(compact.directed, directed)
+            self.assertEqual(list(compact.offsets), list(expected.offsets))
+            self.assertEqual(compact.num_edges, expected.num_edges)
+            for source in range(compact.num_nodes):
+                self.assertEqual(sorted(compact.neighbours(source)), sorted(expected.neighbours(source)))
+
+    def test_half_the_size_of_csr(self):
+        """Test that the table columns are about half the size of the CSR columns."""
+        graph = Graph()
+        graph.add_edges_from((f"N{i}", f"N{(i + step) % 2000}", step) for i in range(2000) for step in (1, 7, 31))
+        table = graph.to_edge_table()
+        compact = graph.to_compact()
+        table_bytes = sum(sys.getsizeof(column) for column in (table.sources, table.targets, table.weights))
+        csr_bytes = sum(sys.getsizeof(column) for column in (compact.offsets, compact.targets, compact.weights))
+        self.assertLess(table_bytes, csr_bytes * 0.7)
+
+if __name__ == '__main__':
+    unittest.main()
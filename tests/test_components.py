@@ -0,0 +1,108 @@
+import unittest
+import random
+from src.graph_ops.components import UnionFind, build_union_find
+from src.graph_ops.graph import Graph
+
+
+class TestUnionFind(unittest.TestCase):
+
+    def test_union_and_find(self):
+        """Test merging sets and counting what is left."""
+        components = UnionFind(["A", "B", "C", "D"])
+        self.assertEqual(components.count, 4)
+        self.assertTrue(components.union("A", "B"))
+        self.assertTrue(components.union("C", "B"))
+        self.assertFalse(components.union("A", "C"))
+        self.assertEqual(components.count, 2)
+        self.assertTrue(components.connected("A", "C"))
+        self.assertFalse(components.connected("A", "D"))
+        self.assertEqual(components.size[components.find("A")], 3)
+
+    def test_groups_largest_first(self):
+        """Test that groups keep insertion order and come largest first."""
+        components = build_union_find({"A": {"C": 1}, "B": {}, "C": {"A": 1, "D": 1}, "D": {"C": 1}})
+        self.assertEqual(components.groups(), [["A", "C", "D"], ["B"]])
+        self.assertIn("B", components)
+        self.assertNotIn("Z", components)
+
+    def test_add_is_idempotent(self):
+        """Test that adding a known node doesn't split it off again."""
+        components = UnionFind(["A", "B"])
+        components.union("A", "B")
+        components.add("A")
+        self.assertEqual(components.count, 1)
+        self.assertTrue(components.connected("A", "B"))
+
+
+class TestGraphConnectivity(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a graph with two components and an isolated node."""
+        self.graph = Graph()
+        self.graph.add_edges_from([("A", "B", 1), ("B", "C", 1), ("X", "Y", 1)])
+        self.graph.add_node("Z")
+
+    def test_components(self):
+        """Test listing the connected components."""
+        self.assertEqual(self.graph.components(), [["A", "B", "C"], ["X", "Y"], ["Z"]])
+        self.assertEqual(Graph().components(), [])
+
+    def test_connected(self):
+        """Test connectivity queries, including unknown nodes."""
+        self.assertTrue(self.graph.connected("A", "C"))
+        self.assertTrue(self.graph.connected("Z", "Z"))
+        self.assertFalse(self.graph.connected("A", "X"))
+        with self.assertRaises(ValueError):
+            self.graph.connected("A", "Q")
+
+    def test_additions_update_index(self):
+        """Test that additions extend the existing index instead of rebuilding it."""
+        self.assertFalse(self.graph.connected("C", "X"))
+        index = self.graph._components
+        self.graph.add_edge("C", "X", 2)
+        self.graph.add_node("W", {"Z": 1})
+        self.graph.add_edges_from([("Y", "V", 1)])
+        self.assertIs(self.graph._components, index)
+        self.assertTrue(self.graph.connected("A", "V"))
+        self.assertTrue(self.graph.connected("W", "Z"))
+        self.assertEqual(len(self.graph.components()), 2)
+
+    def test_removals_rebuild_index(self):
+        """Test that removing edges and nodes splits components on the next query."""
+        self.assertTrue(self.graph.connected("A", "C"))
+        self.graph.remove_edge("B", "C")
+        self.assertIsNone(self.graph._components)
+        self.assertFalse(self.graph.connected("A", "C"))
+        self.graph.add_edge("A", "C", 1)
+        self.graph.remove_node("A")
+        self.assertFalse(self.graph.connected("B", "C"))
+        self.graph.remove_nodes(["X"])
+        self.assertEqual(self.graph.components(), [["B"], ["C"], ["Y"], ["Z"]])
+        self.graph.from_dict({"P": {"Q": 1}, "Q": {"P": 1}})
+        self.assertEqual(self.graph.components(), [["P", "Q"]])
+
+    def test_matches_bfs_under_random_changes(self):
+        """Test that connected agrees with a bfs after random additions and removals."""
+        rng = random.Random(4)
+        graph = Graph()
+        nodes = [f"N{i}" for i in range(40)]
+        graph.add_edges_from((rng.choice(nodes), rng.choice(nodes), 1) for _ in range(25))
+        for step in range(60):
+            existing = list(graph.adj_list)
+            change = rng.random()
+            if change < 0.5:
+                graph.add_edges_from([(rng.choice(nodes), rng.choice(nodes), 1)])
+            elif change < 0.8 and existing:
+                node = rng.choice(existing)
+                if graph.adj_list[node]:
+                    graph.remove_edge(node, rng.choice(list(graph.adj_list[node])))
+            elif existing:
+                graph.remove_node(rng.choice(existing))
+            existing = list(graph.adj_list)
+            for _ in range(5):
+                a, b = rng.choice(existing), rng.choice(existing)
+                self.assertEqual(graph.connected(a, b), graph.bfs(a, b, bidirectional=True).found, (step, a, b))
+
+
+if __name__ == '__main__':
+    unittest.main()
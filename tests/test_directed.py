@@ -0,0 +1,163 @@
+import unittest
+import random
+from src.graph_ops.graph import Graph
+from tests.helpers import GraphFileTestCase
+
+
+class TestDirectedGraph(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a small directed dependency graph."""
+        #   A --1--> B --2--> C
+        #   |                 ^
+        #   +-------5---------+      D --1--> A
+        self.graph = Graph(directed=True)
+        for node in ["A", "B", "C", "D"]:
+            self.graph.add_node(node)
+        self.graph.add_edge("A", "B", 1)
+        self.graph.add_edge("B", "C", 2)
+        self.graph.add_edge("A", "C", 5)
+        self.graph.add_edge("D", "A", 1)
+
+    def test_edges_stored_once(self):
+        """Test that edges are only stored under the node they leave."""
+        self.assertEqual(self.graph.adj_list, {"A": {"B": 1, "C": 5}, "B": {"C": 2}, "C": {}, "D": {"A": 1}})
+        self.assertEqual(list(self.graph.edges()), [("A", "B", 1), ("A", "C", 5), ("B", "C", 2), ("D", "A", 1)])
+        self.assertEqual(self.graph.to_compact().num_edges, 4)
+
+    def test_edge_messages(self):
+        """Test the messages of directed edge changes."""
+        self.assertEqual(self.graph.add_edge("C", "A", 2), "Edge from C to A added with cost 2")
+        self.assertEqual(self.graph.add_edge("C", "A", 3), "Edge from C to A updated with cost 3")
+        self.assertEqual(self.graph.remove_edge("C", "A"), "Edge from C to A removed.")
+        self.assertEqual(self.graph.adj_list["A"], {"B": 1, "C": 5})
+
+    def test_searches_follow_direction(self):
+        """Test that searches only move along edges, not against them."""
+        self.assertEqual(self.graph.ucs("D", "C").path, ["D", "A", "B", "C"])
+        self.assertFalse(self.graph.ucs("C", "A").found)
+        self.assertFalse(self.graph.bfs("C", "D").found)
+        for bidirectional in (False, True):
+            self.assertEqual(self.graph.ucs("A", "C", bidirectional=bidirectional).cost, 3)
+            self.assertFalse(self.graph.ucs("B", "A", bidirectional=bidirectional).found)
+        self.assertEqual(self.graph.bfs("D", "C", bidirectional=True).path, ["D", "A", "C"])
+        self.assertFalse(self.graph.bfs("C", "D", bidirectional=True).found)
+
+    def test_predecessors_built_lazily(self):
+        """Test that the in-edge index is only built when needed and then kept up to date."""
+        self.assertIsNone(self.graph._in_adj)
+        self.assertEqual(self.graph.predecessors("C"), {"B": 2, "A": 5})
+        self.assertIsNotNone(self.graph._in_adj)
+
+        self.graph.add_node("E", {"C": 1})
+        self.graph.add_edges_from([("F", "E", 2)])
+        self.graph.add_edge("C", "D", 4)
+        self.graph.remove_edge("A", "C")
+        self.assertEqual(self.graph.predecessors("C"), {"B": 2, "E": 1})
+        self.assertEqual(self.graph.predecessors("E"), {"F": 2})
+        self.assertEqual(self.graph.predecessors("F"), {})
+        with self.assertRaises(ValueError):
+            self.graph.predecessors("Z")
+
+        index = self.graph._in_adj
+        self.graph._in_adj = None
+        self.assertEqual(self.graph._reverse_adjacency(), index)
+
+    def test_remove_node_drops_incoming_edges(self):
+        """Test that removing a node removes the edges pointing at it."""
+        self.graph.remove_node("C")
+        self.assertEqual(self.graph.adj_list, {"A": {"B": 1}, "B": {}, "D": {"A": 1}})
+        self.assertEqual(self.graph.predecessors("B"), {"A": 1})
+        self.graph.remove_nodes(["A", "B"])
+        self.assertEqual(self.graph.adj_list, {"D": {}})
+        self.assertEqual(self.graph.predecessors("D"), {})
+        self.assertEqual(self.graph.num_nodes, 1)
+
+    def test_remove_node_with_self_loop(self):
+        """Test removing a node with an edge to itself once the in-edge index exists."""
+        self.graph.add_node("E", {"E": 1, "A": 2})
+        self.assertEqual(self.graph.predecessors("E"), {"E": 1})
+        self.assertEqual(self.graph.remove_node("E"), "E removed from the graph")
+        self.assertNotIn("E", self.graph.predecessors("A"))
+        self.assertNotIn("E", self.graph._in_adj)
+
+    def test_reverse_shortest_paths(self):
+        """Test costs to a node along incoming edges."""
+        tree = self.graph.shortest_paths("C", reverse=True)
+        self.assertEqual(tree.distances, {"C": 0, "B": 2, "A": 3, "D": 4})
+        self.assertEqual(tree.path_to("D"), ["C", "B", "A", "D"])
+        self.assertEqual(self.graph.shortest_paths("C").distances, {"C": 0})
+
+    def test_heuristic_check_uses_costs_to_target(self):
+        """Test that the admissibility check measures the cost of reaching the target."""
+        self.assertEqual(self.graph.heuristic_violations("C", lambda node, target: 0), [])
+        self.assertIn(("D", 5, 4), self.graph.heuristic_violations("C", lambda node, target: 5))
+
+    def test_landmarks_refused(self):
+        """Test that landmark bounds, which need symmetric costs, aren't built for directed graphs."""
+        self.assertEqual(self.graph.build_landmarks(2), "Landmarks need an undirected graph")
+        self.assertIsNone(self.graph.landmarks)
+
+    def test_components_ignore_direction(self):
+        """Test that connectivity treats edges as undirected."""
+        self.graph.add_node("E")
+        self.assertTrue(self.graph.connected("C", "D"))
+        self.assertEqual(self.graph.components(), [["A", "B", "C", "D"], ["E"]])
+
+    def test_display(self):
+        """Test that display shows edge direction and incoming edges."""
+        self.assertEqual(self.graph.display_node("C"), "C  <- A(5) , B(2)\n")
+        self.assertEqual(self.graph.display_node("A"), "A  -> B(1) , C(5)\nA  <- D(1)\n")
+        result = self.graph.display_graph()
+        self.assertIn("D ---(1)--→ A", result)
+        self.assertNotIn("Isolated nodes", result)
+
+    def test_matches_undirected_on_mirrored_edges(self):
+        """Test that a directed graph holding both directions of every edge answers like an undirected one."""
+        rng = random.Random(5)
+        undirected = Graph()
+        nodes = [f"N{i}" for i in range(40)]
+        undirected.add_edges_from((rng.choice(nodes), rng.choice(nodes), rng.randint(1, 9)) for _ in range(80))
+        directed = Graph(directed=True)
+        directed.add_edges_from((start, end, cost) for start, neighbours in undirected.adj_list.items() for end, cost in neighbours.items())
+        for _ in range(20):
+            start, target = rng.choice(list(undirected.adj_list)), rng.choice(list(undirected.adj_list))
+            self.assertEqual(directed.ucs(start, target, bidirectional=True).cost, undirected.ucs(start, target).cost)
+
+    def test_bidirectional_matches_one_sided_on_random_graphs(self):
+        """Test that searching from both ends of a directed graph finds the same costs."""
+        rng = random.Random(6)
+        for _ in range(10):
+            graph = Graph(directed=True)
+            nodes = [f"N{i}" for i in range(30)]
+            graph.add_edges_from((rng.choice(nodes), rng.choice(nodes), rng.randint(0, 9)) for _ in range(70))
+            for _ in range(10):
+                start, target = rng.choice(list(graph.adj_list)), rng.choice(list(graph.adj_list))
+                one_sided = graph.ucs(start, target)
+                self.assertEqual(graph.ucs(start, target, bidirectional=True).cost, one_sided.cost)
+                hops = graph.bfs(start, target, bidirectional=True)
+                self.assertEqual(hops.found, one_sided.found)
+
+
+class TestDirectedPersistence(GraphFileTestCase):
+
+    def test_snapshot_keeps_direction(self):
+        """Test that saving and loading a directed graph keeps it directed, with its log replayed."""
+        graph = Graph(directed=True)
+        graph.add_edges_from([("A", "B", 1), ("B", "C", 2)])
+        graph.save()
+        graph.enable_wal()
+        graph.add_edge("C", "A", 3)
+        graph.remove_edge("A", "B")
+        graph.wal.sync()
+
+        loaded = Graph()
+        loaded.load()
+        self.assertTrue(loaded.directed)
+        self.assertEqual(loaded.adj_list, {"A": {}, "B": {"C": 2}, "C": {"A": 3}})
+        self.assertTrue(Graph.load_compact().directed)
+        self.assertFalse(Graph.load_compact().ucs("C", "A").found)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,11 @@ import unittest
 import tempfile
 import os
 import json
+import io
+from unittest.mock import patch
 from src.graph_ops.graph import Graph
+from src.graph_ops.results import SearchResult
+from src.graph_ops.shell import format_result
 
 
 class TestGraph(unittest.TestCase):
@@ -69,6 +73,34 @@ class TestGraph(unittest.TestCase):
         self.assertNotIn("B", self.graph.adj_list["C"])
         self.assertEqual(self.graph.num_nodes, 2)
     
+    def test_remove_node_with_self_loop(self):
+        """Test removing a node with an edge to itself, as add_node or a loaded file can create."""
+        self.graph.add_node("A", {"A": 1, "B": 2})
+        self.assertEqual(self.graph.remove_node("A"), "A removed from the graph")
+        self.assertEqual(self.graph.adj_list, {"B": {}})
+        self.graph.add_node("C", {"C": 1})
+        self.assertEqual(self.graph.remove_nodes(["C", "B"]), "2 nodes removed from the graph")
+        self.assertEqual(self.graph.adj_list, {})
+
+    def test_remove_nodes_bulk(self):
+        """Test removing several nodes in one call."""
+        for node in ["A", "B", "C", "D"]:
+            self.graph.add_node(node)
+        self.graph.add_edge("A", "B", 1)
+        self.graph.add_edge("B", "C", 1)
+        self.graph.add_edge("C", "D", 1)
+        self.graph.add_edge("A", "D", 1)
+        
+        result = self.graph.remove_nodes(["B", "C", "Z"])
+        self.assertEqual(result, "2 nodes removed from the graph, 1 not found")
+        self.assertEqual(self.graph.adj_list, {"A": {"D": 1}, "D": {"A": 1}})
+        self.assertEqual(self.graph.num_nodes, 2)
+        
+        result = self.graph.remove_nodes(iter(["A", "D"]))
+        self.assertEqual(result, "2 nodes removed from the graph")
+        self.assertEqual(self.graph.adj_list, {})
+        self.assertEqual(self.graph.num_nodes, 0)
+    
     def test_check_edge_valid(self):
         """Test check_edge with valid nodes."""
         self.graph.add_node("A")
@@ -127,6 +159,54 @@ class TestGraph(unittest.TestCase):
         result = self.graph.add_edge("A", "Z", 5)
         self.assertEqual(result, "Z doesn't exist")
     
+    def test_add_edges_from(self):
+        """Test bulk edge insertion with node creation and summary stats."""
+        self.graph.add_node("A")
+        stats = self.graph.add_edges_from([("A", "B", 2), ("B", "C"), ("C", "C", 1), ("B", "A", 5)])
+        self.assertEqual(stats, {"edges_added": 2, "edges_updated": 1, "nodes_created": 2, "skipped": 1})
+        self.assertEqual(self.graph.adj_list, {"A": {"B": 5}, "B": {"A": 5, "C": 0}, "C": {"B": 0}})
+        self.assertEqual(self.graph.num_nodes, 3)
+    
+    def test_add_edges_from_file(self):
+        """Test streaming CSV and TSV edge lists."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, "edges.csv")
+            with open(csv_path, "w") as f:
+                f.write("start,end,cost\nA,B,3\n\n# a comment\nB, C ,1.5\nC,D\n")
+            stats = self.graph.add_edges_from_file(csv_path, header=True, default_cost=7)
+            self.assertEqual(stats, {"edges_added": 3, "edges_updated": 0, "nodes_created": 4, "skipped": 0})
+            self.assertEqual(self.graph.adj_list["B"], {"A": 3, "C": 1.5})
+            self.assertEqual(self.graph.adj_list["D"], {"C": 7})
+            
+            tsv_path = os.path.join(temp_dir, "edges.tsv")
+            with open(tsv_path, "w") as f:
+                f.write("D\tE\t4\n")
+            self.graph.add_edges_from_file(tsv_path)
+            self.assertEqual(self.graph.adj_list["E"], {"D": 4})
+            
+            bad_path = os.path.join(temp_dir, "bad.csv")
+            with open(bad_path, "w") as f:
+                f.write("A,B,1,extra\n")
+            with self.assertRaises(ValueError):
+                self.graph.add_edges_from_file(bad_path)
+
+    def test_add_edges_from_file_failing_partway(self):
+        """Test that the edges read before a bad row are fully accounted for."""
+        self.graph.index_names()
+        self.assertEqual(self.graph.ucs("a", "b").error, "Start node a doesn't exist")
+        version = self.graph.version
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "edges.csv")
+            with open(path, "w") as f:
+                f.write("a,b,1\nb,c,2\nc,d,oops\n")
+            with self.assertRaises(ValueError):
+                self.graph.add_edges_from_file(path)
+        self.assertEqual(sorted(self.graph.adj_list), ["a", "b", "c"])
+        self.assertEqual(self.graph.num_nodes, 3)
+        self.assertGreater(self.graph.version, version)
+        self.assertEqual(self.graph.nodes_with_prefix(""), ["a", "b", "c"])
+        self.assertEqual(self.graph.ucs("a", "c").cost, 3)
+
     def test_remove_edge_basic(self):
         """Test removing a basic edge."""
         self.graph.add_node("A")
@@ -172,6 +252,53 @@ class TestGraph(unittest.TestCase):
         result = self.graph.display_graph()
         self.assertEqual(result, "No nodes to display")
     
+    def test_edges_listed_once(self):
+        """Test that each undirected edge is listed once with its ends in name order."""
+        self.graph.add_edges_from([("B", "A", 1), ("B", "C", 2), ("C", "A", 3)])
+        self.graph.add_node("Z")
+        self.assertEqual(sorted(self.graph.edges()), [("A", "B", 1), ("A", "C", 3), ("B", "C", 2)])
+        self.assertEqual(list(self.graph.edges(["A", "B", "Z"])), [("A", "B", 1)])
+        
+        result = self.graph.display_graph()
+        self.assertEqual(result.count("←--"), 3)
+        self.assertIn("A ←--(1)--→ B", result)
+        self.assertIn("Isolated nodes", result)
+    
+    def test_neighbourhood(self):
+        """Test collecting the nodes within a number of hops."""
+        self.graph.add_edges_from([("A", "B", 1), ("B", "C", 1), ("C", "D", 1), ("A", "E", 1)])
+        self.assertEqual(self.graph.neighbourhood("A"), {"A": 0, "B": 1, "E": 1})
+        self.assertEqual(self.graph.neighbourhood("A", 2), {"A": 0, "B": 1, "E": 1, "C": 2})
+        self.assertEqual(self.graph.neighbourhood("A", 0), {"A": 0})
+        with self.assertRaises(ValueError):
+            self.graph.neighbourhood("Z")
+    
+    def test_display_neighbourhood(self):
+        """Test drawing only the part of the graph around a node."""
+        self.graph.add_edges_from([("A", "B", 1), ("B", "C", 2), ("C", "D", 3)])
+        result = self.graph.display_graph("A", 1)
+        self.assertTrue(result.startswith("Within 1 hops of A:"))
+        self.assertIn("A ←--(1)--→ B", result)
+        self.assertNotIn("B ←--(2)--→ C", result)
+        self.assertIn("B ←--(2)--→ C", self.graph.display_graph("A", 2))
+        self.assertEqual(self.graph.display_graph("Z", 1), "Z doesn't exist")
+    
+    @patch("src.graph_ops.graph.DRAW_LIMIT", 5)
+    def test_display_large_graph_lists_pages(self):
+        """Test that graphs over the drawing limit are listed page by page instead of drawn."""
+        self.graph.add_edges_from((f"N{i}", f"N{i + 1}", i) for i in range(30))
+        self.graph.add_node("Z")
+        with patch("asciinet.graph_to_ascii") as draw:
+            pages = list(self.graph.display_pages(page_size=10))
+        draw.assert_not_called()
+        self.assertEqual(len(pages), 4)
+        self.assertTrue(pages[0].startswith("Edge weights (too many edges to draw):"))
+        lines = "\n".join(pages).splitlines()
+        self.assertEqual(len(lines), 32)
+        self.assertEqual(len(set(lines)), 32)
+        self.assertEqual(lines[-1], "  Z (isolated)")
+        self.assertEqual(self.graph.display_graph(), "\n".join(pages))
+    
     def test_to_dict_and_from_dict(self):
         """Test graph serialization and deserialization."""
         self.graph.add_node("A")
@@ -243,7 +370,7 @@ class TestGraphSearchAlgorithms(unittest.TestCase):
     
     def test_bfs_found_path(self):
         """Test BFS finding a path."""
-        result = self.graph.bfs("A", "D")
+        result = format_result(self.graph.bfs("A", "D"))
         # BFS should find A -> B -> D (ignores weights)
         self.assertIn("A", result)
         self.assertIn("D", result)
@@ -252,12 +379,12 @@ class TestGraphSearchAlgorithms(unittest.TestCase):
     def test_bfs_unreachable(self):
         """Test BFS with unreachable target."""
         self.graph.add_node("E")  # Isolated node
-        result = self.graph.bfs("A", "E")
+        result = format_result(self.graph.bfs("A", "E"))
         self.assertEqual(result, "E can't be reached")
     
     def test_dfs_found_path(self):
         """Test DFS finding a path."""
-        result = self.graph.dfs("A", "D")
+        result = format_result(self.graph.dfs("A", "D"))
         self.assertIn("A", result)
         self.assertIn("D", result)
         self.assertNotEqual(result, "D is unreachable")
@@ -265,12 +392,12 @@ class TestGraphSearchAlgorithms(unittest.TestCase):
     def test_dfs_unreachable(self):
         """Test DFS with unreachable target."""
         self.graph.add_node("E")  # Isolated node
-        result = self.graph.dfs("A", "E")
+        result = format_result(self.graph.dfs("A", "E"))
         self.assertEqual(result, "E is unreachable")
     
     def test_ucs_found_optimal_path(self):
         """Test UCS finding optimal path."""
-        result = self.graph.ucs("A", "D")
+        result = format_result(self.graph.ucs("A", "D"))
         # UCS should find A -> B -> D (cost 3) over A -> C -> D (cost 5)
         self.assertIn("Path: A -> B -> D", result)
         self.assertIn("Total cost: 3", result)
@@ -278,25 +405,73 @@ class TestGraphSearchAlgorithms(unittest.TestCase):
     def test_ucs_unreachable(self):
         """Test UCS with unreachable target."""
         self.graph.add_node("E")  # Isolated node
-        result = self.graph.ucs("A", "E")
+        result = format_result(self.graph.ucs("A", "E"))
         self.assertEqual(result, "E is unreachable")
     
     def test_ucs_nonexistent_start(self):
         """Test UCS with non-existent start node."""
-        result = self.graph.ucs("Z", "A")
+        result = format_result(self.graph.ucs("Z", "A"))
         self.assertEqual(result, "Start node Z doesn't exist")
     
     def test_ucs_nonexistent_target(self):
         """Test UCS with non-existent target node."""
-        result = self.graph.ucs("A", "Z")
+        result = format_result(self.graph.ucs("A", "Z"))
         self.assertEqual(result, "Target node Z doesn't exist")
     
     def test_ucs_same_start_target(self):
         """Test UCS with same start and target."""
-        result = self.graph.ucs("A", "A")
+        result = format_result(self.graph.ucs("A", "A"))
         self.assertIn("Path: A", result)
         self.assertIn("Total cost: 0", result)
 
+    
+    def test_searches_without_trace(self):
+        """Test that searches never print and tracing only adds the recorded steps."""
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            traced = [
+                self.graph.bfs("A", "D", trace=True),
+                self.graph.dfs("A", "D", trace=True),
+                self.graph.ucs("A", "D", trace=True),
+            ]
+            quiet = [
+                self.graph.bfs("A", "D"),
+                self.graph.dfs("A", "D"),
+                self.graph.ucs("A", "D"),
+            ]
+        self.assertEqual(quiet, traced)
+        self.assertEqual(stdout.getvalue(), "")
+        for result in traced:
+            self.assertTrue(result.trace)
+        for result in quiet:
+            self.assertIsNone(result.trace)
+    
+    def test_search_results_are_structured(self):
+        """Test the fields of the result objects returned by the searches."""
+        result = self.graph.ucs("A", "D")
+        self.assertIsInstance(result, SearchResult)
+        self.assertEqual((result.algorithm, result.start, result.target), ("ucs", "A", "D"))
+        self.assertEqual(result.path, ["A", "B", "D"])
+        self.assertEqual(result.cost, 3)
+        self.assertIsNone(result.error)
+        self.assertTrue(result.found)
+        self.assertGreater(result.explored, 0)
+        self.assertGreaterEqual(result.elapsed, 0)
+        
+        self.assertEqual(self.graph.bfs("A", "D").path, ["A", "B", "C", "D"])
+        self.assertIsNone(self.graph.bfs("A", "D").cost)
+        self.assertEqual(self.graph.ucs("A", "D", bidirectional=True).algorithm, "bidirectional_ucs")
+        self.assertFalse(self.graph.dfs("A", "E").found)
+        self.assertEqual(self.graph.ucs("Z", "A").error, "Start node Z doesn't exist")
+        self.assertFalse(self.graph.ucs("Z", "A").found)
+        with self.assertRaises(AttributeError):
+            result.note = "slots keep results small"
+    
+    def test_search_engines_return_structured_results(self):
+        """Test the trace-free search engines return explored order and paths."""
+        self.assertEqual(self.graph._bfs_search("A", "D"), ["A", "B", "C", "D"])
+        self.assertEqual(self.graph._dfs_search("A", "D"), ["A", "B", "D"])
+        self.assertEqual(self.graph._ucs_search("A", "D"), (["A", "B", "D"], 3))
+        self.assertIsNone(self.graph._ucs_search("A", "Z"))
 
 class TestGraphComplexScenarios(unittest.TestCase):
     
@@ -323,7 +498,7 @@ class TestGraphComplexScenarios(unittest.TestCase):
         self.assertEqual(graph.num_nodes, 10)
         
         # Test UCS finds optimal path from A to J
-        result = graph.ucs("A", "J")
+        result = format_result(graph.ucs("A", "J"))
         # Should find path through the chain rather than direct expensive edge
         self.assertIn("Total cost:", result)
         cost_part = result.split("Total cost: ")[1]
@@ -349,11 +524,11 @@ class TestGraphComplexScenarios(unittest.TestCase):
         graph.add_edge("Y", "Z", 2)
         
         # Test search within component
-        result = graph.ucs("A", "C")
+        result = format_result(graph.ucs("A", "C"))
         self.assertIn("Path: A -> B -> C", result)
         
         # Test search across components (should fail)
-        result = graph.ucs("A", "Z")
+        result = format_result(graph.ucs("A", "Z"))
         self.assertEqual(result, "Z is unreachable")
     
     def test_zero_weight_edges(self):
@@ -366,7 +541,7 @@ class TestGraphComplexScenarios(unittest.TestCase):
         graph.add_edge("A", "B", 0)
         graph.add_edge("B", "C", 0)
         
-        result = graph.ucs("A", "C")
+        result = format_result(graph.ucs("A", "C"))
         self.assertIn("Total cost: 0", result)
     
     def test_negative_and_high_weight_edges(self):
@@ -381,7 +556,7 @@ class TestGraphComplexScenarios(unittest.TestCase):
         graph.add_edge("A", "C", 1)
         graph.add_edge("C", "B", 1)
         
-        result = graph.ucs("A", "B")
+        result = format_result(graph.ucs("A", "B"))
         self.assertIn("Path: A -> C -> B", result)
         self.assertIn("Total cost: 2", result)
     
@@ -399,7 +574,7 @@ class TestGraphComplexScenarios(unittest.TestCase):
         graph.add_edge("B", "D", 1)
         graph.add_edge("C", "D", 1)
         
-        result = graph.ucs("A", "D")
+        result = format_result(graph.ucs("A", "D"))
         self.assertIn("Total cost: 3", result)
         # Should find one of the optimal paths
         self.assertTrue("A -> B -> D" in result or "A -> C -> D" in result)
@@ -413,7 +588,7 @@ class TestGraphEdgeCases(unittest.TestCase):
         graph.add_node("A")
         
         # Test search on single node
-        result = graph.ucs("A", "A")
+        result = format_result(graph.ucs("A", "A"))
         self.assertIn("Path: A", result)
         self.assertIn("Total cost: 0", result)
     
@@ -421,10 +596,10 @@ class TestGraphEdgeCases(unittest.TestCase):
         """Test operations on empty graph."""
         graph = Graph()
         
-        result = graph.ucs("A", "B")
+        result = format_result(graph.ucs("A", "B"))
         self.assertEqual(result, "Start node A doesn't exist")
         
-        result = graph.bfs("A", "B")
+        result = format_result(graph.bfs("A", "B"))
         self.assertEqual(result, "B can't be reached")
     
     def test_graph_after_node_removal(self):
@@ -440,7 +615,7 @@ class TestGraphEdgeCases(unittest.TestCase):
         graph.remove_node("B")
         
         # A and C should now be disconnected
-        result = graph.ucs("A", "C")
+        result = format_result(graph.ucs("A", "C"))
         self.assertEqual(result, "C is unreachable")
     
     def test_graph_with_self_loops_prevention(self):
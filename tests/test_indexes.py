@@ -0,0 +1,142 @@
+import unittest
+import random
+from src.graph_ops.graph import Graph
+from src.graph_ops.indexes import AttributeIndex, NameIndex
+from tests.helpers import GraphFileTestCase
+
+
+class TestNameIndex(unittest.TestCase):
+
+    def test_prefix_and_range(self):
+        """Test prefix and half-open range scans over sorted names."""
+        index = NameIndex(["svc-b", "db-1", "svc-a", "svc", "svd"])
+        self.assertEqual(index.prefix("svc-"), ["svc-a", "svc-b"])
+        self.assertEqual(index.prefix("svc"), ["svc", "svc-a", "svc-b"])
+        self.assertEqual(index.prefix("x"), [])
+        self.assertEqual(index.range("db", "svc-b"), ["db-1", "svc", "svc-a"])
+
+    def test_add_and_remove(self):
+        """Test keeping the names sorted through single and bulk changes."""
+        index = NameIndex(["b"])
+        index.add("a")
+        index.add_many(["d", "c"])
+        index.remove("b")
+        index.remove("z")
+        self.assertEqual(index.names, ["a", "c", "d"])
+        index.add_many(["f", "e"])
+        index.remove_many({"c", "f", "x"})
+        self.assertEqual(index.names, ["a", "d", "e"])
+
+
+class TestAttributeIndex(unittest.TestCase):
+
+    def test_move_between_values(self):
+        """Test that a node is only listed under its current value."""
+        index = AttributeIndex()
+        index.add("A", "eu")
+        index.add("B", "eu")
+        index.move("A", "eu", "us")
+        index.move("B", "eu", None)
+        self.assertEqual(index.lookup("us"), ["A"])
+        self.assertEqual(index.lookup("eu"), [])
+        self.assertNotIn("eu", index.nodes)
+
+
+class TestGraphIndexes(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a graph of services and databases."""
+        self.graph = Graph()
+        self.graph.add_edges_from([("svc-api", "db-main", 1), ("svc-auth", "db-main", 1), ("svc-web", "svc-api", 1)])
+        self.graph.set_attributes("region", {"svc-api": "eu", "svc-auth": "us", "db-main": "eu"})
+
+    def test_lookups_match_without_index(self):
+        """Test that indexed and scanning lookups give the same answers."""
+        queries = [
+            lambda: self.graph.nodes_with_prefix("svc-"),
+            lambda: self.graph.nodes_in_range("db", "svc-b"),
+            lambda: sorted(self.graph.select_nodes(("region", "==", "eu"))),
+        ]
+        scanned = [query() for query in queries]
+        self.assertEqual(self.graph.index_names(), "Name index holds 4 nodes")
+        self.assertEqual(self.graph.index_attribute("region"), "Index on region holds 2 distinct values")
+        self.assertEqual([query() for query in queries], scanned)
+        self.assertEqual(scanned, [["svc-api", "svc-auth", "svc-web"], ["db-main", "svc-api", "svc-auth"], ["db-main", "svc-api"]])
+
+    def test_indexes_follow_changes(self):
+        """Test that adding and removing nodes and attribute values updates the indexes."""
+        self.graph.index_names()
+        self.graph.index_attribute("region")
+        self.graph.add_node("svc-new", {"svc-db": 1})
+        self.graph.add_edges_from([("svc-batch", "db-main", 1)])
+        self.graph.remove_node("svc-api")
+        self.graph.remove_nodes(["svc-web"])
+        self.graph.set_attribute("svc-auth", "region", "eu")
+        self.graph.set_attributes("region", [("svc-new", "eu"), ("svc-batch", "us")])
+        self.graph.set_attribute("db-main", "region", None)
+        self.assertEqual(self.graph.nodes_with_prefix("svc-"), ["svc-auth", "svc-batch", "svc-db", "svc-new"])
+        self.assertEqual(self.graph.select_nodes(("region", "==", "eu")), ["svc-auth", "svc-new"])
+        self.assertEqual(self.graph.select_nodes(("region", "==", "us")), ["svc-batch"])
+
+    def test_index_before_values(self):
+        """Test that an attribute can be indexed before any node has it."""
+        self.graph.index_attribute("tier")
+        self.graph.set_attribute("svc-web", "tier", 1)
+        self.assertEqual(self.graph.select_nodes(("tier", "==", 1)), ["svc-web"])
+        with self.assertRaises(ValueError):
+            self.graph.select_nodes(("tier", "==", "gold"))
+
+    def test_indexes_survive_replacing_the_graph(self):
+        """Test that from_dict rebuilds the name index and keeps attributes indexed."""
+        self.graph.index_names()
+        self.graph.index_attribute("region")
+        self.graph.from_dict({"svc-x": {}, "db-y": {}})
+        self.assertEqual(self.graph.nodes_with_prefix("svc"), ["svc-x"])
+        self.graph.set_attribute("db-y", "region", "eu")
+        self.assertIn("region", self.graph.attributes.indexes)
+        self.assertEqual(self.graph.select_nodes(("region", "==", "eu")), ["db-y"])
+
+    def test_matches_scan_under_random_changes(self):
+        """Test that indexed lookups agree with scans after random changes."""
+        rng = random.Random(8)
+        names = [f"{kind}-{i}" for kind in ("svc", "db", "cache") for i in range(30)]
+        graph = Graph()
+        graph.index_names()
+        graph.index_attribute("region")
+        for _ in range(300):
+            change = rng.random()
+            node = rng.choice(names)
+            if change < 0.3:
+                graph.add_node(node)
+            elif change < 0.5:
+                graph.add_edges_from([(node, rng.choice(names), 1)])
+            elif change < 0.65:
+                graph.remove_node(node)
+            elif node in graph.adj_list:
+                graph.set_attribute(node, "region", rng.choice(["eu", "us", None]))
+        for prefix in ("svc-", "db-1", "cache-2", ""):
+            self.assertEqual(graph.nodes_with_prefix(prefix), sorted(node for node in graph.adj_list if node.startswith(prefix)))
+        for region in ("eu", "us"):
+            expected = sorted(node for node in graph.adj_list if graph.attribute(node, "region") == region)
+            self.assertEqual(sorted(graph.select_nodes(("region", "==", region))), expected)
+
+
+class TestIndexPersistence(GraphFileTestCase):
+
+    def test_reload_rebuilds_indexes(self):
+        """Test that loading into an indexed graph rebuilds its indexes from the files."""
+        graph = Graph()
+        graph.add_edges_from([("svc-a", "db-a", 1)])
+        graph.set_attribute("svc-a", "region", "eu")
+        graph.save()
+
+        loaded = Graph()
+        loaded.index_names()
+        loaded.index_attribute("region")
+        loaded.load()
+        self.assertEqual(loaded.name_index.names, ["db-a", "svc-a"])
+        self.assertEqual(loaded.attributes.indexes["region"].lookup("eu"), ["svc-a"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+import unittest
+import os
+import random
+from src.graph_ops.graph import Graph
+from src.graph_ops.landmarks import LANDMARK_SUFFIX, read_landmarks, select_landmarks, write_landmarks
+from src.graph_ops.shell import format_result
+from tests.helpers import GraphFileTestCase
+
+
+class TestLandmarks(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a small weighted graph with a separate component."""
+        self.graph = Graph()
+        self.graph.add_edges_from([
+            ("A", "B", 2), ("B", "C", 2), ("C", "D", 2), ("D", "E", 2),
+            ("A", "F", 1), ("F", "E", 9), ("B", "F", 1), ("X", "Y", 3),
+        ])
+
+    def test_farthest_point_selection(self):
+        """Test that landmarks spread out and cover every component."""
+        landmarks = select_landmarks(self.graph, 3)
+        self.assertEqual(len(landmarks.landmarks), 3)
+        self.assertEqual(len(set(landmarks.landmarks)), 3)
+        self.assertTrue({"X", "Y"} & set(landmarks.landmarks))
+        for landmark, column in zip(landmarks.landmarks, landmarks.columns):
+            for node, distance in self.graph.shortest_paths(landmark).distances.items():
+                self.assertEqual(column[landmarks.index[node]], distance)
+
+    def test_selection_stops_when_every_node_is_a_landmark(self):
+        """Test asking for more landmarks than there are nodes."""
+        self.assertEqual(len(select_landmarks(self.graph, 50).landmarks), self.graph.num_nodes)
+        self.assertEqual(select_landmarks(Graph(), 4).landmarks, [])
+
+    def test_bounds_are_admissible(self):
+        """Test that landmark bounds never exceed the true distance."""
+        self.graph.build_landmarks(2)
+        for target in self.graph.adj_list:
+            estimate = self.graph.landmarks.bound_to(target)
+            for node, distance in self.graph.shortest_paths(target).distances.items():
+                self.assertLessEqual(estimate(node, target), distance)
+                self.assertEqual(self.graph.landmarks.estimate(node, target), estimate(node, target))
+
+    def test_ucs_uses_landmarks_with_same_cost(self):
+        """Test that ALT-guided ucs returns the costs of plain ucs on random graphs."""
+        rng = random.Random(5)
+        for _ in range(10):
+            graph = Graph()
+            nodes = [f"N{i}" for i in range(60)]
+            graph.add_edges_from((rng.choice(nodes), rng.choice(nodes), rng.randint(0, 9)) for _ in range(120))
+            pairs = [(a, b) for a in ["N0", "N7"] for b in ["N30", "N59"] if a in graph.adj_list and b in graph.adj_list]
+            expected = {pair: graph._ucs_search(*pair) for pair in pairs}
+            graph.build_landmarks(4)
+            for (start, target), result in expected.items():
+                guided = format_result(graph.ucs(start, target, trace=False))
+                if result is None:
+                    self.assertEqual(guided, f"{target} is unreachable")
+                else:
+                    self.assertTrue(guided.endswith(f"Total cost: {result[1]}"))
+
+    def test_astar_with_landmarks(self):
+        """Test the landmarks heuristic in astar."""
+        self.assertIn("build them first", format_result(self.graph.astar("A", "E", "landmarks", trace=False)))
+        self.assertEqual(self.graph.build_landmarks(2).split(":")[0], "2 landmarks")
+        self.assertEqual(format_result(self.graph.astar("A", "E", "landmarks", trace=False)), "Path: A -> B -> C -> D -> E, Total cost: 8")
+        self.assertEqual(format_result(self.graph.astar("A", "X", "landmarks", trace=False)), "X is unreachable")
+
+    def test_mutations_invalidate(self):
+        """Test that any change to the graph drops the landmark tables."""
+        mutations = [
+            lambda graph: graph.add_edge("A", "E", 1),
+            lambda graph: graph.remove_edge("A", "B"),
+            lambda graph: graph.add_node("Z"),
+            lambda graph: graph.remove_node("C"),
+            lambda graph: graph.add_edges_from([("A", "Y", 1)]),
+            lambda graph: graph.from_dict({"P": {}}),
+        ]
+        for mutate in mutations:
+            self.graph.build_landmarks(2)
+            mutate(self.graph)
+            self.assertIsNone(self.graph._current_landmarks())
+        self.graph.build_landmarks(2)
+        self.graph.add_edges_from([])
+        self.assertIsNotNone(self.graph._current_landmarks())
+
+    def test_node_data_keeps_tables(self):
+        """Test that positions, attributes and weight channels leave the landmark tables alone."""
+        self.graph.build_landmarks(2)
+        landmarks = self.graph.landmarks
+        version = self.graph.version
+        self.graph.set_position("A", 0, 0)
+        self.graph.set_attribute("A", "region", "eu")
+        self.graph.set_attributes("capacity", {"B": 3})
+        self.graph.set_edge_weights("A", "B", {"time": 2})
+        self.graph.set_weight_column("time", [("B", "C", 1)])
+        self.assertIs(self.graph._current_landmarks(), landmarks)
+        # the path cache is still invalidated, since these can change search results
+        self.assertEqual(self.graph.version, version + 5)
+
+    def test_build_errors(self):
+        """Test invalid counts and negative costs."""
+        self.assertEqual(self.graph.build_landmarks(0), "Landmark count must be at least 1")
+        self.assertEqual(Graph().build_landmarks(), "No nodes to pick landmarks from")
+        self.graph.add_edge("A", "C", -1)
+        self.assertEqual(self.graph.build_landmarks(), "Landmarks need non-negative edge costs")
+        self.assertIsNone(self.graph.landmarks)
+
+
+class TestLandmarkPersistence(GraphFileTestCase):
+
+    def setUp(self):
+        """Point the graph file at a fresh temporary directory."""
+        super().setUp()
+        self.landmark_path = self.filename + LANDMARK_SUFFIX
+        self.graph = Graph()
+        self.graph.add_edges_from([("A", "B", 1), ("B", "C", 2), ("C", "ünï", 3)])
+
+    def test_saved_with_graph(self):
+        """Test that landmarks written by save are loaded back for the same graph."""
+        self.graph.build_landmarks(2)
+        self.graph.save()
+        self.assertTrue(os.path.exists(self.landmark_path))
+
+        loaded = self.reload()
+        self.assertIsNotNone(loaded._current_landmarks())
+        self.assertEqual(loaded.landmarks.landmarks, self.graph.landmarks.landmarks)
+        self.assertEqual(loaded.landmarks.columns, self.graph.landmarks.columns)
+        self.assertEqual(loaded.landmarks.names, list(self.graph.adj_list))
+
+    def test_stale_after_logged_change(self):
+        """Test that landmarks are not reused once a logged change is replayed on top."""
+        self.graph.build_landmarks(2)
+        self.graph.enable_wal()
+        self.graph.save()
+        self.assertIsNotNone(self.reload().landmarks)
+
+        self.graph.add_edge("A", "C", 1)
+        self.graph.wal.close()
+        self.assertIsNone(self.reload().landmarks)
+
+        # saving after the change removes the outdated tables
+        self.graph.save()
+        self.assertFalse(os.path.exists(self.landmark_path))
+
+    def test_attribute_change_keeps_file(self):
+        """Test that saving after an attribute change keeps the landmark file."""
+        self.graph.build_landmarks(2)
+        self.graph.save()
+        self.graph.set_attribute("A", "region", "eu")
+        self.graph.save()
+        self.assertTrue(os.path.exists(self.landmark_path))
+        self.assertIsNotNone(self.reload().landmarks)
+
+    def test_landmarks_built_after_logged_changes(self):
+        """Test that tables built on top of a log match the replayed graph."""
+        self.graph.enable_wal()
+        self.graph.add_edge("A", "C", 5)
+        self.graph.build_landmarks(2)
+        self.graph.save()
+        self.graph.wal.close()
+
+        loaded = self.reload()
+        self.assertIsNotNone(loaded.landmarks)
+        self.assertEqual(loaded.landmarks.columns, self.graph.landmarks.columns)
+
+    def test_unsaved_graph_not_matched(self):
+        """Test that tables are tied to the exact graph file they were saved with."""
+        self.graph.build_landmarks(2)
+        self.graph.save()
+        other = Graph()
+        other.add_edges_from([("A", "B", 1)])
+        other.save()
+        self.assertIsNone(self.reload().landmarks)
+
+    def test_truncated_file_is_ignored(self):
+        """Test that a damaged landmark file is treated as missing."""
+        landmarks = select_landmarks(self.graph, 2)
+        state = (1, 2, 3, 4)
+        write_landmarks(self.landmark_path, landmarks, state)
+        self.assertEqual(read_landmarks(self.landmark_path, state).columns, landmarks.columns)
+        self.assertIsNone(read_landmarks(self.landmark_path, (1, 2, 3, 5)))
+        self.assertIsNone(read_landmarks(self.landmark_path, None))
+        with open(self.landmark_path, "r+b") as f:
+            f.truncate(os.path.getsize(self.landmark_path) - 8)
+        self.assertIsNone(read_landmarks(self.landmark_path, state))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import math
+import random
+from src.graph_ops.graph import Graph
+import src.graph_ops.parallel as parallel
+
+
+class TestMultiSourceDistances(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a random weighted graph with a few isolated nodes."""
+        rng = random.Random(21)
+        self.graph = Graph()
+        nodes = [f"N{i}" for i in range(80)]
+        self.graph.add_edges_from((rng.choice(nodes), rng.choice(nodes), rng.randint(0, 9)) for _ in range(200))
+        for node in ["I1", "I2"]:
+            self.graph.add_node(node)
+        self.sources = list(self.graph.adj_list)
+
+    def expected_row(self, source, targets):
+        tree = self.graph.shortest_paths(source)
+        return [tree.distance(target) if target in tree else math.inf for target in targets]
+
+    def test_serial_rows_match_shortest_paths(self):
+        """Test that every row matches a single-source search."""
+        targets = list(self.graph.adj_list)
+        rows = dict(self.graph.multi_source_distances(self.sources, workers=1))
+        self.assertEqual(set(rows), set(self.sources))
+        for source, row in rows.items():
+            self.assertEqual(list(row), self.expected_row(source, targets))
+
+    def test_target_subset(self):
+        """Test that rows only hold the requested targets, in the order given."""
+        targets = ["N5", "I1", "N0"]
+        for source, row in self.graph.multi_source_distances(self.sources[:10], targets, workers=1):
+            self.assertEqual(list(row), self.expected_row(source, targets))
+
+    def test_process_pool_matches_serial(self):
+        """Test that sharding sources across worker processes gives the same rows."""
+        serial = dict(self.graph.multi_source_distances(self.sources, ["N1", "N2", "I2"], workers=1))
+        parallel = dict(self.graph.multi_source_distances(self.sources, ["N1", "N2", "I2"], workers=2, chunk_size=8))
+        self.assertEqual(parallel, serial)
+
+    def test_stopping_early_cleans_up(self):
+        """Test that a consumer can stop reading before every chunk is done."""
+        rows = self.graph.multi_source_distances(self.sources, workers=2, chunk_size=4)
+        source, row = next(rows)
+        self.assertIn(source, self.sources)
+        rows.close()
+
+    def test_shared_layout(self):
+        """Test that a worker view of the shared block matches the compact graph."""
+        compact = self.graph.to_compact()
+        memory, layout = parallel._share(compact)
+        try:
+            parallel._attach(memory.name, layout, None)
+            (source, row), = parallel._run_chunk([3])
+            self.assertEqual(source, 3)
+            self.assertEqual(list(row), list(compact.distances_from(3)))
+        finally:
+            # drop the worker's views before closing its mapping
+            parallel._graph = None
+            parallel._memory.close()
+            parallel._memory = None
+            memory.close()
+            memory.unlink()
+
+    def test_unknown_nodes(self):
+        """Test that unknown sources and targets are reported up front."""
+        with self.assertRaises(ValueError):
+            self.graph.multi_source_distances(["N0", "Z"])
+        with self.assertRaises(ValueError):
+            self.graph.multi_source_distances(["N0"], ["Z"])
+
+
+if __name__ == '__main__':
+    unittest.main()
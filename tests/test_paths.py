@@ -0,0 +1,74 @@
+import unittest
+import random
+from src.graph_ops.graph import Graph
+from src.graph_ops.paths import ShortestPathTree
+
+
+class TestShortestPathTree(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a weighted graph with a separate component."""
+        self.graph = Graph()
+        self.graph.add_edges_from([
+            ("A", "B", 1), ("B", "C", 2), ("A", "C", 5), ("C", "D", 1), ("B", "E", 7), ("X", "Y", 1),
+        ])
+
+    def test_distances_and_paths(self):
+        """Test costs and predecessor paths for every reachable node."""
+        tree = self.graph.shortest_paths("A")
+        self.assertIsInstance(tree, ShortestPathTree)
+        self.assertEqual(tree.distances, {"A": 0, "B": 1, "C": 3, "D": 4, "E": 8})
+        self.assertEqual(tree.parent, {"B": "A", "C": "B", "D": "C", "E": "B"})
+        self.assertEqual(tree.path_to("D"), ["A", "B", "C", "D"])
+        self.assertEqual(tree.path_to("A"), ["A"])
+        self.assertIsNone(tree.path_to("X"))
+        self.assertIsNone(tree.distance("X"))
+        self.assertNotIn("X", tree)
+        self.assertEqual(len(tree), 5)
+
+    def test_nodes_in_settled_order(self):
+        """Test that iterating the tree yields nodes by increasing cost."""
+        tree = self.graph.shortest_paths("A")
+        costs = [tree.distance(node) for node in tree]
+        self.assertEqual(costs, sorted(costs))
+        self.assertEqual(list(tree)[0], "A")
+
+    def test_cutoff(self):
+        """Test that nodes costing more than the cutoff are left out."""
+        tree = self.graph.shortest_paths("A", cutoff=3)
+        self.assertEqual(tree.distances, {"A": 0, "B": 1, "C": 3})
+        self.assertEqual(set(tree.parent), {"B", "C"})
+
+    def test_stops_once_targets_are_settled(self):
+        """Test that the search ends when every target has a final cost."""
+        tree = self.graph.shortest_paths("A", targets=["C", "B"])
+        self.assertEqual(tree.distances, {"A": 0, "B": 1, "C": 3})
+        tree = self.graph.shortest_paths("A", targets=["B", "X"])
+        self.assertEqual(set(tree), {"A", "B", "C", "D", "E"})
+
+    def test_missing_source(self):
+        """Test that an unknown source is reported."""
+        with self.assertRaises(ValueError):
+            self.graph.shortest_paths("Z")
+
+    def test_matches_ucs_on_random_graphs(self):
+        """Test that one tree answers the same queries as repeated ucs calls."""
+        rng = random.Random(9)
+        for _ in range(10):
+            graph = Graph()
+            nodes = [f"N{i}" for i in range(50)]
+            graph.add_edges_from((rng.choice(nodes), rng.choice(nodes), rng.randint(0, 9)) for _ in range(90))
+            source = next(iter(graph.adj_list))
+            tree = graph.shortest_paths(source)
+            for target in graph.adj_list:
+                expected = graph._ucs_search(source, target)
+                if expected is None:
+                    self.assertNotIn(target, tree)
+                    continue
+                self.assertEqual(tree.distance(target), expected[1])
+                path = tree.path_to(target)
+                self.assertEqual(sum(graph.adj_list[a][b] for a, b in zip(path, path[1:])), expected[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,57 @@
 import unittest
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
 import time
 import random
-from src.graph_ops.graph import Graph
+from src.graph_ops.graph import Graph, manhattan
+
+# Set GRAPH_OPS_LARGE_BENCHMARKS=1 to include the large (minutes, GBs of memory) sizes
+LARGE_BENCHMARKS = os.environ.get("GRAPH_OPS_LARGE_BENCHMARKS") == "1"
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def build_grid(size: int) -> Graph:
+    """Build a size x size grid graph with unit costs and nodes named "i,j"."""
+    graph = Graph()
+    for i in range(size):
+        for j in range(size):
+            graph.add_node(f"{i},{j}")
+    for i in range(size):
+        for j in range(size):
+            if j < size - 1:
+                graph.add_edge(f"{i},{j}", f"{i},{j+1}", 1)
+            if i < size - 1:
+                graph.add_edge(f"{i},{j}", f"{i+1},{j}", 1)
+    return graph
+
+
+def build_random_graph(num_nodes: int, num_edges: int, seed: int = 0) -> Graph:
+    """Build a random graph with nodes N0..N{num_nodes-1} and num_edges distinct edges."""
+    rng = random.Random(seed)
+    graph = Graph()
+    for i in range(num_nodes):
+        graph.add_node(f"N{i}")
+    added = 0
+    while added < num_edges:
+        a, b = rng.randrange(num_nodes), rng.randrange(num_nodes)
+        if a != b and f"N{b}" not in graph.adj_list[f"N{a}"]:
+            graph.add_edge(f"N{a}", f"N{b}", rng.randint(1, 10))
+            added += 1
+    return graph
+
+
+def fastest_run(run, repeats: int = 3):
+    """Run run() a few times and return its result with the fastest time: load on a machine only adds time."""
+    best = float("inf")
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - start_time)
+    return result, best
 
 
 class TestGraphPerformance(unittest.TestCase):
@@ -56,30 +106,198 @@ class TestGraphPerformance(unittest.TestCase):
         result = graph.ucs("0,0", f"{size-1},{size-1}")
         ucs_time = time.time() - start_time
         
-        self.assertIn("Path:", result)
-        self.assertIn(f"Total cost: {2 * (size - 1)}", result)  # Manhattan distance
+        self.assertTrue(result.found)
+        self.assertEqual(result.cost, 2 * (size - 1))  # Manhattan distance
         self.assertLess(ucs_time, 10.0)  # Should complete within 10 seconds
     
-    def test_binary_search_insertion_performance(self):
-        """Test performance of binary search insertion in priority queue."""
+    def test_ucs_heap_scaling_on_grids(self):
+        """Test that heap-based UCS scales close to linearly on growing grids."""
+        sizes = [50, 100, 200]
+        if LARGE_BENCHMARKS:
+            sizes += [500, 1000]
+        
+        per_node_times = []
+        for size in sizes:
+            graph = build_grid(size)
+            
+            start_time = time.perf_counter()
+            result = graph._ucs_search("0,0", f"{size-1},{size-1}")
+            ucs_time = time.perf_counter() - start_time
+            
+            self.assertIsNotNone(result)
+            path, cost = result
+            self.assertEqual(cost, 2 * (size - 1))
+            self.assertEqual(len(path), 2 * size - 1)
+            per_node_times.append(ucs_time / (size * size))
+            print(f"\nUCS {size}x{size} grid: {ucs_time:.3f}s")
+        
+        # O((V + E) log V): the cost per node may only grow by the log factor,
+        # a quadratic queue would grow it with the node count itself
+        self.assertLess(per_node_times[-1], per_node_times[0] * 4)
+    
+    def test_bfs_linear_scaling_on_random_graph(self):
+        """Test that BFS time grows linearly with edges, up to a 1M-edge random graph."""
+        timings = {}
+        for num_edges in (100_000, 1_000_000):
+            graph = build_random_graph(num_edges // 10, num_edges, seed=num_edges)
+            
+            # An absent target forces a full traversal of the start's component
+            start_time = time.perf_counter()
+            explored = graph._bfs_search("N0", "MISSING")
+            timings[num_edges] = time.perf_counter() - start_time
+            
+            self.assertIsNone(explored)
+            print(f"\nBFS over {num_edges} edges: {timings[num_edges]:.3f}s")
+        
+        # 10x the edges should cost about 10x the time; quadratic membership scans would be ~100x
+        self.assertLess(timings[1_000_000], timings[100_000] * 25)
+    
+    def test_bulk_node_removal(self):
+        """Test deleting half of a 200k-node graph, touching only the removed nodes' neighbours."""
+        graph = build_random_graph(200_000, 400_000, seed=9)
+        victims = [f"N{i}" for i in range(0, 200_000, 2)]
+        
+        start_time = time.perf_counter()
+        result = graph.remove_nodes(victims)
+        removal_time = time.perf_counter() - start_time
+        print(f"\nRemoved 100k of 200k nodes: {removal_time:.3f}s")
+        
+        self.assertEqual(result, "100000 nodes removed from the graph")
+        self.assertEqual(graph.num_nodes, 100_000)
+        for node, neighbours in graph.adj_list.items():
+            for neighbour in neighbours:
+                self.assertIn(node, graph.adj_list[neighbour])
+        # a scan of every node per removal would be 2e10 dict lookups
+        self.assertLess(removal_time, 5.0)
+    
+    def test_bulk_edge_ingestion_rate(self):
+        """Measure add_edges_from throughput against per-edge add_edge calls."""
+        rng = random.Random(10)
+        edges = [(f"N{rng.randrange(100_000)}", f"N{rng.randrange(100_000)}", rng.randint(1, 10)) for _ in range(500_000)]
+        
+        stats, bulk_time = fastest_run(lambda: Graph().add_edges_from(edges))
+        
         graph = Graph()
+        start_time = time.perf_counter()
+        for start, end, cost in edges:
+            if start != end:
+                graph.add_node(start)
+                graph.add_node(end)
+                graph.add_edge(start, end, cost)
+        single_time = time.perf_counter() - start_time
+        
+        print(f"\nadd_edges_from: {len(edges) / bulk_time:,.0f} edges/s, add_edge: {len(edges) / single_time:,.0f} edges/s")
+        self.assertEqual(stats["edges_added"] + stats["edges_updated"] + stats["skipped"], len(edges))
+        self.assertLess(bulk_time, single_time)
+    
+    def test_bidirectional_explored_reduction(self):
+        """Compare nodes expanded by one-sided and bidirectional BFS/UCS on grid and random graphs."""
+        size = 120
+        grid = build_grid(size)
+        random_graph = build_random_graph(50_000, 150_000, seed=11)
+        queries = [
+            ("grid", grid, f"{size // 4},{size // 2}", f"{3 * size // 4},{size // 2}"),
+            ("random", random_graph, "N1", "N2"),
+        ]
+        for name, graph, start, target in queries:
+            one_sided_bfs = len(graph._bfs_search(start, target))
+            stats = {}
+            graph._bidirectional_bfs_search(start, target, stats=stats)
+            bidirectional_bfs = stats["explored"]
+            
+            graph._ucs_search(start, target, stats=stats)
+            one_sided_ucs = stats["explored"]
+            graph._bidirectional_ucs_search(start, target, stats=stats)
+            bidirectional_ucs = stats["explored"]
+            
+            print(f"\n{name}: BFS {one_sided_bfs} -> {bidirectional_bfs}, UCS {one_sided_ucs} -> {bidirectional_ucs} nodes expanded")
+            # two balls of half the radius: about half the area on a grid, far less on an expander
+            limit = 0.75 if name == "grid" else 0.2
+            self.assertLess(bidirectional_bfs, one_sided_bfs * limit)
+            self.assertLess(bidirectional_ucs, one_sided_ucs * limit)
+    
+    def test_astar_against_ucs_on_grid(self):
+        """Compare nodes expanded and time taken by A* with Manhattan distance and UCS on a grid."""
+        size = 150
+        grid = build_grid(size)
+        start, target = "0,0", f"{size - 1},{size // 2}"
         
-        # Create a large priority queue scenario
-        queue = []
+        stats = {}
+        start_time = time.time()
+        expected = grid._ucs_search(start, target, stats=stats)
+        ucs_time = time.time() - start_time
+        ucs_explored = stats["explored"]
         
+        estimate = grid._position_heuristic(manhattan)
         start_time = time.time()
+        result = grid._astar_search(start, target, estimate, stats=stats)
+        astar_time = time.time() - start_time
+        astar_explored = stats["explored"]
+        
+        print(f"\nA* {astar_explored} nodes in {astar_time:.3f}s, UCS {ucs_explored} nodes in {ucs_time:.3f}s")
+        self.assertEqual(result[1], expected[1])
+        # expanded nodes, not timings, so a busy machine can't fail it
+        self.assertLess(astar_explored * 10, ucs_explored)
+    
+    def test_landmark_queries_on_random_graph(self):
+        """Compare nodes expanded by repeated ucs queries with and without landmark bounds."""
+        graph = build_random_graph(20_000, 60_000, seed=13)
+        rng = random.Random(13)
+        queries = [(f"N{rng.randrange(20_000)}", f"N{rng.randrange(20_000)}") for _ in range(50)]
         
-        # Insert many items (worst case: reverse sorted)
-        for i in range(1000, 0, -1):
-            item = (i, f"N{i}", [f"N{i}"])
-            graph._insert_sorted(queue, item)
+        start_time = time.time()
+        graph.build_landmarks(8)
+        build_time = time.time() - start_time
         
-        insertion_time = time.time() - start_time
+        plain_explored, guided_explored = 0, 0
+        start_time = time.time()
+        for start, target in queries:
+            stats = {}
+            expected = graph._ucs_search(start, target, stats=stats)
+            plain_explored += stats["explored"]
+            result = graph._astar_search(start, target, graph.landmarks.bound_to(target), stats=stats)
+            guided_explored += stats["explored"]
+            self.assertEqual(result[1], expected[1])
+        
+        print(f"\nlandmarks built in {build_time:.2f}s; {len(queries)} queries expanded {plain_explored} nodes plain, {guided_explored} with landmarks")
+        self.assertLess(guided_explored, plain_explored * 0.6)
+    
+    def test_shortest_path_tree_against_repeated_ucs(self):
+        """Compare one single-source search with a ucs query per target."""
+        graph = build_random_graph(20_000, 60_000, seed=17)
+        targets = [f"N{i}" for i in range(1, 20_000, 1000)]
         
-        # Verify queue is sorted
-        costs = [item[0] for item in queue]
-        self.assertEqual(costs, sorted(costs))
-        self.assertLess(insertion_time, 1.0)  # Should complete within 1 second
+        start_time = time.time()
+        costs = [graph._ucs_search("N0", target)[1] for target in targets]
+        repeated_time = time.time() - start_time
+        
+        start_time = time.time()
+        tree = graph.shortest_paths("N0", targets=targets)
+        tree_time = time.time() - start_time
+        
+        print(f"\n{len(targets)} targets: repeated ucs {repeated_time:.3f}s, one shortest-path tree {tree_time:.3f}s")
+        self.assertEqual([tree.distance(target) for target in targets], costs)
+        self.assertLess(tree_time * 5, repeated_time)
+    
+    @unittest.skipUnless(LARGE_BENCHMARKS and (os.cpu_count() or 1) >= 2, "set GRAPH_OPS_LARGE_BENCHMARKS=1 on a multi-core machine")
+    def test_multi_source_scaling_with_cores(self):
+        """Time a distance matrix for 10k sources with one process and with one per core."""
+        graph = build_random_graph(20_000, 60_000, seed=19)
+        sources = [f"N{i}" for i in range(0, 20_000, 2)]
+        targets = [f"N{i}" for i in range(1, 20_000, 20)]
+        cores = os.cpu_count()
+        
+        timings = {}
+        for workers in sorted({1, 2, cores}):
+            start_time = time.time()
+            rows = sum(1 for _ in graph.multi_source_distances(sources, targets, workers=workers, chunk_size=64))
+            timings[workers] = time.time() - start_time
+            self.assertEqual(rows, len(sources))
+        
+        for workers, elapsed in timings.items():
+            print(f"\n{workers} workers: {elapsed:.1f}s, speedup {timings[1] / elapsed:.2f}x")
+        # near-linear: at least 70% parallel efficiency on the largest pool
+        self.assertGreater(timings[1] / timings[cores], 0.7 * cores)
     
     def test_memory_usage_large_graph(self):
         """Test memory efficiency with large graphs."""
@@ -107,6 +325,153 @@ class TestGraphPerformance(unittest.TestCase):
         self.assertEqual(graph.num_nodes, num_nodes)
 
 
+class TestSnapshotPerformance(unittest.TestCase):
+    """Benchmarks of the binary snapshot format against JSON."""
+    
+    def test_snapshot_vs_json_load(self):
+        """Compare file size and load time of a 200k-edge graph in both formats."""
+        import tempfile
+        import src.graph_ops.graph as graph_module
+        from src.graph_ops.snapshot import open_snapshot, read_snapshot
+        
+        graph = build_random_graph(20_000, 200_000, seed=6)
+        original_filename = graph_module.FILENAME
+        with tempfile.TemporaryDirectory() as temp_dir:
+            try:
+                sizes, load_times = {}, {}
+                for fmt in ("json", "snapshot"):
+                    graph_module.FILENAME = os.path.join(temp_dir, f"graph.{fmt}")
+                    graph.save(fmt=fmt)
+                    sizes[fmt] = os.path.getsize(graph_module.FILENAME)
+                    
+                    start_time = time.perf_counter()
+                    loaded = Graph()
+                    loaded.load()
+                    load_times[fmt] = time.perf_counter() - start_time
+                    self.assertEqual(loaded.adj_list, graph.adj_list)
+                
+                compact, compact_time = fastest_run(lambda: read_snapshot(graph_module.FILENAME))
+                self.assertEqual(compact.num_edges, 200_000)
+                
+                mapped, mapped_time = fastest_run(lambda: open_snapshot(graph_module.FILENAME))
+                self.assertEqual(mapped.bfs("N0", "N1"), compact.bfs("N0", "N1"))
+                del mapped
+            finally:
+                graph_module.FILENAME = original_filename
+        
+        print(f"\nJSON: {sizes['json']} bytes, load {load_times['json']:.3f}s")
+        print(f"Snapshot: {sizes['snapshot']} bytes, load {load_times['snapshot']:.3f}s, compact load {compact_time:.3f}s, mmap open {mapped_time:.5f}s")
+        self.assertLess(sizes["snapshot"] * 2, sizes["json"])
+        self.assertLess(compact_time, load_times["json"])
+        # opening a mapped snapshot does no per-node work at all
+        self.assertLess(mapped_time, compact_time)
+
+def run_with_importtime(code: str, cwd: str) -> tuple[str, dict[str, int]]:
+    """Run code in a fresh interpreter under -X importtime; return its stdout and the cumulative import time of each module in microseconds."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [PROJECT_ROOT, env.get("PYTHONPATH")]))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=cwd, env=env, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:"):
+            _, cumulative, module = line.split("|")
+            if cumulative.strip().isdigit():
+                times[module.strip()] = int(cumulative)
+    return result.stdout, times
+
+
+class TestStartupPerformance(unittest.TestCase):
+    """Import time and shell startup, which the drawing and table libraries used to dominate."""
+    
+    def test_graph_import_time(self):
+        """Test that importing the graph module loads no drawing, table or process pool modules."""
+        _, times = run_with_importtime("import src.graph_ops.graph", PROJECT_ROOT)
+        print(f"\nsrc.graph_ops.graph import: {times['src.graph_ops.graph'] / 1000:.1f}ms")
+        for module in ("networkx", "asciinet", "tabulate", "src.graph_ops.parallel"):
+            self.assertNotIn(module, times)
+        self.assertLess(times["src.graph_ops.graph"], 250_000)
+    
+    def test_shell_startup_time(self):
+        """Test how long it takes to import and create a GraphShell in an empty directory."""
+        code = (
+            "import time\n"
+            "start = time.perf_counter()\n"
+            "from src.graph_ops.shell import GraphShell\n"
+            "GraphShell()\n"
+            "print(time.perf_counter() - start)\n"
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output, times = run_with_importtime(code, temp_dir)
+        startup_time = float(output)
+        print(f"\nGraphShell startup: {startup_time * 1000:.1f}ms")
+        for module in ("networkx", "asciinet", "tabulate"):
+            self.assertNotIn(module, times)
+        self.assertLess(startup_time, 0.5)
+
+
+def recursive_dfs(graph: Graph, start: str, target: str) -> list[str] | None:
+    """Reference copy of the former recursive DFS, kept to compare against."""
+    explored = [start]
+    
+    def visit(curr_node: str) -> bool:
+        if curr_node == target:
+            return True
+        for node in graph.adj_list[curr_node].keys():
+            if node not in explored:
+                explored.append(node)
+                if visit(node):
+                    return True
+        return False
+    
+    return explored if visit(start) else None
+
+
+class TestIterativeDFS(unittest.TestCase):
+    """Tests comparing the explicit-stack DFS with the former recursive one."""
+    
+    def build_path_graph(self, length: int) -> Graph:
+        graph = Graph()
+        for i in range(length):
+            graph.add_node(f"N{i}")
+        for i in range(length - 1):
+            graph.add_edge(f"N{i}", f"N{i+1}", 1)
+        return graph
+    
+    def test_matches_recursive_order(self):
+        """Test that the iterative DFS explores nodes in the same order."""
+        for seed in range(5):
+            graph = build_random_graph(200, 400, seed=seed)
+            for target in ("N199", "MISSING"):
+                self.assertEqual(graph._dfs_search("N0", target), recursive_dfs(graph, "N0", target))
+    
+    def test_deep_path_graph(self):
+        """Test DFS along a 5,000-node path, deeper than the recursion limit."""
+        graph = self.build_path_graph(5000)
+        
+        with self.assertRaises(RecursionError):
+            recursive_dfs(graph, "N0", "N4999")
+        
+        result = graph.dfs("N0", "N4999", trace=False)
+        self.assertEqual(result.path[:3], ["N0", "N1", "N2"])
+        self.assertEqual(result.path[-2:], ["N4998", "N4999"])
+    
+    def test_benchmark_against_recursive(self):
+        """Benchmark the iterative DFS against the recursive reference."""
+        graph = build_random_graph(800, 4000, seed=42)
+        
+        start_time = time.perf_counter()
+        expected = recursive_dfs(graph, "N0", "MISSING")
+        recursive_time = time.perf_counter() - start_time
+        
+        result, iterative_time = fastest_run(lambda: graph._dfs_search("N0", "MISSING"))
+        
+        self.assertIsNone(result)
+        self.assertIsNone(expected)
+        print(f"\nDFS recursive: {recursive_time:.4f}s, iterative: {iterative_time:.4f}s")
+        # set membership keeps the iterative version well ahead of the list scans
+        self.assertLess(iterative_time, recursive_time)
+
+
 class TestGraphStressTests(unittest.TestCase):
     """Stress tests for edge cases and robustness."""
     
@@ -123,7 +488,166 @@ class TestGraphStressTests(unittest.TestCase):
         # Display should handle this gracefully
         result = graph.display_graph()
         # Should not crash or hang
-        self.assertIsNone(result)  # display_graph prints, returns None
+        self.assertEqual(result.count("ISOLATED_"), num_isolated)
+    
+    def test_connected_queries_vs_bfs(self):
+        """Compare union-find connectivity queries with running a bfs per query."""
+        graph = build_random_graph(20000, 12000, seed=8)
+        rng = random.Random(8)
+        nodes = list(graph.adj_list)
+        pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(200)]
+        
+        def connected_queries():
+            # every run builds the index again
+            graph._components = None
+            return [graph.connected(a, b) for a, b in pairs]
+        answers, index_time = fastest_run(connected_queries)
+        start = time.perf_counter()
+        expected = [graph.bfs(a, b).found for a, b in pairs]
+        bfs_time = time.perf_counter() - start
+        print(f"\n200 connectivity queries: union-find {index_time:.4f}s (including build), bfs {bfs_time:.4f}s")
+        
+        self.assertEqual(answers, expected)
+        self.assertLess(index_time, bfs_time)
+    
+    def test_directed_storage_halves_adjacency(self):
+        """Compare adjacency memory of a one-way dependency graph held directed and undirected."""
+        edges = [(f"N{i}", f"N{j}", 1) for i in range(20000) for j in range(i + 1, min(i + 6, 20000))]
+        undirected, directed = Graph(), Graph(directed=True)
+        start = time.perf_counter()
+        undirected.add_edges_from(edges)
+        undirected_time = time.perf_counter() - start
+        start = time.perf_counter()
+        directed.add_edges_from(edges)
+        directed_time = time.perf_counter() - start
+        
+        undirected_entries = sum(map(len, undirected.adj_list.values()))
+        directed_entries = sum(map(len, directed.adj_list.values()))
+        undirected_bytes = sum(sys.getsizeof(neighbours) for neighbours in undirected.adj_list.values())
+        directed_bytes = sum(sys.getsizeof(neighbours) for neighbours in directed.adj_list.values())
+        table = undirected.to_edge_table()
+        print(f"\n{len(edges)} edges: undirected {undirected_bytes} bytes ({undirected_time:.3f}s), "
+              f"directed {directed_bytes} bytes ({directed_time:.3f}s), edge table {table.num_edges} rows")
+        
+        self.assertEqual(directed_entries * 2, undirected_entries)
+        self.assertEqual(table.num_edges, len(edges))
+        self.assertLess(directed_bytes, undirected_bytes * 0.75)
+        
+        # the in-edge index is only paid for by the first backward walk
+        self.assertIsNone(directed._in_adj)
+        self.assertEqual(directed.shortest_paths("N19999", reverse=True).distance("N0"), 4000)
+
+    def test_attribute_columns_smaller_than_dicts(self):
+        """Compare columnar node attributes with a dict of values per node."""
+        nodes = [f"N{i}" for i in range(100000)]
+        regions = ["eu", "us", "asia"]
+        graph = Graph()
+        graph.add_edges_from((nodes[i], nodes[i + 1], 1) for i in range(len(nodes) - 1))
+        start = time.perf_counter()
+        graph.set_attributes("capacity", ((node, i * 0.5) for i, node in enumerate(nodes)))
+        graph.set_attributes("region", ((node, regions[i % 3]) for i, node in enumerate(nodes)))
+        set_time = time.perf_counter() - start
+
+        per_node = {node: {"capacity": i * 0.5, "region": regions[i % 3]} for i, node in enumerate(nodes)}
+        dict_bytes = sum(sys.getsizeof(values) + sys.getsizeof(values["capacity"]) for values in per_node.values())
+        columns = graph.attributes.columns
+        column_bytes = sys.getsizeof(columns["capacity"].values) + sys.getsizeof(columns["region"].codes)
+        start = time.perf_counter()
+        selected = graph.select_nodes(("region", "==", "eu"))
+        select_time = time.perf_counter() - start
+        print(f"\n{len(nodes)} nodes: columns {column_bytes} bytes ({set_time:.3f}s to set), "
+              f"per-node dicts {dict_bytes} bytes, select {select_time:.3f}s")
+
+        self.assertEqual(len(selected), len(nodes) // 3 + 1)
+        self.assertLess(column_bytes * 10, dict_bytes)
+
+    def test_indexed_lookups_beat_scans(self):
+        """Compare prefix and attribute lookups with and without secondary indexes."""
+        graph = Graph()
+        graph.index_names()
+        graph.index_attribute("region")
+        kinds = ["svc", "db", "cache", "queue"]
+        start = time.perf_counter()
+        graph.add_edges_from((f"{kinds[i % 4]}-{i}", f"{kinds[(i + 1) % 4]}-{i + 1}", 1) for i in range(200000))
+        graph.set_attributes("region", ((node, "eu" if i % 50 == 0 else "us") for i, node in enumerate(graph.adj_list)))
+        build_time = time.perf_counter() - start
+
+        def lookups():
+            for _ in range(20):
+                found = graph.nodes_with_prefix("svc-1234"), graph.select_nodes(("region", "==", "eu"))
+            return found
+        (indexed, indexed_eu), index_time = fastest_run(lookups)
+        name_index, graph.name_index = graph.name_index, None
+        attribute_index = graph.attributes.indexes.pop("region")
+        start = time.perf_counter()
+        for _ in range(20):
+            scanned = graph.nodes_with_prefix("svc-1234")
+            scanned_eu = graph.select_nodes(("region", "==", "eu"))
+        scan_time = time.perf_counter() - start
+        print(f"\n{graph.num_nodes} nodes indexed while loading in {build_time:.3f}s: "
+              f"20 lookups {index_time:.4f}s indexed, {scan_time:.3f}s scanning")
+
+        self.assertEqual(indexed, scanned)
+        self.assertEqual(sorted(indexed_eu), sorted(scanned_eu))
+        self.assertEqual(len(name_index), graph.num_nodes)
+        self.assertEqual(len(attribute_index.lookup("eu")), len(scanned_eu))
+        self.assertLess(index_time * 10, scan_time)
+
+    def test_name_index_node_by_node(self):
+        """Test that adding nodes one at a time to an indexed graph stays about as cheap as without the index."""
+        names = [f"node-{(i * 7919) % 100000}" for i in range(100000)]
+        def add_nodes(indexed):
+            graph = Graph()
+            if indexed:
+                graph.index_names()
+            for name in names:
+                graph.add_node(name)
+            graph.nodes_with_prefix("node-99")
+            return graph
+        timings = []
+        for indexed in (False, True):
+            graph, elapsed = fastest_run(lambda: add_nodes(indexed))
+            timings.append(elapsed)
+        print(f"\n{len(names)} nodes added one at a time: {timings[0]:.3f}s plain, {timings[1]:.3f}s with a name index")
+
+        self.assertEqual(graph.nodes_with_prefix("node-9999"), ["node-9999", "node-99990", "node-99991", "node-99992", "node-99993",
+                                                             "node-99994", "node-99995", "node-99996", "node-99997", "node-99998", "node-99999"])
+        self.assertLess(timings[1], timings[0] * 3)
+
+    def test_name_index_bulk_removal(self):
+        """Test that removing many nodes from an indexed graph stays about as cheap as without the index."""
+        victims = [f"N{i}" for i in range(0, 200_000, 2)]
+        timings = []
+        for indexed in (False, True):
+            graph = build_random_graph(200_000, 400_000, seed=9)
+            if indexed:
+                graph.index_names()
+                graph.nodes_with_prefix("N1")
+            start = time.perf_counter()
+            graph.remove_nodes(victims)
+            timings.append(time.perf_counter() - start)
+        print(f"\nRemoved 100k of 200k nodes: {timings[0]:.3f}s plain, {timings[1]:.3f}s with a name index")
+
+        self.assertEqual(graph.nodes_with_prefix("N1999"), sorted(node for node in graph.adj_list if node.startswith("N1999")))
+        self.assertNotIn("N19998", graph.nodes_with_prefix("N1999"))
+        self.assertLess(timings[1], timings[0] * 3)
+
+    def test_display_large_graph(self):
+        """Test that displaying a 50k-edge graph streams its first page quickly."""
+        graph = build_random_graph(10000, 50000)
+        
+        start = time.perf_counter()
+        first_page = next(graph.display_pages())
+        first_page_time = time.perf_counter() - start
+        start = time.perf_counter()
+        listing = graph.display_graph()
+        full_time = time.perf_counter() - start
+        print(f"\n50k edges display: first page {first_page_time*1000:.2f}ms, full listing {full_time:.3f}s")
+        
+        self.assertIn("too many edges to draw", first_page)
+        self.assertEqual(listing.count("←--"), 50000)
+        self.assertLess(first_page_time, 0.1)
+        self.assertLess(full_time, 5.0)
     
     def test_deeply_connected_graph(self):
         """Test graph where every node connects to every other node."""
@@ -144,8 +668,8 @@ class TestGraphStressTests(unittest.TestCase):
         
         # Test UCS on fully connected graph
         result = graph.ucs("N0", f"N{num_nodes-1}")
-        self.assertIn("Path:", result)
-        self.assertIn("Total cost:", result)
+        self.assertTrue(result.found)
+        self.assertIsNotNone(result.cost)
     
     def test_linear_chain_graph(self):
         """Test very long linear chain of nodes."""
@@ -162,7 +686,7 @@ class TestGraphStressTests(unittest.TestCase):
         
         # Test UCS from start to end
         result = graph.ucs("N0", f"N{chain_length-1}")
-        self.assertIn(f"Total cost: {chain_length-1}", result)
+        self.assertEqual(result.cost, chain_length - 1)
     
     def test_random_graph_operations(self):
         """Test random sequence of graph operations."""
@@ -297,5 +821,54 @@ class TestGraphDataIntegrity(unittest.TestCase):
             graph_module.FILENAME = original_filename
 
 
+
+class TestServerPerformance(unittest.TestCase):
+    """Throughput and latency of the query server under a mixed load."""
+
+    def test_mixed_load(self):
+        """Measure QPS and p99 latency of searches mixed with edge updates, and ping latency under that load."""
+        from src.graph_ops.loadgen import call, mixed_workload, run_load
+        from src.graph_ops.server import GraphServer
+        nodes = [f"N{i}" for i in range(5000)]
+
+        async def one_at_a_time(count):
+            # the same requests answered in turn without sockets, as a baseline for the server's throughput
+            server = GraphServer(build_random_graph(5000, 20000), workers=1)
+            workload = mixed_workload(nodes, mutations=0.05, seed=2)
+            began = time.perf_counter()
+            for number in range(count):
+                await server.handle(json.dumps(workload(number)))
+            await server.close()
+            return count / (time.perf_counter() - began)
+
+        async def under_load():
+            server = GraphServer(build_random_graph(5000, 20000), workers=4)
+            await server.start(port=0)
+            port = server.address[1]
+            try:
+                load = asyncio.create_task(run_load(mixed_workload(nodes, mutations=0.05, seed=2), requests=1000, connections=16, port=port))
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                pings = []
+                while not load.done():
+                    began = time.perf_counter()
+                    await call(reader, writer, {"id": 0, "op": "ping"})
+                    pings.append(time.perf_counter() - began)
+                    await asyncio.sleep(0.01)
+                writer.close()
+                return await load, sorted(pings)
+            finally:
+                await server.close()
+        baseline_qps = asyncio.run(one_at_a_time(300))
+        report, pings = asyncio.run(under_load())
+        print(f"\n16 connections: {report.summary()}; one at a time: {baseline_qps:.0f} QPS; "
+              f"ping p50 {pings[len(pings) // 2] * 1000:.1f} ms over {len(pings)} pings")
+
+        self.assertEqual(report.requests, 1000)
+        self.assertEqual(report.errors, 0)
+        # sockets, JSON and locking may cost some throughput, but concurrency mustn't collapse it
+        self.assertGreater(report.qps, baseline_qps * 0.5)
+        # the event loop keeps answering instead of waiting for whole searches
+        self.assertLess(pings[len(pings) // 2], 0.1)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,225 @@
+import unittest
+import asyncio
+import json
+import os
+import tempfile
+import time
+from src.graph_ops.graph import Graph
+from src.graph_ops.loadgen import LoadReport, call, mixed_workload, run_load
+from src.graph_ops.server import GraphServer, ReadWriteLock
+
+
+def build_graph():
+    """A small weighted graph:  A --1-- B --2-- C,  A --5-- C,  D isolated."""
+    graph = Graph()
+    for node in ["A", "B", "C", "D"]:
+        graph.add_node(node)
+    graph.add_edge("A", "B", 1)
+    graph.add_edge("B", "C", 2)
+    graph.add_edge("A", "C", 5)
+    return graph
+
+
+class TestRequests(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        """Set up a server without a socket, answering requests directly."""
+        self.server = GraphServer(build_graph(), workers=2)
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def request(self, **fields):
+        return await self.server.handle(json.dumps(fields))
+
+    async def test_searches(self):
+        """Test that searches answer with their path, cost and request id."""
+        response = await self.request(id=7, op="ucs", start="A", target="C")
+        self.assertEqual(response["id"], 7)
+        self.assertTrue(response["ok"])
+        self.assertEqual(response["result"]["path"], ["A", "B", "C"])
+        self.assertEqual(response["result"]["cost"], 3)
+        response = await self.request(id=8, op="bfs", start="A", target="C", bidirectional=True)
+        self.assertEqual(response["result"]["path"], ["A", "C"])
+        response = await self.request(id=9, op="dfs", start="A", target="D")
+        self.assertFalse(response["result"]["found"])
+        response = await self.request(id=10, op="ucs", start="A", target="Z")
+        self.assertEqual(response["result"]["error"], "Target node Z doesn't exist")
+
+    async def test_search_options(self):
+        """Test weight and where options of the searches."""
+        self.server.graph.set_attributes("region", {"C": "eu"})
+        response = await self.request(op="ucs", start="A", target="C", where=["region", "==", "eu"])
+        self.assertEqual(response["result"]["path"], ["A", "C"])
+        response = await self.request(op="ucs", start="A", target="C", where="region")
+        self.assertEqual(response["error"], "where must be [attribute, comparison, value]")
+        response = await self.request(op="ucs", start="A", target="C", weight="time")
+        self.assertEqual(response["result"]["error"], "Unknown weight time")
+
+    async def test_mutations(self):
+        """Test that mutations change the served graph and answer with the graph's message."""
+        response = await self.request(id=1, op="add_edge", start="C", end="D", cost=1)
+        self.assertEqual(response["result"], "Edge added between C and D with cost 1")
+        self.assertEqual((await self.request(op="ucs", start="A", target="D"))["result"]["cost"], 4)
+        self.assertEqual((await self.request(op="remove_node", node="B"))["result"], "B removed from the graph")
+        self.assertEqual((await self.request(op="add_node", node="E"))["result"], "E added to the graph.")
+        self.assertEqual((await self.request(op="set_attribute", node="E", name="region", value="eu"))["result"], "E region set to eu")
+        self.assertEqual((await self.request(op="find", where=["region", "==", "eu"]))["result"], ["E"])
+        self.assertEqual((await self.request(op="stats"))["result"]["nodes"], 4)
+        response = await self.request(op="set_attribute", node="E", name="tags", value=[1])
+        self.assertEqual(response["result"], "Attribute values are numbers or labels, got [1]")
+        self.assertNotIn("tags", self.server.graph.attributes)
+        response = await self.request(op="add_edge", start="A", end="E", cost="cheap")
+        self.assertEqual(response["error"], "cost must be a number")
+        for line in (b'{"op": "add_edge", "start": "A", "end": "E", "cost": 1e400}', b'{"op": "add_edge", "start": "A", "end": "E", "cost": NaN}'):
+            self.assertEqual((await self.server.handle(line))["error"], "cost must be finite")
+        response = await self.server.handle(b'{"op": "set_attribute", "node": "E", "name": "capacity", "value": -1e400}')
+        self.assertEqual(response["error"], "value must be finite")
+        self.assertNotIn("E", self.server.graph.adj_list["A"])
+
+    async def test_find(self):
+        """Test prefix, range and limit lookups."""
+        self.assertEqual((await self.request(op="find", prefix=""))["result"], ["A", "B", "C", "D"])
+        self.assertEqual((await self.request(op="find", range=["B", "D"]))["result"], ["B", "C"])
+        self.assertEqual((await self.request(op="find", prefix="", limit=2))["result"], ["A", "B"])
+
+    async def test_bad_requests(self):
+        """Test the answers to malformed and unknown requests."""
+        self.assertEqual(await self.server.handle(b"{not json"), {"id": None, "ok": False, "error": "Invalid JSON"})
+        self.assertEqual((await self.server.handle(b"[1, 2]"))["error"], "Request must be a JSON object")
+        self.assertEqual((await self.request(id=3, op="teleport"))["error"], "Unknown operation teleport")
+        self.assertEqual((await self.request(id=4, op="ucs", start="A"))["error"], "Missing field target")
+        self.assertEqual((await self.request(id=5))["error"], "Missing field op")
+
+
+class TestConcurrency(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        """Start a server on a free local port, with a slow search to hold the lock."""
+        self.graph = build_graph()
+        self.server = GraphServer(self.graph, workers=4)
+        await self.server.start(port=0)
+        self.port = self.server.address[1]
+        original_dfs = self.graph.dfs
+
+        def slow_dfs(start, target, trace=False):
+            time.sleep(0.3)
+            return original_dfs(start, target, trace)
+        self.graph.dfs = slow_dfs
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_event_loop_answers_during_long_search(self):
+        """Test that a ping is answered while a long search runs in the pool."""
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write(b'{"id": 1, "op": "dfs", "start": "A", "target": "C"}\n{"id": 2, "op": "ping"}\n')
+        await writer.drain()
+        began = time.perf_counter()
+        first = json.loads(await reader.readline())
+        ping_time = time.perf_counter() - began
+        second = json.loads(await reader.readline())
+        writer.close()
+        # answers come back as they finish, not in request order
+        self.assertEqual((first["id"], first["result"]), (2, "pong"))
+        self.assertEqual(second["id"], 1)
+        self.assertTrue(second["result"]["found"])
+        self.assertLess(ping_time, 0.2)
+
+    async def test_event_loop_answers_during_save(self):
+        """Test that a slow save runs in the pool rather than holding up the event loop."""
+        saves = []
+
+        def slow_save():
+            time.sleep(0.3)
+            saves.append(True)
+        self.graph.save = slow_save
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write(b'{"id": 1, "op": "save"}\n{"id": 2, "op": "ping"}\n')
+        await writer.drain()
+        began = time.perf_counter()
+        first = json.loads(await reader.readline())
+        ping_time = time.perf_counter() - began
+        second = json.loads(await reader.readline())
+        writer.close()
+        self.assertEqual(first["id"], 2)
+        self.assertLess(ping_time, 0.2)
+        self.assertEqual((second["id"], second["result"], saves), (1, "Graph saved.", [True]))
+
+    async def test_mutation_waits_for_searches_in_flight(self):
+        """Test that a mutation only runs once the searches before it are done."""
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write(b'{"id": 1, "op": "dfs", "start": "A", "target": "C"}\n'
+                     b'{"id": 2, "op": "remove_node", "node": "C"}\n'
+                     b'{"id": 3, "op": "ucs", "start": "A", "target": "C"}\n')
+        await writer.drain()
+        answers = [json.loads(await reader.readline()) for _ in range(3)]
+        writer.close()
+        self.assertEqual([answer["id"] for answer in answers], [1, 2, 3])
+        self.assertTrue(answers[0]["result"]["found"])
+        self.assertEqual(answers[2]["result"]["error"], "Target node C doesn't exist")
+
+    async def test_unix_socket(self):
+        """Test serving the same protocol on a Unix socket."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "graph.sock")
+            server = GraphServer(self.graph)
+            await server.start(path=path)
+            try:
+                reader, writer = await asyncio.open_unix_connection(path)
+                response = await call(reader, writer, {"id": 1, "op": "ucs", "start": "A", "target": "C"})
+                writer.close()
+            finally:
+                await server.close()
+        self.assertEqual(response["result"]["cost"], 3)
+
+    async def test_read_write_lock(self):
+        """Test that a waiting writer goes before readers that arrive after it."""
+        lock = ReadWriteLock()
+        order = []
+
+        async def reader(name, hold):
+            async with lock.read():
+                order.append(name)
+                await asyncio.sleep(hold)
+
+        async def writer():
+            async with lock.write():
+                order.append("writer")
+
+        first = asyncio.create_task(reader("first", 0.05))
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(writer())
+        await asyncio.sleep(0)
+        late = asyncio.create_task(reader("late", 0))
+        await asyncio.gather(first, waiting, late)
+        self.assertEqual(order, ["first", "writer", "late"])
+
+
+class TestLoadGenerator(unittest.IsolatedAsyncioTestCase):
+
+    def test_report(self):
+        """Test throughput and nearest-rank percentiles."""
+        report = LoadReport(100, 1, 2.0, [i / 1000 for i in range(1, 101)])
+        self.assertEqual(report.qps, 50)
+        self.assertEqual(report.percentile(99), 0.099)
+        self.assertEqual(report.percentile(50), 0.05)
+        self.assertIn("50 QPS", report.summary())
+
+    async def test_run_load(self):
+        """Test that every request is sent and answered across the connections."""
+        server = GraphServer(build_graph())
+        await server.start(port=0)
+        try:
+            workload = mixed_workload(["A", "B", "C", "D"], mutations=0.2, seed=1)
+            report = await run_load(workload, requests=60, connections=4, port=server.address[1])
+        finally:
+            await server.close()
+        self.assertEqual(report.requests, 60)
+        self.assertEqual(report.errors, 0)
+        self.assertEqual(server.requests, 60)
+        self.assertEqual(report.latencies, sorted(report.latencies))
+
+
+if __name__ == '__main__':
+    unittest.main()
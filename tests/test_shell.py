@@ -59,6 +59,18 @@ class TestGraphShell(unittest.TestCase):
         output = self.capture_output(self.shell.do_remove_node, "NonExistent")
         self.assertIn("Node NonExistent not found", output)
     
+    def test_do_remove_nodes(self):
+        """Test remove_nodes shell command."""
+        self.shell.do_add_node("A")
+        self.shell.do_add_node("B")
+        self.shell.do_add_node("C")
+        output = self.capture_output(self.shell.do_remove_nodes, "A C")
+        self.assertIn("2 nodes removed from the graph", output)
+        self.assertEqual(list(self.shell.graph.adj_list), ["B"])
+        
+        output = self.capture_output(self.shell.do_remove_nodes, "")
+        self.assertIn("Usage: remove_nodes NODE [NODE ...]", output)
+    
     def test_do_add_edge_basic(self):
         """Test add_edge shell command."""
         self.shell.do_add_node("A")
@@ -80,8 +92,71 @@ class TestGraphShell(unittest.TestCase):
         self.shell.do_add_node("A")
         self.shell.do_add_node("B")
         output = self.capture_output(self.shell.do_add_edge, "A B invalid")
-        self.assertIn("Cost must be an integer", output)
-    
+        self.assertIn("Cost must be a number", output)
+
+    def test_do_add_edge_float_cost(self):
+        """Test that add_edge keeps fractional costs."""
+        self.shell.do_add_node("A")
+        self.shell.do_add_node("B")
+        output = self.capture_output(self.shell.do_add_edge, "A B 2.5")
+        self.assertIn("Edge added between A and B with cost 2.5", output)
+        self.assertEqual(self.shell.graph.adj_list["A"]["B"], 2.5)
+
+    def test_do_set_weight_and_ucs_by_weight(self):
+        """Test setting named weights and searching on one of them."""
+        for node in ["A", "B", "C", "D"]:
+            self.shell.do_add_node(node)
+        self.shell.do_add_edge("A B 1")
+        self.shell.do_add_edge("B C 1")
+        self.shell.do_add_edge("A C 5")
+        output = self.capture_output(self.shell.do_set_weight, "A C time=0.5 toll=3")
+        self.assertIn("Weights of A-C set: time=0.5, toll=3", output)
+        self.capture_output(self.shell.do_set_weight, "A B time=1")
+        self.capture_output(self.shell.do_set_weight, "B C time=1")
+        self.assertIn("Path: A -> C, Total cost: 0.5", self.capture_output(self.shell.do_ucs, "A C weight=time"))
+        self.assertIn("Path: A -> B -> C, Total cost: 2", self.capture_output(self.shell.do_ucs, "A C"))
+        self.assertIn("Unknown weight speed", self.capture_output(self.shell.do_ucs, "A C weight=speed"))
+        self.assertIn("No edge between A and D", self.capture_output(self.shell.do_set_weight, "A D time=1"))
+        self.assertIn("Usage: set_weight", self.capture_output(self.shell.do_set_weight, "A C time"))
+    
+    def test_do_set_attr_and_attrs(self):
+        """Test setting, showing and clearing node attributes."""
+        self.shell.do_add_node("A")
+        output = self.capture_output(self.shell.do_set_attr, "A region=eu capacity=2.5")
+        self.assertIn("A region set to eu", output)
+        self.assertIn("A capacity set to 2.5", output)
+        self.assertEqual(self.capture_output(self.shell.do_attrs, "A"), "  region = eu\n  capacity = 2.5\n")
+        self.assertIn("A capacity cleared", self.capture_output(self.shell.do_set_attr, "A capacity="))
+        self.assertIn("Attribute region holds labels", self.capture_output(self.shell.do_set_attr, "A region=3"))
+        self.assertIn("Usage: set_attr", self.capture_output(self.shell.do_set_attr, "A region"))
+        self.assertIn("B doesn't exist", self.capture_output(self.shell.do_attrs, "B"))
+
+    def test_do_find(self):
+        """Test finding nodes by prefix, range and attribute, with and without indexes."""
+        for node in ["svc-api", "svc-web", "db-main"]:
+            self.shell.do_add_node(node)
+        self.shell.do_set_attr("svc-api region=eu capacity=4")
+        self.shell.do_set_attr("db-main region=eu capacity=10")
+        for _ in range(2):
+            self.assertEqual(self.capture_output(self.shell.do_find, "svc-*"), "2 nodes\nsvc-api\nsvc-web\n")
+            self.assertIn("db-main\nsvc-api\n", self.capture_output(self.shell.do_find, "a..svc-b"))
+            self.assertIn("2 nodes", self.capture_output(self.shell.do_find, "region=eu"))
+            self.assertEqual(self.capture_output(self.shell.do_find, "capacity>=5"), "1 nodes\ndb-main\n")
+            self.capture_output(self.shell.do_index, "names")
+            self.capture_output(self.shell.do_index, "region")
+        self.assertEqual(self.capture_output(self.shell.do_index, ""), "Indexes: names, region\n")
+        self.assertIn("No nodes found", self.capture_output(self.shell.do_find, "x*"))
+        self.assertIn("Unknown attribute tier", self.capture_output(self.shell.do_find, "tier=gold"))
+        self.assertIn("Usage: find", self.capture_output(self.shell.do_find, "svc"))
+
+    def test_do_find_pages(self):
+        """Test that long find results are paged."""
+        self.shell.graph.add_edges_from((f"n{i:03}", f"n{i + 1:03}", 1) for i in range(120))
+        output = self.capture_output(self.shell.do_find, "n*")
+        self.assertIn("121 nodes\nn000\n", output)
+        self.assertIn("-- more: type more to continue --", output)
+        self.assertIn("n120", self.capture_output(self.shell.do_more, "") + self.capture_output(self.shell.do_more, ""))
+
     def test_do_add_edge_invalid_args(self):
         """Test add_edge shell command with invalid arguments."""
         output = self.capture_output(self.shell.do_add_edge, "A")
@@ -90,6 +165,23 @@ class TestGraphShell(unittest.TestCase):
         output = self.capture_output(self.shell.do_add_edge, "A B C D")
         self.assertIn("Usage: add_edge NODE1 NODE2 [COST]", output)
     
+    def test_do_import_edges(self):
+        """Test import_edges shell command."""
+        import os
+        import tempfile
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "edges.csv")
+            with open(path, "w") as f:
+                f.write("A,B,1\nB,C,2\nC,C,1\n")
+            output = self.capture_output(self.shell.do_import_edges, path)
+        self.assertIn("Imported 2 new edges, updated 0, created 3 nodes, skipped 1 self-loops", output)
+        self.assertEqual(self.shell.graph.adj_list["B"], {"A": 1, "C": 2})
+        
+        output = self.capture_output(self.shell.do_import_edges, "/nonexistent/edges.csv")
+        self.assertIn("Import failed", output)
+        output = self.capture_output(self.shell.do_import_edges, "")
+        self.assertIn("Usage: import_edges PATH", output)
+    
     def test_do_remove_edge(self):
         """Test remove_edge shell command."""
         self.shell.do_add_node("A")
@@ -126,6 +218,34 @@ class TestGraphShell(unittest.TestCase):
         self.assertIn("A", output)
         self.assertIn("B(3)", output)
     
+    def test_do_display_neighbourhood(self):
+        """Test display shell command for the nodes within some hops."""
+        self.shell.graph.add_edges_from([("A", "B", 1), ("B", "C", 2)])
+        output = self.capture_output(self.shell.do_display, "A 1")
+        self.assertIn("Within 1 hops of A", output)
+        self.assertNotIn("B ←--(2)--→ C", output)
+        output = self.capture_output(self.shell.do_display, "A far")
+        self.assertIn("Usage: display | display NODE | display NODE HOPS", output)
+    
+    @patch("src.graph_ops.graph.DRAW_LIMIT", 5)
+    def test_do_display_more(self):
+        """Test paging through a listing too long to draw."""
+        self.shell.graph.add_edges_from((f"N{i}", f"N{i + 1}", 1) for i in range(60))
+        output = self.capture_output(self.shell.do_display, "")
+        self.assertIn("too many edges to draw", output)
+        self.assertIn("type more to continue", output)
+        output = self.capture_output(self.shell.do_more, "")
+        self.assertIn("N59 ←--(1)--→ N60", output)
+        self.assertNotIn("type more to continue", output)
+        output = self.capture_output(self.shell.do_more, "")
+        self.assertIn("Nothing more to display", output)
+        
+        # a change in between ends the listing
+        self.capture_output(self.shell.do_display, "")
+        self.shell.graph.add_node("Z")
+        output = self.capture_output(self.shell.do_more, "")
+        self.assertIn("The graph changed, run display again", output)
+    
     def test_do_display_empty_graph(self):
         """Test display shell command on empty graph."""
         output = self.capture_output(self.shell.do_display, "")
@@ -143,6 +263,23 @@ class TestGraphShell(unittest.TestCase):
         self.assertIn("BFS for target C", output)
         self.assertIn("A -> B -> C", output)
     
+    def test_do_bidirectional_searches(self):
+        """Test the bidirectional option of the bfs and ucs shell commands."""
+        self.shell.do_add_node("A")
+        self.shell.do_add_node("B")
+        self.shell.do_add_node("C")
+        self.shell.do_add_edge("A B 1")
+        self.shell.do_add_edge("B C 1")
+        self.shell.do_add_edge("A C 5")
+        self.shell.do_trace("off")
+        
+        output = self.capture_output(self.shell.do_bfs, "A C bidirectional")
+        self.assertEqual(output, "A -> C\n")
+        output = self.capture_output(self.shell.do_ucs, "A C bidirectional")
+        self.assertEqual(output, "Path: A -> B -> C, Total cost: 2\n")
+        output = self.capture_output(self.shell.do_ucs, "A C sideways")
+        self.assertIn("Usage: ucs start target [bidirectional]", output)
+    
     def test_do_bfs_invalid_args(self):
         """Test BFS shell command with invalid arguments."""
         output = self.capture_output(self.shell.do_bfs, "A")
@@ -184,12 +321,149 @@ class TestGraphShell(unittest.TestCase):
         output = self.capture_output(self.shell.do_ucs, "A")
         self.assertIn("Usage: ucs start target", output)
     
+    def test_do_astar(self):
+        """Test A* shell command with positions and heuristic choice."""
+        self.shell.do_trace("off")
+        for node in ["A", "B", "C"]:
+            self.shell.do_add_node(node)
+        self.shell.do_add_edge("A B 1")
+        self.shell.do_add_edge("B C 1")
+        self.shell.do_add_edge("A C 5")
+        output = self.capture_output(self.shell.do_position, "A 0 0")
+        self.assertIn("A placed at (0.0, 0.0)", output)
+        self.shell.do_position("B 1 0")
+        self.shell.do_position("C 2 0")
+        
+        output = self.capture_output(self.shell.do_astar, "A C")
+        self.assertEqual(output, "Path: A -> B -> C, Total cost: 2\n")
+        output = self.capture_output(self.shell.do_astar, "A C euclidean check")
+        self.assertEqual(output, "Path: A -> B -> C, Total cost: 2\n")
+
+        # stretching B away from C makes its estimate exceed the edge cost
+        self.shell.do_position("B 9 0")
+        output = self.capture_output(self.shell.do_astar, "A C manhattan check")
+        self.assertIn("Inadmissible heuristic at B: estimate 7 > actual 1", output)
+
+    def test_do_astar_invalid_args(self):
+        """Test A* and position shell commands with invalid arguments."""
+        output = self.capture_output(self.shell.do_astar, "A")
+        self.assertIn("Usage: astar start target", output)
+        output = self.capture_output(self.shell.do_position, "A 1")
+        self.assertIn("Usage: position NODE X Y", output)
+        output = self.capture_output(self.shell.do_position, "A x y")
+        self.assertIn("Usage: position NODE X Y", output)
+    
+    def test_do_landmarks(self):
+        """Test building landmarks from the shell and using them in searches."""
+        self.shell.do_trace("off")
+        self.shell.graph.add_edges_from([("A", "B", 1), ("B", "C", 1), ("A", "C", 5)])
+        output = self.capture_output(self.shell.do_landmarks, "2")
+        self.assertTrue(output.startswith("2 landmarks: "))
+        output = self.capture_output(self.shell.do_astar, "A C landmarks")
+        self.assertEqual(output, "Path: A -> B -> C, Total cost: 2\n")
+        output = self.capture_output(self.shell.do_ucs, "A C")
+        self.assertEqual(output, "Path: A -> B -> C, Total cost: 2\n")
+        output = self.capture_output(self.shell.do_landmarks, "many")
+        self.assertIn("Usage: landmarks [count]", output)
+    
+    def test_do_cache_stats(self):
+        """Test the search cache shell commands."""
+        self.shell.do_trace("off")
+        self.shell.graph.add_edges_from([("A", "B", 1)])
+        self.capture_output(self.shell.do_ucs, "A B")
+        self.capture_output(self.shell.do_ucs, "A B")
+        output = self.capture_output(self.shell.do_cache_stats, "")
+        self.assertIn("1 hits, 1 misses (hit rate 50.0%)", output)
+        self.assertIn("1/128 entries", output)
+        
+        output = self.capture_output(self.shell.do_cache_size, "0")
+        self.assertIn("up to 0 results", output)
+        output = self.capture_output(self.shell.do_cache_stats, "clear")
+        self.assertIn("0 hits, 0 misses (hit rate n/a), 0 invalidations, 0/0 entries", output)
+        for size in ("big", "-5"):
+            output = self.capture_output(self.shell.do_cache_size, size)
+            self.assertIn("Usage: cache_size N", output)
+        self.assertEqual(self.shell.graph.cache.maxsize, 0)
+        output = self.capture_output(self.shell.do_cache_stats, "reset")
+        self.assertIn("Usage: cache_stats [clear]", output)
+    
+    def test_do_distances(self):
+        """Test listing costs and paths from one node."""
+        self.shell.graph.add_edges_from([("A", "B", 1), ("B", "C", 2), ("A", "C", 5), ("X", "Y", 1)])
+        output = self.capture_output(self.shell.do_distances, "A")
+        self.assertEqual(output, "A: 0 (A)\nB: 1 (A -> B)\nC: 3 (A -> B -> C)\n")
+        output = self.capture_output(self.shell.do_distances, "A 1")
+        self.assertEqual(output, "A: 0 (A)\nB: 1 (A -> B)\n")
+        output = self.capture_output(self.shell.do_distances, "Z")
+        self.assertIn("Start node Z doesn't exist", output)
+        output = self.capture_output(self.shell.do_distances, "A far")
+        self.assertIn("Usage: distances start [max_cost]", output)
+    
+    def test_do_components(self):
+        """Test the components and connected shell commands."""
+        self.shell.graph.add_edges_from([("A", "B", 1), ("X", "Y", 1)])
+        self.shell.graph.add_edges_from((f"N{i}", f"N{i + 1}", 1) for i in range(11))
+        output = self.capture_output(self.shell.do_components, "")
+        self.assertEqual(output.splitlines(), [
+            "3 components",
+            "  12 nodes: N0, N1, N2, N3, N4, N5, N6, N7, N8, N9, ... (2 more)",
+            "  2 nodes: A, B",
+            "  2 nodes: X, Y",
+        ])
+        output = self.capture_output(self.shell.do_connected, "A B")
+        self.assertEqual(output, "A and B are connected\n")
+        output = self.capture_output(self.shell.do_connected, "A X")
+        self.assertEqual(output, "A and X are not connected\n")
+        output = self.capture_output(self.shell.do_connected, "A Q")
+        self.assertIn("Q doesn't exist", output)
+        output = self.capture_output(self.shell.do_connected, "A")
+        self.assertIn("Usage: connected NODE1 NODE2", output)
+    
+    def test_do_trace_toggle(self):
+        """Test that trace off hides the search tables but keeps the result."""
+        self.shell.do_add_node("A")
+        self.shell.do_add_node("B")
+        self.shell.do_add_edge("A B 1")
+        
+        output = self.capture_output(self.shell.do_trace, "off")
+        self.assertIn("Search trace is off", output)
+        self.assertFalse(self.shell.trace)
+        
+        output = self.capture_output(self.shell.do_ucs, "A B")
+        self.assertEqual(output, "Path: A -> B, Total cost: 1\n")
+        output = self.capture_output(self.shell.do_bfs, "A B")
+        self.assertEqual(output, "A -> B\n")
+        
+        output = self.capture_output(self.shell.do_trace, "on")
+        self.assertIn("Search trace is on", output)
+        output = self.capture_output(self.shell.do_ucs, "A B")
+        self.assertIn("UCS for target B", output)
+    
+    def test_do_trace_invalid_args(self):
+        """Test trace shell command with invalid arguments."""
+        output = self.capture_output(self.shell.do_trace, "maybe")
+        self.assertIn("Usage: trace [on|off]", output)
+        self.assertTrue(self.shell.trace)
+    
+    def test_shell_logs_mutations(self):
+        """Test that the shell's graph records changes in the write-ahead log."""
+        shell = GraphShell()
+        self.assertIsNotNone(shell.graph.wal)
+    
     @patch('src.graph_ops.graph.Graph.save')
     def test_do_save(self, mock_save):
         """Test save shell command."""
         output = self.capture_output(self.shell.do_save, "")
         self.assertIn("Graph saved", output)
         mock_save.assert_called_once()
+
+    @patch('src.graph_ops.graph.Graph.save', side_effect=ValueError("Cost 1 doesn't fit"))
+    def test_do_save_error(self, mock_save):
+        """Test that a failed save reports why."""
+        output = self.capture_output(self.shell.do_save, "")
+        self.assertEqual(output.strip(), "Cost 1 doesn't fit")
+        self.capture_output(self.shell.do_save, "json")
+        mock_save.assert_called_with("json")
     
     @patch('src.graph_ops.graph.Graph.load')
     def test_do_load(self, mock_load):
@@ -205,6 +479,13 @@ class TestGraphShell(unittest.TestCase):
         self.assertTrue(result)  # Should return True to exit
         mock_save.assert_called_once()
 
+    @patch('src.graph_ops.graph.Graph.save', side_effect=[ValueError("Cost 1 doesn't fit"), None])
+    def test_do_exit_falls_back_to_json(self, mock_save):
+        """Test that exit saves as JSON when the snapshot format can't hold the graph."""
+        output = self.capture_output(self.shell.do_exit, "")
+        self.assertIn("Graph saved as JSON", output)
+        mock_save.assert_called_with("json")
+
 
 class TestGraphShellIntegration(unittest.TestCase):
     """Integration tests for shell functionality."""
@@ -0,0 +1,219 @@
+import unittest
+import tempfile
+import os
+import json
+import struct
+import mmap
+import src.graph_ops.graph as graph_module
+from src.graph_ops.graph import Graph
+from src.graph_ops.snapshot import HEADER, MAGIC, is_snapshot, open_snapshot, read_snapshot, write_snapshot
+from tests.helpers import GraphFileTestCase
+
+
+class TestSnapshot(GraphFileTestCase):
+
+    def setUp(self):
+        """Point the graph file at a fresh temporary directory."""
+        super().setUp()
+        self.graph = Graph()
+        for node in ["A", "B", "C", "D"]:
+            self.graph.add_node(node)
+        self.graph.add_edge("A", "B", 3)
+        self.graph.add_edge("B", "C", 5)
+        self.graph.add_edge("A", "C", 1)
+
+    def test_save_writes_snapshot(self):
+        """Test that save writes the binary format by default and load reads it back."""
+        self.graph.save()
+        self.assertTrue(is_snapshot(self.filename))
+        self.assertFalse(os.path.exists(f"{self.filename}.tmp"))
+
+        new_graph = Graph()
+        new_graph.load()
+        self.assertEqual(new_graph.adj_list, self.graph.adj_list)
+        self.assertEqual(new_graph.num_nodes, 4)
+        self.assertEqual(new_graph.adj_list["D"], {})
+
+    def test_load_detects_json(self):
+        """Test that JSON files written with fmt='json' still load."""
+        self.graph.save(fmt="json")
+        self.assertFalse(is_snapshot(self.filename))
+
+        new_graph = Graph()
+        new_graph.load()
+        self.assertEqual(new_graph.adj_list, self.graph.adj_list)
+
+    def test_load_falls_back_to_legacy_json_file(self):
+        """Test that an existing .graph_data.json is loaded when no snapshot exists."""
+        with open(graph_module.LEGACY_FILENAME, "w") as f:
+            json.dump({"X": {"Y": 2}, "Y": {"X": 2}}, f)
+
+        new_graph = Graph()
+        new_graph.load()
+        self.assertEqual(new_graph.adj_list, {"X": {"Y": 2}, "Y": {"X": 2}})
+
+    def test_save_rejects_unknown_format(self):
+        """Test saving with an unknown format."""
+        with self.assertRaises(ValueError):
+            self.graph.save(fmt="xml")
+
+    def test_weights_and_names_roundtrip(self):
+        """Test float, negative and large weights and non-ASCII names."""
+        self.graph.add_node("ünïcødé")
+        self.graph.add_edge("A", "ünïcødé", 2.5)
+        self.graph.add_edge("C", "D", -7)
+        self.graph.add_edge("B", "D", 2 ** 40)
+        write_snapshot(self.filename, self.graph.to_compact())
+
+        new_graph = Graph()
+        new_graph.from_compact(read_snapshot(self.filename))
+        self.assertEqual(new_graph.adj_list, self.graph.adj_list)
+
+    def test_costs_a_snapshot_cant_hold_are_refused(self):
+        """Test that integer costs a snapshot column would round fail to save, and JSON keeps them."""
+        self.graph.add_edge("C", "D", 2 ** 70 + 1)
+        with self.assertRaisesRegex(ValueError, "doesn't fit a 64-bit integer"):
+            self.graph.save()
+        with self.assertRaises(ValueError):
+            self.graph.to_edge_table()
+        self.assertFalse(os.path.exists(self.filename))
+        self.graph.save("json")
+        new_graph = Graph()
+        new_graph.load()
+        self.assertEqual(new_graph.adj_list["C"]["D"], 2 ** 70 + 1)
+
+        self.graph.add_edge("C", "D", 2 ** 60 + 1)
+        self.graph.add_edge("A", "D", 0.5)
+        with self.assertRaisesRegex(ValueError, "loses precision"):
+            self.graph.save()
+        self.graph.add_edge("C", "D", 2 ** 52)
+        self.graph.save()
+        self.assertEqual(read_snapshot(self.filename).weights.typecode, "d")
+
+    def test_integer_weights_are_narrowed(self):
+        """Test that small integer weights are stored in one byte each."""
+        write_snapshot(self.filename, self.graph.to_compact())
+        self.assertEqual(read_snapshot(self.filename).weights.typecode, "b")
+
+    def test_empty_graph_roundtrip(self):
+        """Test saving and loading an empty graph."""
+        Graph().save()
+        new_graph = Graph()
+        new_graph.load()
+        self.assertEqual(new_graph.adj_list, {})
+
+    def test_unsupported_version(self):
+        """Test that snapshots from another format version are rejected."""
+        write_snapshot(self.filename, self.graph.to_compact())
+        with open(self.filename, "r+b") as f:
+            f.seek(len(MAGIC))
+            f.write(struct.pack("<I", 99))
+        with self.assertRaises(ValueError):
+            read_snapshot(self.filename)
+
+    def test_directed_flag(self):
+        """Test that the directed flag survives a snapshot and is read as unset in older versions."""
+        graph = Graph(directed=True)
+        graph.add_edges_from([("A", "B", 1)])
+        write_snapshot(self.filename, graph.to_compact())
+        self.assertTrue(read_snapshot(self.filename).directed)
+        self.assertTrue(open_snapshot(self.filename).directed)
+        with open(self.filename, "r+b") as f:
+            f.seek(len(MAGIC))
+            f.write(struct.pack("<I", 2))
+        self.assertFalse(read_snapshot(self.filename).directed)
+
+    def test_sections_are_aligned(self):
+        """Test that the file size is a multiple of 8 bytes."""
+        self.graph.add_node("odd-length-name")
+        write_snapshot(self.filename, self.graph.to_compact())
+        size = os.path.getsize(self.filename)
+        self.assertEqual(size % 8, 0)
+        self.assertGreater(size, HEADER.size)
+
+
+class TestMappedSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        """Write a snapshot of a small graph to a temporary file."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.temp_dir.name, ".graph_data")
+        self.graph = Graph()
+        for node in ["D", "B", "A", "C", "E", "é"]:
+            self.graph.add_node(node)
+        self.graph.add_edge("A", "B", 1)
+        self.graph.add_edge("A", "C", 4)
+        self.graph.add_edge("B", "D", 2)
+        self.graph.add_edge("C", "D", 1)
+        self.graph.add_edge("D", "é", 7)
+        write_snapshot(self.filename, self.graph.to_compact())
+        self.mapped = open_snapshot(self.filename)
+
+    def tearDown(self):
+        del self.mapped
+        self.temp_dir.cleanup()
+
+    def test_arrays_are_views_of_the_mapping(self):
+        """Test that the CSR columns are zero-copy views over the mapped file."""
+        for column in (self.mapped.offsets, self.mapped.targets, self.mapped.weights):
+            self.assertIsInstance(column, memoryview)
+            self.assertIsInstance(column.obj, mmap.mmap)
+            self.assertTrue(column.readonly)
+
+    def test_name_lookup(self):
+        """Test name <-> id lookups without a materialised dict."""
+        self.assertEqual(len(self.mapped.names), 6)
+        self.assertEqual(list(self.mapped.names), ["D", "B", "A", "C", "E", "é"])
+        for node, name in enumerate(self.mapped.names):
+            self.assertEqual(self.mapped.node_id(name), node)
+        self.assertIsNone(self.mapped.node_id("Z"))
+        self.assertNotIn("", self.mapped.index)
+        self.assertEqual(self.mapped.names[-1], "é")
+        with self.assertRaises(IndexError):
+            self.mapped.names[6]
+
+    def test_searches_match_graph(self):
+        """Test that searches on the mapped graph match the dict-based graph."""
+        for start, target in [("A", "D"), ("é", "A"), ("A", "E"), ("Z", "A"), ("A", "Z")]:
+            self.assertEqual(self.mapped.bfs(start, target), self.graph.bfs(start, target, trace=False))
+            self.assertEqual(self.mapped.dfs(start, target), self.graph.dfs(start, target, trace=False))
+            self.assertEqual(self.mapped.ucs(start, target), self.graph.ucs(start, target, trace=False))
+
+    def test_mapped_graph_converts_back(self):
+        """Test rebuilding a Graph and re-saving from a mapped snapshot."""
+        graph = Graph()
+        graph.from_compact(self.mapped)
+        self.assertEqual(graph.adj_list, self.graph.adj_list)
+
+        copy_filename = os.path.join(self.temp_dir.name, "copy")
+        write_snapshot(copy_filename, self.mapped)
+        self.assertEqual(read_snapshot(copy_filename).ucs("A", "é"), self.graph.ucs("A", "é", trace=False))
+
+    def test_version_1_falls_back_to_copying(self):
+        """Test that a version 1 file without the name order section still opens."""
+        with open(self.filename, "r+b") as f:
+            f.seek(len(MAGIC))
+            f.write(struct.pack("<I", 1))
+            f.truncate(os.path.getsize(self.filename) - 24)
+        compact = open_snapshot(self.filename)
+        self.assertNotIsInstance(compact.targets, memoryview)
+        self.assertEqual(compact.ucs("A", "é"), self.graph.ucs("A", "é", trace=False))
+
+    def test_load_compact(self):
+        """Test opening the graph file read-only through Graph.load_compact."""
+        original_filename = graph_module.FILENAME
+        try:
+            graph_module.FILENAME = self.filename
+            mapped = Graph.load_compact()
+            copied = Graph.load_compact(use_mmap=False)
+            self.assertIsInstance(mapped.targets, memoryview)
+            self.assertNotIsInstance(copied.targets, memoryview)
+            self.assertEqual(mapped.bfs("A", "é"), copied.bfs("A", "é"))
+
+            self.graph.save(fmt="json")
+            self.assertEqual(Graph.load_compact().bfs("A", "é"), copied.bfs("A", "é"))
+        finally:
+            graph_module.FILENAME = original_filename
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,58 +1,48 @@
 import unittest
-from src.graph_ops.graph import Graph
+import random
+from src.graph_ops.graph import Graph, manhattan
+from src.graph_ops.shell import format_result
 
 
-class TestUCSBinarySearch(unittest.TestCase):
-    """Detailed tests for UCS algorithm's binary search priority queue implementation."""
+class TestUCSPriorityQueue(unittest.TestCase):
+    """Detailed tests for UCS algorithm's heap-based priority queue implementation."""
     
     def setUp(self):
         """Set up test fixtures before each test method."""
         self.graph = Graph()
     
-    def test_insert_sorted_empty_queue(self):
-        """Test inserting into empty priority queue."""
-        queue = []
-        item = (5, "A", ["A"])
-        self.graph._insert_sorted(queue, item)
-        self.assertEqual(queue, [item]
+    def test_build_path_from_parents(self):
+        """Test reconstructing a path from parent pointers."""
+        parent = {"B": "A", "C": "B", "D": "C"}
+        self.assertEqual(self.graph._build_path(parent, "A", "D"), ["A", "B", "C", "D"])
+        self.assertEqual(self.graph._build_path(parent, "A", "A"), ["A"])
     
-    def test_insert_sorted_single_item(self):
-        """Test inserting into queue with single item."""
-        queue = [(3, "A", ["A"])]
-        
-        # Insert item with lower cost
-        item1 = (1, "B", ["B"])
-        self.graph._insert_sorted(queue, item1)
-        self.assertEqual(queue[0], item1)
-        
-        # Insert item with higher cost
-        item2 = (7, "C", ["C"])
-        self.graph._insert_sorted(queue, item2)
-        self.assertEqual(queue[-1], item2)
-    
-    def test_insert_sorted_multiple_items(self):
-        """Test inserting into queue with multiple items."""
-        queue = [(1, "A", ["A"]), (3, "B", ["B"]), (7, "C", ["C"])]
+    def test_ucs_lazy_decrease_key(self):
+        """Test that a cheaper route found later replaces the queued cost."""
+        for node in ["A", "B", "C", "D"]:
+            self.graph.add_node(node)
         
-        # Insert in middle
-        item = (5, "D", ["D"])
-        self.graph._insert_sorted(queue, item)
+        # B is first queued with cost 10, then improved to 2 through C
+        self.graph.add_edge("A", "B", 10)
+        self.graph.add_edge("A", "C", 1)
+        self.graph.add_edge("C", "B", 1)
+        self.graph.add_edge("B", "D", 1)
         
-        # Verify sorted order
-        costs = [item[0] for item in queue]
-        self.assertEqual(costs, [1, 3, 5, 7])
+        result = format_result(self.graph.ucs("A", "D"))
+        self.assertEqual(result, "Path: A -> C -> B -> D, Total cost: 3")
     
-    def test_insert_sorted_duplicate_costs(self):
-        """Test inserting items with duplicate costs."""
-        queue = [(2, "A", ["A"]), (4, "B", ["B"])]
+    def test_ucs_equal_costs_keep_insertion_order(self):
+        """Test that ties are broken in the order nodes were queued."""
+        for node in ["S", "X", "Y", "T"]:
+            self.graph.add_node(node)
         
-        # Insert item with same cost as existing
-        item = (2, "C", ["C"])
-        self.graph._insert_sorted(queue, item)
+        self.graph.add_edge("S", "X", 1)
+        self.graph.add_edge("S", "Y", 1)
+        self.graph.add_edge("X", "T", 1)
+        self.graph.add_edge("Y", "T", 1)
         
-        # Should maintain relative order for same costs
-        costs = [item[0] for item in queue]
-        self.assertEqual(costs, [2, 2, 4])
+        result = format_result(self.graph.ucs("S", "T"))
+        self.assertEqual(result, "Path: S -> X -> T, Total cost: 2")
     
     def test_ucs_priority_queue_ordering(self):
         """Test that UCS processes nodes in correct cost order."""
@@ -63,19 +53,19 @@ class TestUCSBinarySearch(unittest.TestCase):
         self.graph.add_node("D")
         
         # A connects to B(cost=5) and C(cost=2)
-        # B connects to D(cost=1), C connects to D(cost=10)
-        # Optimal path should be A -> C -> B -> D (cost=8) vs A -> B -> D (cost=6)
+        # B connects to D(cost=1), C connects to B(cost=1)
+        # Optimal path should be A -> C -> B -> D (cost=4) vs A -> B -> D (cost=6)
         self.graph.add_edge("A", "B", 5)
         self.graph.add_edge("A", "C", 2)
         self.graph.add_edge("B", "D", 1)
         self.graph.add_edge("C", "B", 1)
         
-        result = self.graph.ucs("A", "D")
-        self.assertIn("Path: A -> B -> D", result)
-        self.assertIn("Total cost: 6", result)
+        result = format_result(self.graph.ucs("A", "D"))
+        self.assertIn("Path: A -> C -> B -> D", result)
+        self.assertIn("Total cost: 4", result)
     
     def test_ucs_with_many_nodes(self):
-        """Test UCS with larger graph to stress-test binary search."""
+        """Test UCS with larger graph to stress-test the priority queue."""
         # Create a larger graph
         nodes = [chr(ord('A') + i) for i in range(8)]  # A through H
         for node in nodes:
@@ -91,7 +81,7 @@ class TestUCSBinarySearch(unittest.TestCase):
         for start, end, cost in edges:
             self.graph.add_edge(start, end, cost)
         
-        result = self.graph.ucs("A", "H")
+        result = format_result(self.graph.ucs("A", "H"))
         self.assertIn("Total cost:", result)
         
         # Verify it's a valid path
@@ -99,8 +89,8 @@ class TestUCSBinarySearch(unittest.TestCase):
         self.assertIn("A", result)
         self.assertIn("H", result)
     
-    def test_ucs_binary_search_correctness(self):
-        """Test that binary search maintains correct order under various scenarios."""
+    def test_ucs_priority_queue_correctness(self):
+        """Test that the priority queue maintains correct order under various scenarios."""
         # Create a graph that will generate many queue insertions
         self.graph.add_node("START")
         for i in range(10):
@@ -115,7 +105,7 @@ class TestUCSBinarySearch(unittest.TestCase):
             # Connect each node to END with cost 1
             self.graph.add_edge(node, "END", 1)
         
-        result = self.graph.ucs("START", "END")
+        result = format_result(self.graph.ucs("START", "END"))
         # Should find path through N9 (cost 1 + 1 = 2)
         self.assertIn("N9", result)
         self.assertIn("Total cost: 2", result)
@@ -131,7 +121,7 @@ class TestUCSEdgeCases(unittest.TestCase):
     def test_ucs_single_node(self):
         """Test UCS on single node (start = target)."""
         self.graph.add_node("A")
-        result = self.graph.ucs("A", "A")
+        result = format_result(self.graph.ucs("A", "A"))
         self.assertIn("Path: A", result)
         self.assertIn("Total cost: 0", result)
     
@@ -140,7 +130,7 @@ class TestUCSEdgeCases(unittest.TestCase):
         self.graph.add_node("A")
         self.graph.add_node("B")
         # No edges between A and B
-        result = self.graph.ucs("A", "B")
+        result = format_result(self.graph.ucs("A", "B"))
         self.assertEqual(result, "B is unreachable")
     
     def test_ucs_zero_cost_edges(self):
@@ -152,7 +142,7 @@ class TestUCSEdgeCases(unittest.TestCase):
         self.graph.add_edge("A", "B", 0)
         self.graph.add_edge("B", "C", 0)
         
-        result = self.graph.ucs("A", "C")
+        result = format_result(self.graph.ucs("A", "C"))
         self.assertIn("Total cost: 0", result)
         self.assertIn("Path: A -> B -> C", result)
     
@@ -166,7 +156,7 @@ class TestUCSEdgeCases(unittest.TestCase):
         self.graph.add_edge("A", "C", 1)
         self.graph.add_edge("C", "B", 1)
         
-        result = self.graph.ucs("A", "B")
+        result = format_result(self.graph.ucs("A", "B"))
         self.assertIn("Path: A -> C -> B", result)
         self.assertIn("Total cost: 2", result)
     
@@ -184,7 +174,7 @@ class TestUCSEdgeCases(unittest.TestCase):
         self.graph.add_edge("TOP", "END", 50)
         self.graph.add_edge("BOTTOM", "END", 1)
         
-        result = self.graph.ucs("START", "END")
+        result = format_result(self.graph.ucs("START", "END"))
         self.assertIn("Path: START -> BOTTOM -> END", result)
         self.assertIn("Total cost: 3", result)
     
@@ -201,7 +191,7 @@ class TestUCSEdgeCases(unittest.TestCase):
         self.graph.add_edge("B", "D", 1)
         self.graph.add_edge("C", "D", 1)
         
-        result = self.graph.ucs("A", "D")
+        result = format_result(self.graph.ucs("A", "D"))
         self.assertIn("Path: A -> B -> D", result)
         self.assertIn("Total cost: 2", result)
 
@@ -227,8 +217,8 @@ class TestSearchAlgorithmComparison(unittest.TestCase):
     
     def test_bfs_vs_ucs_different_results(self):
         """Test that BFS and UCS can find different paths."""
-        bfs_result = self.graph.bfs("A", "D")
-        ucs_result = self.graph.ucs("A", "D")
+        bfs_result = format_result(self.graph.bfs("A", "D"))
+        ucs_result = format_result(self.graph.ucs("A", "D"))
         
         # BFS should find direct path (ignores weights)
         self.assertIn("A", bfs_result)
@@ -240,8 +230,8 @@ class TestSearchAlgorithmComparison(unittest.TestCase):
     
     def test_dfs_vs_ucs_different_results(self):
         """Test that DFS and UCS can find different paths."""
-        dfs_result = self.graph.dfs("A", "D")
-        ucs_result = self.graph.ucs("A", "D")
+        dfs_result = format_result(self.graph.dfs("A", "D"))
+        ucs_result = format_result(self.graph.ucs("A", "D"))
         
         # Both should find a path, but likely different ones
         self.assertIn("A", dfs_result)
@@ -254,14 +244,164 @@ class TestSearchAlgorithmComparison(unittest.TestCase):
         """Test all algorithms handle unreachable targets consistently."""
         self.graph.add_node("ISOLATED")
         
-        bfs_result = self.graph.bfs("A", "ISOLATED")
-        dfs_result = self.graph.dfs("A", "ISOLATED")
-        ucs_result = self.graph.ucs("A", "ISOLATED")
+        bfs_result = format_result(self.graph.bfs("A", "ISOLATED"))
+        dfs_result = format_result(self.graph.dfs("A", "ISOLATED"))
+        ucs_result = format_result(self.graph.ucs("A", "ISOLATED"))
         
         self.assertIn("can't be reached", bfs_result)
         self.assertIn("unreachable", dfs_result)
         self.assertIn("unreachable", ucs_result)
 
 
+
+class TestBidirectionalSearch(unittest.TestCase):
+    """Tests for the meet-in-the-middle BFS and UCS modes."""
+    
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.graph = Graph()
+        # A - B - C - D - E with a costly shortcut A - E and an isolated F
+        for node in ["A", "B", "C", "D", "E", "F"]:
+            self.graph.add_node(node)
+        self.graph.add_edge("A", "B", 1)
+        self.graph.add_edge("B", "C", 1)
+        self.graph.add_edge("C", "D", 1)
+        self.graph.add_edge("D", "E", 1)
+        self.graph.add_edge("A", "E", 10)
+    
+    def path_cost(self, graph, path):
+        return sum(graph.adj_list[a][b] for a, b in zip(path, path[1:]))
+    
+    def test_bidirectional_bfs_fewest_hops(self):
+        """Test that bidirectional BFS returns a fewest-hops path."""
+        self.assertEqual(format_result(self.graph.bfs("A", "E", trace=False, bidirectional=True)), "A -> E")
+        self.assertEqual(format_result(self.graph.bfs("B", "D", trace=False, bidirectional=True)), "B -> C -> D")
+        self.assertEqual(format_result(self.graph.bfs("C", "C", trace=False, bidirectional=True)), "C")
+    
+    def test_bidirectional_ucs_cheapest(self):
+        """Test that bidirectional UCS returns the cheapest path."""
+        self.assertEqual(format_result(self.graph.ucs("A", "E", trace=False, bidirectional=True)), "Path: A -> B -> C -> D -> E, Total cost: 4")
+        self.assertEqual(format_result(self.graph.ucs("D", "D", trace=False, bidirectional=True)), "Path: D, Total cost: 0")
+    
+    def test_bidirectional_unreachable(self):
+        """Test both bidirectional modes with an unreachable target."""
+        self.assertEqual(format_result(self.graph.bfs("A", "F", trace=False, bidirectional=True)), "F can't be reached")
+        self.assertEqual(format_result(self.graph.ucs("A", "F", trace=False, bidirectional=True)), "F is unreachable")
+        self.assertEqual(format_result(self.graph.bfs("A", "Z", trace=False, bidirectional=True)), "Z can't be reached")
+    
+    def test_bidirectional_trace(self):
+        """Test that bidirectional searches record both frontiers when tracing."""
+        ucs_trace = self.graph.ucs("A", "E", trace=True, bidirectional=True).trace
+        bfs_trace = self.graph.bfs("A", "E", trace=True, bidirectional=True).trace
+        self.assertEqual(bfs_trace[0], ["['A']", "['E']"])
+        self.assertTrue(all(len(row) == 2 for row in ucs_trace))
+    
+    def test_matches_one_sided_search_on_random_graphs(self):
+        """Test bidirectional results against the one-sided searches."""
+        rng = random.Random(3)
+        for _ in range(20):
+            graph = Graph()
+            nodes = [f"N{i}" for i in range(40)]
+            graph.add_edges_from((rng.choice(nodes), rng.choice(nodes), rng.randint(0, 9)) for _ in range(70))
+            for start, target in [("N0", "N39"), ("N5", "N17")]:
+                if start not in graph.adj_list or target not in graph.adj_list:
+                    continue
+                expected = graph._ucs_search(start, target)
+                result = graph._bidirectional_ucs_search(start, target)
+                self.assertEqual(result is None, expected is None)
+                if result is not None:
+                    self.assertEqual(result[1], expected[1])
+                    self.assertEqual(self.path_cost(graph, result[0]), expected[1])
+                    self.assertEqual((result[0][0], result[0][-1]), (start, target))
+                
+                path = graph._bidirectional_bfs_search(start, target)
+                self.assertEqual(path is None, expected is None)
+                if path is not None:
+                    unit = Graph()
+                    unit.add_edges_from((a, b, 1) for a in graph.adj_list for b in graph.adj_list[a])
+                    self.assertEqual(len(path) - 1, unit._ucs_search(start, target)[1])
+                    for a, b in zip(path, path[1:]):
+                        self.assertIn(b, graph.adj_list[a])
+
+
+class TestAStarSearch(unittest.TestCase):
+    """Tests for A* with coordinate-based and custom heuristics."""
+    
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.graph = Graph()
+        # 4x4 grid named "x,y" with unit costs and a costly wall along x = 2
+        for x in range(4):
+            for y in range(4):
+                self.graph.add_node(f"{x},{y}")
+        for x in range(4):
+            for y in range(4):
+                if x < 3:
+                    self.graph.add_edge(f"{x},{y}", f"{x + 1},{y}", 5 if x == 1 and y < 3 else 1)
+                if y < 3:
+                    self.graph.add_edge(f"{x},{y}", f"{x},{y + 1}", 1)
+    
+    def test_astar_matches_ucs_cost(self):
+        """Test that both built-in heuristics find the UCS-optimal cost."""
+        expected = self.graph._ucs_search("0,0", "3,0")[1]
+        for heuristic in ["manhattan", "euclidean"]:
+            result = format_result(self.graph.astar("0,0", "3,0", heuristic, trace=False))
+            self.assertTrue(result.endswith(f"Total cost: {expected}"))
+    
+    def test_astar_expands_fewer_nodes(self):
+        """Test that a goal-directed heuristic expands fewer nodes than no heuristic."""
+        informed, blind = {}, {}
+        estimate = self.graph._position_heuristic(manhattan)
+        self.graph._astar_search("0,3", "3,3", estimate, stats=informed)
+        self.graph._astar_search("0,3", "3,3", lambda node, target: 0, stats=blind)
+        self.assertLess(informed["explored"], blind["explored"])
+    
+    def test_astar_explicit_positions(self):
+        """Test that set_position overrides coordinates parsed from names."""
+        self.graph.add_node("Z", {"3,3": 1})
+        self.assertIsNone(self.graph.position("Z"))
+        self.assertEqual(self.graph.set_position("Z", 4, 3), "Z placed at (4, 3)")
+        self.assertEqual(self.graph.position("Z"), (4, 3))
+        self.assertEqual(self.graph.set_position("Q", 0, 0), "Q doesn't exist")
+        self.assertEqual(format_result(self.graph.astar("0,3", "Z", trace=False)), "Path: 0,3 -> 1,3 -> 2,3 -> 3,3 -> Z, Total cost: 4")
+        self.graph.remove_node("Z")
+        self.assertIsNone(self.graph.attribute("Z", "x"))
+    
+    def test_astar_custom_heuristic(self):
+        """Test passing a callable heuristic."""
+        result = format_result(self.graph.astar("0,0", "3,3", lambda node, target: 0, trace=False))
+        self.assertEqual(result, format_result(self.graph.ucs("0,0", "3,3", trace=False)))
+    
+    def test_astar_errors(self):
+        """Test missing nodes, unknown heuristics and unreachable targets."""
+        self.graph.add_node("lonely")
+        self.assertEqual(format_result(self.graph.astar("X", "0,0", trace=False)), "Start node X doesn't exist")
+        self.assertEqual(format_result(self.graph.astar("0,0", "X", trace=False)), "Target node X doesn't exist")
+        self.assertIn("Unknown heuristic chebyshev", format_result(self.graph.astar("0,0", "3,3", "chebyshev", trace=False)))
+        self.assertEqual(format_result(self.graph.astar("0,0", "lonely", trace=False)), "lonely is unreachable")
+    
+    def test_astar_admissibility_check(self):
+        """Test that the debug check reports estimates above the true remaining cost."""
+        self.assertEqual(self.graph.heuristic_violations("3,3"), [])
+        self.assertEqual(self.graph.heuristic_violations("3,3", "euclidean"), [])
+        
+        # tripling Manhattan distance overestimates on unit-cost edges
+        problems = self.graph.heuristic_violations("3,3", lambda node, target: 3 * manhattan(self.graph.position(node), self.graph.position(target)))
+        self.assertIn(("3,2", 3, 1), problems)
+        with self.assertRaises(ValueError):
+            self.graph.heuristic_violations("3,3", "chebyshev")
+    
+    def test_astar_inconsistent_heuristic_stays_optimal(self):
+        """Test that nodes are reopened when an admissible but inconsistent estimate misleads the search."""
+        graph = Graph()
+        graph.add_edges_from([("S", "A", 1), ("S", "B", 1), ("A", "C", 1), ("B", "C", 2), ("C", "G", 3)])
+        estimates = {"S": 0, "A": 4, "B": 0, "C": 0, "G": 0}
+        self.assertEqual(format_result(graph.astar("S", "G", lambda node, target: estimates[node], trace=False)), "Path: S -> A -> C -> G, Total cost: 5")
+    
+    def test_astar_trace(self):
+        """Test that A* records its priority queue when tracing."""
+        result = self.graph.astar("0,0", "1,1", trace=True)
+        self.assertIn("0,1(1+1)", result.trace[1][0])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,181 @@
+import unittest
+import os
+import src.graph_ops.graph as graph_module
+from src.graph_ops.graph import Graph
+from src.graph_ops.wal import ADD_EDGE, ADD_NODE, LEGACY_WAL_HEADER, LEGACY_WAL_MAGIC, WAL_HEADER, WAL_MAGIC, WAL_SUFFIX, WriteAheadLog, base_identity, encode_record, read_log
+from tests.helpers import GraphFileTestCase
+
+
+class TestWriteAheadLog(GraphFileTestCase):
+
+    def setUp(self):
+        """Point the graph file at a fresh temporary directory and start a logged graph."""
+        super().setUp()
+        self.wal_path = self.filename + WAL_SUFFIX
+
+        self.graph = Graph()
+        for node in ["A", "B", "C"]:
+            self.graph.add_node(node)
+        self.graph.add_edge("A", "B", 3)
+        self.graph.save()
+        self.graph = self.reload()
+        self.graph.enable_wal()
+
+    def test_mutations_replay_without_save(self):
+        """Test that logged changes survive the process ending without a save."""
+        self.graph.add_node("D", {"A": 1})
+        self.graph.add_edge("B", "C", 2.5)
+        self.graph.remove_edge("A", "B")
+        self.graph.add_node("E")
+        self.graph.remove_node("E")
+
+        self.assertEqual(self.reload().adj_list, self.graph.adj_list)
+
+    def test_bulk_insert_replays(self):
+        """Test that edges and nodes created by add_edges_from are logged."""
+        self.graph.add_edges_from([("A", "X", 1), ("X", "Y", 2)])
+        recovered = self.reload()
+        self.assertEqual(recovered.adj_list, self.graph.adj_list)
+        self.assertEqual(recovered.num_nodes, 5)
+
+    def test_save_only_appends(self):
+        """Test that save flushes the log instead of rewriting the graph file."""
+        snapshot_identity = base_identity(self.filename)
+        self.graph.add_edge("B", "C", 1)
+        self.graph.save()
+
+        self.assertEqual(base_identity(self.filename), snapshot_identity)
+        self.assertEqual(self.graph.wal.records, 1)
+        self.assertEqual(os.path.getsize(self.wal_path), WAL_HEADER.size + self.graph.wal.size)
+        self.assertEqual(self.reload().adj_list, self.graph.adj_list)
+
+    def test_no_log_file_until_first_mutation(self):
+        """Test that enabling the log does not create a file by itself."""
+        self.assertFalse(os.path.exists(self.wal_path))
+        self.graph.add_edge("A", "C", 1)
+        self.assertTrue(os.path.exists(self.wal_path))
+
+    def test_torn_tail_is_dropped(self):
+        """Test that a record cut short by a crash is ignored and trimmed."""
+        self.graph.add_edge("A", "C", 1)
+        self.graph.add_edge("B", "C", 2)
+        self.graph.wal.close()
+        with open(self.wal_path, "r+b") as f:
+            f.truncate(os.path.getsize(self.wal_path) - 3)
+
+        recovered = self.reload()
+        self.assertEqual(recovered.adj_list["A"], {"B": 3, "C": 1})
+        self.assertEqual(recovered.adj_list["B"], {"A": 3})
+
+        # continuing the log after recovery appends after the last intact record
+        recovered.enable_wal()
+        recovered.add_edge("B", "C", 5)
+        recovered.wal.close()
+        self.assertEqual(self.reload().adj_list["C"], {"A": 1, "B": 5})
+
+    def test_corrupt_record_stops_replay(self):
+        """Test that replay stops at a record whose checksum doesn't match."""
+        self.graph.add_edge("A", "C", 1)
+        self.graph.wal.close()
+        with open(self.wal_path, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            f.write(b"\xff")
+        self.assertEqual(self.reload().adj_list["A"], {"B": 3})
+
+    def test_compaction(self):
+        """Test that a large log is folded into a new snapshot on save."""
+        graph_module.COMPACTION_MIN_BYTES = 64
+        for i in range(10):
+            self.graph.add_node(f"N{i}", {"A": i})
+        self.graph.save()
+
+        self.assertFalse(os.path.exists(self.wal_path))
+        self.assertEqual(self.graph.wal.records, 0)
+        self.assertEqual(self.reload().adj_list, self.graph.adj_list)
+
+        self.graph.add_edge("B", "C", 9)
+        self.graph.wal.close()
+        self.assertEqual(self.reload().adj_list, self.graph.adj_list)
+
+    def test_stale_log_is_ignored(self):
+        """Test that a log written against an older graph file is not replayed."""
+        self.graph.add_edge("A", "C", 1)
+        self.graph.wal.close()
+
+        other = Graph()
+        other.add_node("X")
+        other.save()
+        self.assertEqual(self.reload().adj_list, {"X": {}})
+
+    def test_from_dict_forces_compaction(self):
+        """Test that replacing the whole graph is written out on the next save."""
+        self.graph.from_dict({"P": {"Q": 1}, "Q": {"P": 1}})
+        self.graph.save()
+        self.assertEqual(self.reload().adj_list, {"P": {"Q": 1}, "Q": {"P": 1}})
+
+    def test_enable_wal_on_unsaved_graph(self):
+        """Test that a graph built in memory is written out before logging starts."""
+        graph = Graph()
+        graph.add_node("M")
+        graph.enable_wal()
+        graph.add_node("N", {"M": 4})
+        graph.wal.close()
+        self.assertEqual(self.reload().adj_list, {"M": {"N": 4}, "N": {"M": 4}})
+
+    def test_record_roundtrip(self):
+        """Test encoding of strings, ints of any size, floats and neighbour maps."""
+        with open(self.wal_path, "wb") as f:
+            f.write(WAL_HEADER.pack(WAL_MAGIC, 1, 2, 3, 1))
+            f.write(encode_record(ADD_NODE, "ünï", {"A": -5, "B": 0.25}))
+            f.write(encode_record(ADD_EDGE, "A", "B", 2 ** 70 + 1))
+            f.write(encode_record(ADD_EDGE, "B", "C", -(2 ** 63) - 1))
+        records, end, directed = read_log(self.wal_path, (1, 2, 3))
+        self.assertEqual(records, [(ADD_NODE, ("ünï", {"A": -5, "B": 0.25})), (ADD_EDGE, ("A", "B", 2 ** 70 + 1)), (ADD_EDGE, ("B", "C", -(2 ** 63) - 1))])
+        self.assertEqual(end, os.path.getsize(self.wal_path))
+        self.assertTrue(directed)
+        self.assertIsNone(read_log(self.wal_path, (0, 0, 0)))
+
+    def test_first_format_log_is_upgraded(self):
+        """Test that a log without the directed flag replays and gets the current header once logging resumes."""
+        self.graph.wal.close()
+        base = base_identity(self.filename)
+        with open(self.wal_path, "wb") as f:
+            f.write(LEGACY_WAL_HEADER.pack(LEGACY_WAL_MAGIC, *base))
+            f.write(encode_record(ADD_EDGE, "B", "C", 4))
+        self.assertIsNone(read_log(self.wal_path, base)[2])
+        self.graph = self.reload()
+        self.assertEqual(self.graph.adj_list["C"], {"B": 4})
+        self.graph.enable_wal()
+        self.graph.add_edge("A", "C", 1)
+        self.graph.wal.close()
+        self.assertFalse(read_log(self.wal_path, base)[2])
+        self.assertEqual(self.reload().adj_list, self.graph.adj_list)
+
+    def test_directed_log_without_graph_file(self):
+        """Test that a log with no graph file under it replays as the kind of graph it was written for."""
+        self.graph.wal.close()
+        os.unlink(self.filename)
+        graph = Graph(directed=True)
+        graph.load()
+        graph.enable_wal()
+        graph.add_edges_from([("A", "B", 1)])
+        graph.wal.close()
+        recovered = self.reload()
+        self.assertTrue(recovered.directed)
+        self.assertEqual(recovered.adj_list, {"A": {"B": 1}, "B": {}})
+
+    def test_log_for_other_kind_of_graph_is_refused(self):
+        """Test that a log is not replayed onto a graph file of the other kind."""
+        self.graph.add_edge("B", "C", 1)
+        self.graph.wal.close()
+        with open(self.wal_path, "r+b") as f:
+            f.seek(WAL_HEADER.size - 8)
+            f.write(b"\1")
+        with self.assertRaises(ValueError):
+            self.reload()
+        with self.assertRaises(ValueError):
+            WriteAheadLog.open(self.wal_path, base_identity(self.filename), directed=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
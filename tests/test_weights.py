@@ -0,0 +1,195 @@
+import unittest
+import random
+from array import array
+import src.graph_ops.graph as graph_module
+from src.graph_ops.graph import Graph
+from src.graph_ops.snapshot import read_snapshot
+from src.graph_ops.weights import EdgeWeights
+from tests.helpers import GraphFileTestCase
+
+
+class TestEdgeWeights(unittest.TestCase):
+
+    def setUp(self):
+        """Set up the adjacency of a path A - B - C."""
+        self.adj_list = {"A": {"B": 1}, "B": {"A": 1, "C": 1}, "C": {"B": 1}}
+
+    def test_channels_follow_the_csr_layout(self):
+        """Test that every channel is one array of doubles with a value per adjacency entry."""
+        weights = EdgeWeights()
+        weights.set("A", "B", {"time": 1.5})
+        weights.set("B", "C", {"time": 2.0, "toll": 4})
+        self.assertEqual(weights.names(), ["time", "toll"])
+        # nothing is laid out before the first refresh, the values wait
+        self.assertEqual(weights.get("C", "B", "toll"), 4.0)
+        weights.refresh(self.adj_list, 1)
+        self.assertEqual(weights.pending, {})
+        self.assertIsInstance(weights.columns["time"], array)
+        self.assertEqual(weights.columns["time"].typecode, "d")
+        self.assertEqual(list(weights.offsets), [0, 1, 3, 4])
+        self.assertEqual(list(weights.columns["time"]), [1.5, 1.5, 2.0, 2.0])
+        self.assertEqual(weights.get("C", "B", "toll"), 4.0)
+        self.assertIsNone(weights.get("A", "B", "toll"))
+        self.assertIsNone(weights.get("A", "C", "time"))
+        self.assertEqual(len(weights), 2)
+
+    def test_values_carry_over_edge_changes(self):
+        """Test that a new layout keeps the values of edges that are still there."""
+        weights = EdgeWeights()
+        weights.set("A", "B", {"time": 1})
+        weights.set("B", "C", {"time": 2})
+        weights.refresh(self.adj_list, 1)
+        weights.set("A", "B", {"time": 3})
+        self.adj_list["A"]["D"] = 1
+        self.adj_list["D"] = {"A": 1}
+        weights.set("D", "A", {"time": 5})
+        weights.remove("C", "B")
+        del self.adj_list["B"]["C"], self.adj_list["C"]["B"]
+        weights.refresh(self.adj_list, 2)
+        self.assertEqual(weights.get("B", "A", "time"), 3.0)
+        self.assertEqual(weights.get("A", "D", "time"), 5.0)
+        self.assertIsNone(weights.get("B", "C", "time"))
+        self.assertEqual(len(weights.columns["time"]), 4)
+
+    def test_directed_edges_hold_own_values(self):
+        """Test that the two directions of a directed edge hold separate values."""
+        weights = EdgeWeights(directed=True)
+        weights.set("A", "B", {"time": 1})
+        weights.set("B", "A", {"time": 3})
+        weights.refresh({"A": {"B": 1}, "B": {"A": 1}}, 1)
+        self.assertEqual(len(weights), 2)
+        self.assertEqual(weights.get("A", "B", "time"), 1.0)
+        weights.remove_node("B", ["A"])
+        self.assertEqual(len(weights), 0)
+        self.assertIsNone(weights.get("A", "B", "time"))
+
+
+class TestGraphWeights(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a graph whose cheapest route differs per weight channel."""
+        #   A --1--> B --1--> C   (cost)
+        #   time: A-B 4, B-C 4, A-C 5 ; toll only on A-C
+        self.graph = Graph()
+        for node in ["A", "B", "C", "D"]:
+            self.graph.add_node(node)
+        self.graph.add_edge("A", "B", 1, {"time": 4})
+        self.graph.add_edge("B", "C", 1, {"time": 4})
+        self.graph.add_edge("A", "C", 5, {"time": 5, "toll": 2.5})
+
+    def test_ucs_by_channel(self):
+        """Test that ucs minimises the chosen channel instead of the cost."""
+        self.assertEqual(self.graph.ucs("A", "C").path, ["A", "B", "C"])
+        result = self.graph.ucs("A", "C", weight="time")
+        self.assertEqual(result.path, ["A", "C"])
+        self.assertEqual(result.cost, 5.0)
+        self.assertEqual(self.graph.ucs("A", "C", bidirectional=True, weight="time").cost, 5.0)
+        self.assertEqual(self.graph.ucs("A", "C", weight="toll").cost, 2.5)
+        self.assertFalse(self.graph.ucs("A", "B", weight="toll").found)
+        self.assertEqual(self.graph.ucs("A", "C", weight="speed").error, "Unknown weight speed")
+
+    def test_cache_is_keyed_by_channel(self):
+        """Test that cached results of different channels don't mix."""
+        self.assertEqual(self.graph.ucs("A", "C").cost, 2)
+        self.assertEqual(self.graph.ucs("A", "C", weight="time").cost, 5.0)
+        self.graph.set_edge_weights("A", "C", {"time": 9})
+        self.assertEqual(self.graph.ucs("A", "C", weight="time").cost, 8.0)
+
+    def test_astar_and_shortest_paths_by_channel(self):
+        """Test the other cost-based searches on a channel."""
+        self.assertEqual(self.graph.astar("A", "C", lambda node, target: 0, weight="time").cost, 5.0)
+        self.assertEqual(self.graph.shortest_paths("A", weight="time").distances, {"A": 0, "B": 4.0, "C": 5.0})
+        self.assertEqual(self.graph.heuristic_violations("C", lambda node, target: 0 if node == target else 4.5, weight="time"), [("B", 4.5, 4.0)])
+        with self.assertRaises(ValueError):
+            self.graph.shortest_paths("A", weight="speed")
+
+    def test_landmarks_not_used_for_channels(self):
+        """Test that landmark tables, built over edge costs, never guide a search on a channel."""
+        graph = Graph()
+        for node in ["A", "B", "C", "D"]:
+            graph.add_node(node)
+        graph.add_edge("A", "B", 1, {"time": 5})
+        graph.add_edge("B", "C", 1, {"time": 5})
+        graph.add_edge("A", "D", 5, {"time": 1})
+        graph.add_edge("D", "C", 5, {"time": 1})
+        graph.build_landmarks(2)
+        result = graph.ucs("A", "C", weight="time")
+        self.assertEqual(result.path, ["A", "D", "C"])
+        self.assertEqual(result.cost, 2.0)
+        self.assertEqual(graph.astar("A", "C", "landmarks", weight="time").error, "Landmarks only bound edge costs, not weight time")
+        self.assertEqual(graph.astar("A", "C", "landmarks").path, ["A", "B", "C"])
+
+    def test_set_edge_weights(self):
+        """Test setting channel values on existing edges only."""
+        self.assertEqual(self.graph.set_edge_weights("A", "B", {"toll": 1}), "Weights of A-B set: toll=1")
+        self.assertEqual(self.graph.edge_weight("B", "A", "toll"), 1.0)
+        self.assertEqual(self.graph.set_edge_weights("A", "D", {"toll": 1}), "No edge between A and D")
+        self.assertEqual(self.graph.set_weight_column("toll", [("B", "C", 2), ("C", "D", 1)]), 1)
+        self.assertEqual(self.graph.ucs("A", "C", weight="toll").cost, 2.5)
+
+    def test_removals_drop_values(self):
+        """Test that removed edges and nodes take their channel values with them."""
+        self.graph.remove_edge("A", "C")
+        self.assertIsNone(self.graph.edge_weight("A", "C", "time"))
+        self.graph.remove_node("B")
+        self.assertEqual(len(self.graph.edge_weights), 0)
+        self.graph.add_edge("A", "C", 1)
+        self.assertIsNone(self.graph.edge_weight("A", "C", "time"))
+
+    def test_directed_channel_searches(self):
+        """Test channel searches from both ends of a directed graph."""
+        rng = random.Random(7)
+        graph = Graph(directed=True)
+        nodes = [f"N{i}" for i in range(30)]
+        for node in nodes:
+            graph.add_node(node)
+        for _ in range(80):
+            start, end = rng.choice(nodes), rng.choice(nodes)
+            graph.add_edge(start, end, 1, {"time": rng.uniform(0.5, 9.5)})
+        for _ in range(20):
+            start, target = rng.choice(nodes), rng.choice(nodes)
+            one_sided = graph.ucs(start, target, weight="time")
+            both_sides = graph.ucs(start, target, bidirectional=True, weight="time")
+            self.assertEqual(both_sides.found, one_sided.found)
+            if one_sided.found:
+                self.assertAlmostEqual(both_sides.cost, one_sided.cost)
+                self.assertAlmostEqual(graph.shortest_paths(target, reverse=True, weight="time").distances[start], one_sided.cost)
+
+
+class TestWeightPersistence(GraphFileTestCase):
+
+    def test_snapshot_keeps_channels(self):
+        """Test that channel values are written with the snapshot and read back."""
+        graph = Graph(directed=True)
+        graph.add_edges_from([("A", "B", 1), ("B", "C", 1), ("A", "C", 5)])
+        graph.set_weight_column("time", [("A", "B", 4), ("B", "C", 4), ("A", "C", 5)])
+        graph.set_edge_weights("A", "C", {"toll": 2.5})
+        graph.save()
+        self.assertEqual(list(read_snapshot(graph_module.FILENAME).channels["time"]), [4.0, 5.0, 4.0])
+
+        loaded = Graph()
+        loaded.load()
+        self.assertEqual(loaded.edge_weights.names(), ["time", "toll"])
+        self.assertEqual(loaded.edge_weight("A", "C", "toll"), 2.5)
+        self.assertIsNone(loaded.edge_weight("C", "A", "time"))
+        self.assertEqual(loaded.ucs("A", "C", weight="time").cost, 5.0)
+
+    def test_logged_weights_are_replayed(self):
+        """Test that weights set while logging survive a reload without compaction."""
+        graph = Graph()
+        graph.add_edges_from([("A", "B", 1), ("B", "C", 1)])
+        graph.enable_wal()
+        graph.add_edge("A", "C", 1, {"time": 7})
+        graph.set_edge_weights("A", "B", {"time": 2})
+        graph.set_weight_column("time", [("B", "C", 3)])
+        graph.save()
+        graph.wal.close()
+
+        loaded = Graph()
+        loaded.load()
+        self.assertEqual([loaded.edge_weight(*edge, "time") for edge in [("C", "A"), ("B", "A"), ("C", "B")]], [7.0, 2.0, 3.0])
+        self.assertEqual(loaded.ucs("A", "C", weight="time").cost, 5.0)
+
+
+if __name__ == '__main__':
+    unittest.main()